@@ -0,0 +1,149 @@
+from typing import Any, List, Optional, Tuple
+from array import array
+
+from direction import Direction
+from symbol_table import SymbolTable
+
+TYPECODES = ['B', 'H', 'I']
+
+def select_typecode(symbols: int) -> str:
+    for typecode in TYPECODES:
+        if symbols <= 1 << (8 * array(typecode).itemsize):
+            return typecode
+
+    raise ValueError(f'Too many symbols for a tape: {symbols}')
+
+def create_blank_cells(typecode: str, count: int) -> array:
+    return array(typecode, bytes(count * array(typecode).itemsize))
+
+class ArrayTape:
+    symbols: SymbolTable
+    cells: array
+    origin: int
+    index: int
+
+    minimum: Optional[int]
+    maximum: Optional[int]
+
+    def __init__(self, symbols: Optional[SymbolTable] = None, capacity: int = 16):
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self.cells = create_blank_cells(select_typecode(len(self.symbols)), capacity)
+        self.origin = -(capacity // 2)
+        self.index = capacity // 2
+
+        self.minimum = None
+        self.maximum = None
+
+    @property
+    def head(self) -> int:
+        return self.origin + self.index
+
+    @head.setter
+    def head(self, position: int) -> None:
+        self.reserve(position, position + 1)
+        self.index = position - self.origin
+
+    def read(self) -> Any:
+        return self.symbols.symbols[self.cells[self.index]]
+
+    def write(self, mark: Any) -> None:
+        self.write_id(self.symbols.intern(mark))
+
+    def shift(self, direction: Direction) -> None:
+        self.index += direction.value
+
+        if self.index < 0 or self.index >= len(self.cells):
+            self.reserve(self.head, self.head + 1)
+
+    def read_id(self) -> int:
+        return self.cells[self.index]
+
+    def write_id(self, id: int) -> None:
+        if id >= 1 << (8 * self.cells.itemsize):
+            self.widen(id + 1)
+
+        self.cells[self.index] = id
+        self.touch(self.head, self.head)
+
+    def read_slice(self, start: int, stop: int) -> List[Any]:
+        symbols = self.symbols.symbols
+        first = max(start, self.origin)
+        last = min(stop, self.origin + len(self.cells))
+
+        if first >= last:
+            return [symbols[0]] * max(0, stop - start)
+
+        return (
+            [symbols[0]] * (first - start) +
+            [symbols[id] for id in self.cells[first - self.origin:last - self.origin]] +
+            [symbols[0]] * (stop - last)
+        )
+
+    def write_slice(self, content: List[Any], offset: int = 0) -> None:
+        if len(content) == 0:
+            return
+
+        ids = [self.symbols.intern(mark) for mark in content]
+        self.widen(max(ids) + 1)
+
+        self.reserve(offset, offset + len(content))
+
+        start = offset - self.origin
+        self.cells[start:start + len(ids)] = array(self.cells.typecode, ids)
+        self.touch(offset, offset + len(content) - 1)
+
+    def overwrite(self, content: List[Any], offset: int = 0) -> None:
+        self.cells = create_blank_cells(self.cells.typecode, len(self.cells))
+        self.minimum = None
+        self.maximum = None
+
+        self.write_slice(content, offset)
+
+    def extents(self) -> Optional[Tuple[int, int]]:
+        if self.minimum is None:
+            return None
+
+        first = self.minimum - self.origin
+        last = self.maximum - self.origin
+
+        while first <= last and self.cells[first] == 0:
+            first += 1
+
+        while last >= first and self.cells[last] == 0:
+            last -= 1
+
+        if first > last:
+            self.minimum = None
+            self.maximum = None
+            return None
+
+        self.minimum = self.origin + first
+        self.maximum = self.origin + last
+
+        return self.minimum, self.maximum
+
+    def touch(self, minimum: int, maximum: int) -> None:
+        if self.minimum is None or minimum < self.minimum:
+            self.minimum = minimum
+
+        if self.maximum is None or maximum > self.maximum:
+            self.maximum = maximum
+
+    def reserve(self, start: int, stop: int) -> None:
+        if start < self.origin:
+            extra = max(len(self.cells), self.origin - start)
+            self.cells[0:0] = create_blank_cells(self.cells.typecode, extra)
+            self.origin -= extra
+            self.index += extra
+
+        end = self.origin + len(self.cells)
+
+        if stop > end:
+            extra = max(len(self.cells), stop - end)
+            self.cells.extend(create_blank_cells(self.cells.typecode, extra))
+
+    def widen(self, symbols: int) -> None:
+        typecode = select_typecode(symbols)
+
+        if array(typecode).itemsize > self.cells.itemsize:
+            self.cells = array(typecode, self.cells)
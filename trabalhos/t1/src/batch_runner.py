@@ -0,0 +1,70 @@
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+from dataclasses import dataclass
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+from quadruple_turing_machine import QuadrupleTuringMachineDefinition
+from compiled_turing_machine import CompiledQuadrupleTuringMachine, CompiledQuadrupleTuringMachineSimulator
+from machine_serialization import dumps_compiled, loads_compiled
+from run_result import RunResult
+
+BatchInput = Union[str, Tuple[str, Optional[int]]]
+
+@dataclass
+class BatchResult:
+    index: int
+    input: str
+    result: RunResult
+    tapes: List[List[Any]]
+
+_memory: Optional[SharedMemory] = None
+_simulator: Optional[CompiledQuadrupleTuringMachineSimulator] = None
+
+def run_input(simulator: CompiledQuadrupleTuringMachineSimulator, index: int, input: str, max_steps: Optional[int]) -> BatchResult:
+    simulator.reset()
+    simulator.tapes[0].write_slice(list(input), 1)
+
+    result = simulator.run(max_steps)
+    tapes = [
+        [] if extents is None else tape.read_slice(extents[0], extents[1] + 1)
+        for tape, extents in zip(simulator.tapes, result.extents)
+    ]
+
+    return BatchResult(index, input, result, tapes)
+
+def normalize_inputs(inputs: Iterable[BatchInput], max_steps: Optional[int]) -> Iterator[Tuple[int, str, Optional[int]]]:
+    for index, item in enumerate(inputs):
+        if isinstance(item, str):
+            yield index, item, max_steps
+        else:
+            yield index, item[0], item[1]
+
+def run_batch(
+    definition: QuadrupleTuringMachineDefinition,
+    inputs: Iterable[BatchInput],
+    max_steps: Optional[int] = None,
+    processes: Optional[int] = None,
+    chunksize: int = 64) -> Iterator[BatchResult]:
+    data = dumps_compiled(CompiledQuadrupleTuringMachine.compile(definition))
+    memory = SharedMemory(create=True, size=len(data))
+
+    try:
+        memory.buf[:len(data)] = data
+
+        with Pool(processes, initializer=_attach, initargs=(memory.name, len(data))) as pool:
+            yield from pool.imap_unordered(_run_task, normalize_inputs(inputs, max_steps), chunksize)
+    finally:
+        memory.close()
+        memory.unlink()
+
+# Workers read the transition tables in place from the shared block, which stays mapped for
+# the worker's lifetime. The dispatch tables the simulator derives from them are still
+# built, and held, by every worker.
+def _attach(name: str, size: int) -> None:
+    global _memory, _simulator
+
+    _memory = SharedMemory(name=name)
+    _simulator = CompiledQuadrupleTuringMachineSimulator(loads_compiled(_memory.buf[:size], copy=False))
+
+def _run_task(task: Tuple[int, str, Optional[int]]) -> BatchResult:
+    return run_input(_simulator, *task)
@@ -0,0 +1,302 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from dataclasses import asdict, dataclass
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from direction import Direction
+from tape import Tape
+from array_tape import ArrayTape
+from run_length_tape import RunLengthTape
+from quintuple_turing_machine import QuintupleTuringMachineDefinition
+from quadruple_turing_machine import QuadrupleTuringMachineDefinition, QuadrupleTuringMachineSimulator
+from compiled_turing_machine import CompiledQuadrupleTuringMachine, CompiledQuadrupleTuringMachineSimulator
+from benett_reversibility import create_reversible_machine
+from run_result import RunResult
+from machine_generators import (
+    binary_counter,
+    binary_counter_input,
+    busy_beaver,
+    random_input,
+    random_machine,
+    unary_adder,
+    unary_adder_input
+)
+
+FORMAT_VERSION = 1
+DEFAULT_TOLERANCE = 0.2
+MIN_SAMPLE_TIME = 0.05
+
+TAPE_FACTORIES: Dict[str, Callable[[], Any]] = {
+    'tape': Tape,
+    'array_tape': ArrayTape,
+    'run_length_tape': RunLengthTape,
+}
+
+@dataclass
+class Workload:
+    name: str
+    definition: QuintupleTuringMachineDefinition
+    input: str
+    max_steps: Optional[int] = None
+
+@dataclass
+class Measurement:
+    name: str
+    metric: str
+    value: float
+    higher_is_better: bool = True
+
+@dataclass
+class Comparison:
+    name: str
+    metric: str
+    baseline: float
+    current: float
+    ratio: float
+    regressed: bool
+
+def create_workloads(scale: int = 1) -> List[Workload]:
+    return [
+        Workload(f'binary_counter-{6 + 2 * scale}', binary_counter(), binary_counter_input(6 + 2 * scale)),
+        Workload(f'unary_adder-{200 * scale}', unary_adder(), unary_adder_input(100 * scale, 100 * scale)),
+        Workload('busy_beaver-4', busy_beaver(4), ''),
+        Workload('random-k8-a3', random_machine(8, 3, 1, halt_probability=0), random_input(3, 16, 1), 20_000 * scale),
+        Workload('random-k32-a6', random_machine(32, 6, 2, halt_probability=0), random_input(6, 16, 2), 20_000 * scale),
+    ]
+
+def time_calls(function: Callable[[], Any], number: int) -> Tuple[float, Any]:
+    value = None
+    start = time.perf_counter()
+
+    for _ in range(number):
+        value = function()
+
+    return time.perf_counter() - start, value
+
+def best_time(function: Callable[[], Any], repeat: int, min_time: float = MIN_SAMPLE_TIME) -> Tuple[float, Any]:
+    number = 1
+
+    while True:
+        elapsed, value = time_calls(function, number)
+
+        if elapsed >= min_time:
+            break
+
+        number *= 2
+
+    best = elapsed / number
+
+    for _ in range(repeat - 1):
+        elapsed, value = time_calls(function, number)
+        best = min(best, elapsed / number)
+
+    return best, value
+
+def create_simulator(definition: QuadrupleTuringMachineDefinition, input: str) -> QuadrupleTuringMachineSimulator:
+    simulator = QuadrupleTuringMachineSimulator(definition)
+    simulator.tapes[0].overwrite(list(input), 1)
+
+    return simulator
+
+def measure_simulator(workload: Workload, definition: QuadrupleTuringMachineDefinition, repeat: int) -> List[Measurement]:
+    elapsed, result = best_time(lambda: create_simulator(definition, workload.input).run(workload.max_steps), repeat)
+
+    tracemalloc.start()
+
+    try:
+        create_simulator(definition, workload.input).run(workload.max_steps)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    name = f'simulator/{workload.name}'
+
+    return [
+        Measurement(name, 'steps_per_second', result.steps / elapsed),
+        Measurement(name, 'peak_memory_bytes', peak, higher_is_better=False),
+    ]
+
+def measure_compiled_simulator(workload: Workload, definition: QuadrupleTuringMachineDefinition, repeat: int) -> List[Measurement]:
+    machine = CompiledQuadrupleTuringMachine.compile(definition)
+    simulator = create_simulator(definition, workload.input)
+    measurements = []
+
+    for name, accelerate in [('compiled', False), ('compiled_accelerated', True)]:
+        def run() -> RunResult:
+            compiled_simulator = CompiledQuadrupleTuringMachineSimulator(machine, accelerate)
+            compiled_simulator.load(simulator)
+
+            return compiled_simulator.run(workload.max_steps)
+
+        elapsed, result = best_time(run, repeat)
+        measurements.append(Measurement(f'{name}/{workload.name}', 'steps_per_second', result.steps / elapsed))
+
+    return measurements
+
+def measure_lookup(workload: Workload, definition: QuadrupleTuringMachineDefinition, repeat: int, limit: int = 20_000) -> List[Measurement]:
+    simulator = create_simulator(definition, workload.input)
+    configurations = []
+
+    def record(simulator: QuadrupleTuringMachineSimulator) -> bool:
+        configurations.append((simulator.current_state, [tape.read() for tape in simulator.tapes]))
+        return len(configurations) >= limit
+
+    simulator.run(workload.max_steps, until=record)
+
+    index = definition.transition_index
+
+    def lookup_all() -> None:
+        for state, data in configurations:
+            index.find(state, data)
+
+    elapsed, _ = best_time(lookup_all, repeat)
+
+    return [Measurement(f'lookup/{workload.name}', 'lookups_per_second', len(configurations) / elapsed)]
+
+def tape_sweep(factory: Callable[[], Any], length: int) -> int:
+    tape = factory()
+
+    for _ in range(length):
+        tape.write('1')
+        tape.shift(Direction.RIGHT)
+
+    for _ in range(length):
+        tape.read()
+        tape.shift(Direction.LEFT)
+
+    return 4 * length
+
+def tape_random_walk(factory: Callable[[], Any], directions: List[Direction], marks: List[str]) -> int:
+    tape = factory()
+
+    for direction, mark in zip(directions, marks):
+        tape.read()
+        tape.write(mark)
+        tape.shift(direction)
+
+    return 3 * len(directions)
+
+def measure_tapes(repeat: int, scale: int = 1, filter: Optional[str] = None) -> List[Measurement]:
+    generator = random.Random(0)
+    length = 20_000 * scale
+    directions = [generator.choice([Direction.LEFT, Direction.RIGHT]) for _ in range(length)]
+    marks = [generator.choice(['0', '1', 'B']) for _ in range(length)]
+
+    measurements = []
+
+    for name, factory in TAPE_FACTORIES.items():
+        if filter is not None and filter not in f'tape/{name}':
+            continue
+
+        elapsed, operations = best_time(lambda: tape_sweep(factory, length), repeat)
+        measurements.append(Measurement(f'tape/{name}/sweep', 'operations_per_second', operations / elapsed))
+
+        elapsed, operations = best_time(lambda: tape_random_walk(factory, directions, marks), repeat)
+        measurements.append(Measurement(f'tape/{name}/random_walk', 'operations_per_second', operations / elapsed))
+
+    return measurements
+
+def run_benchmarks(repeat: int = 3, scale: int = 1, filter: Optional[str] = None) -> List[Measurement]:
+    measurements = []
+
+    for workload in create_workloads(scale):
+        if filter is not None and filter not in workload.name:
+            continue
+
+        definition = create_reversible_machine(workload.definition)
+
+        measurements.extend(measure_simulator(workload, definition, repeat))
+        measurements.extend(measure_compiled_simulator(workload, definition, repeat))
+        measurements.extend(measure_lookup(workload, definition, repeat))
+
+    measurements.extend(measure_tapes(repeat, scale, filter))
+
+    return measurements
+
+def to_json(measurements: List[Measurement]) -> Dict[str, Any]:
+    return {
+        'format': FORMAT_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'measurements': [asdict(measurement) for measurement in measurements],
+    }
+
+def from_json(data: Dict[str, Any]) -> List[Measurement]:
+    if data.get('format') != FORMAT_VERSION:
+        raise ValueError(f'Unsupported benchmark format: {data.get("format")}')
+
+    return [Measurement(**entry) for entry in data['measurements']]
+
+def compare(measurements: List[Measurement], baseline: List[Measurement], tolerance: float = DEFAULT_TOLERANCE) -> List[Comparison]:
+    previous = {(measurement.name, measurement.metric): measurement for measurement in baseline}
+    comparisons = []
+
+    for measurement in measurements:
+        reference = previous.get((measurement.name, measurement.metric))
+
+        if reference is None or reference.value == 0 or measurement.value == 0:
+            continue
+
+        if measurement.higher_is_better:
+            ratio = measurement.value / reference.value
+        else:
+            ratio = reference.value / measurement.value
+
+        comparisons.append(Comparison(
+            name=measurement.name,
+            metric=measurement.metric,
+            baseline=reference.value,
+            current=measurement.value,
+            ratio=ratio,
+            regressed=ratio < 1 - tolerance
+        ))
+
+    return comparisons
+
+def format_comparison(comparison: Comparison) -> str:
+    status = 'REGRESSED' if comparison.regressed else 'ok'
+
+    return f'{status:>9} {comparison.ratio:7.2f}x  {comparison.name} {comparison.metric}: {comparison.baseline:.6g} -> {comparison.current:.6g}'
+
+def parse_arguments(args=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Measures simulator, transition lookup and tape throughput on synthetic machines.')
+    parser.add_argument('--output', default=None, help='write the JSON results to this file instead of stdout')
+    parser.add_argument('--baseline', default=None, help='compare against a JSON file written by a previous run')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='allowed slowdown before a measurement counts as a regression')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement; the best one is kept')
+    parser.add_argument('--scale', type=int, default=1, help='workload size multiplier')
+    parser.add_argument('--filter', default=None, help='only run workloads and tapes whose name contains this text')
+
+    return parser.parse_args(args)
+
+def report(measurements: List[Measurement], output: Optional[str] = None, baseline: Optional[str] = None, tolerance: float = DEFAULT_TOLERANCE) -> bool:
+    data = json.dumps(to_json(measurements), indent=2)
+
+    if output is None:
+        print(data)
+    else:
+        with open(output, 'w') as file:
+            file.write(data + '\n')
+
+    if baseline is None:
+        return False
+
+    with open(baseline) as file:
+        comparisons = compare(measurements, from_json(json.load(file)), tolerance)
+
+    for comparison in comparisons:
+        print(format_comparison(comparison), file=sys.stderr)
+
+    return any(comparison.regressed for comparison in comparisons)
+
+if __name__ == '__main__':
+    arguments = parse_arguments()
+    measurements = run_benchmarks(arguments.repeat, arguments.scale, arguments.filter)
+
+    if report(measurements, arguments.output, arguments.baseline, arguments.tolerance):
+        sys.exit(1)
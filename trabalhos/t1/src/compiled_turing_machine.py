@@ -0,0 +1,513 @@
+from typing import Any, Callable, Dict, List, Optional, Self, Set, Tuple
+from dataclasses import dataclass
+from array import array
+import sys
+
+from direction import Direction
+from symbol_table import SymbolTable
+from array_tape import ArrayTape
+from run_result import HaltReason, RunResult
+from quadruple_turing_machine import (
+    QuadrupleActType,
+    QuadrupleTransition,
+    QuadrupleTuringMachineDefinition,
+    QuadrupleTuringMachineSimulator
+)
+
+NO_SYMBOL = -1
+KEY_BITS = 32
+MAX_CYCLE_LENGTH = 8
+MIN_SWEEP_CYCLES = 8
+
+def pack_key(marks: List[int]) -> int:
+    key = 0
+
+    for mark in marks:
+        key = (key << KEY_BITS) | mark
+
+    return key
+
+def run_length(cells: array, start: int, direction: int, mark: int, limit: int) -> int:
+    available = max(0, min(limit, len(cells) - start if direction > 0 else start + 1))
+    template = array(cells.typecode, [mark])
+    count = 0
+    size = MIN_SWEEP_CYCLES
+
+    while count < available:
+        size = min(size, available - count)
+
+        if direction > 0:
+            segment = cells[start + count:start + count + size]
+        else:
+            segment = cells[start - count - size + 1:start - count + 1]
+
+        if segment == template * size:
+            count += size
+            size *= 2
+        elif size == 1:
+            break
+        else:
+            size //= 2
+
+    # Cells beyond the array are blank, so a blank run that reaches its end never stops.
+    if mark == 0 and count == available and available < limit:
+        return limit
+
+    return count
+
+# A cycle of transitions that starts and ends in the same state, where the first state has
+# a single dispatch group and every later state has a single outgoing transition. Each tape either keeps a constant cell under
+# its head, or moves one cell per cycle and reads (and writes) at most one cell per cycle.
+@dataclass
+class SweepCycle:
+    length: int
+    scans: Tuple[Tuple[int, int, int, int, int], ...]
+    shifts: Tuple[Tuple[int, int], ...]
+    constants: Tuple[Tuple[int, int], ...]
+    probes: Tuple[Tuple[int, int, int], ...]
+
+class CompiledQuadrupleTuringMachine:
+    tapes: int
+    states: SymbolTable
+    marks: SymbolTable
+
+    initial_state: int
+    final_states: Set[int]
+
+    sources: array
+    next_states: array
+    reads: array
+    writes: array
+    moves: array
+
+    transitions: Optional[List[QuadrupleTransition]]
+    dispatch: List[List[Tuple[Tuple[int, ...], Dict[int, int]]]]
+
+    def __init__(
+        self,
+        tapes: int,
+        states: SymbolTable,
+        marks: SymbolTable,
+        initial_state: int,
+        final_states: Set[int],
+        sources: array,
+        next_states: array,
+        reads: array,
+        writes: array,
+        moves: array,
+        transitions: Optional[List[QuadrupleTransition]] = None):
+        self.tapes = tapes
+        self.states = states
+        self.marks = marks
+        self.initial_state = initial_state
+        self.final_states = final_states
+        self.sources = sources
+        self.next_states = next_states
+        self.reads = reads
+        self.writes = writes
+        self.moves = moves
+        self.transitions = transitions
+
+        self._build_dispatch()
+
+    def compile(definition: QuadrupleTuringMachineDefinition) -> Self:
+        tapes = definition.tapes
+
+        states = SymbolTable([definition.initial_state], blank=None)
+        marks = SymbolTable(definition.alphabet)
+
+        sources = array('q')
+        next_states = array('q')
+        reads = array('q')
+        writes = array('q')
+        moves = array('b')
+
+        for transition in definition.transitions:
+            if len(transition.acts) != tapes:
+                raise ValueError(f'Transition {transition} does not have exactly {tapes} acts')
+
+            sources.append(states.intern(transition.source_state))
+            next_states.append(states.intern(transition.destination_state))
+
+            for act in transition.acts:
+                if act.kind == QuadrupleActType.READ_WRITE:
+                    reads.append(marks.intern(act.read))
+                    writes.append(marks.intern(act.write))
+                    moves.append(0)
+                elif act.kind == QuadrupleActType.SHIFT:
+                    reads.append(NO_SYMBOL)
+                    writes.append(NO_SYMBOL)
+                    moves.append(act.direction.value)
+                else:
+                    raise ValueError(f'Unknown act type: {act.kind}')
+
+        return CompiledQuadrupleTuringMachine(
+            tapes=tapes,
+            states=states,
+            marks=marks,
+            initial_state=states.intern(definition.initial_state),
+            final_states={states.intern(state) for state in definition.final_states},
+            sources=sources,
+            next_states=next_states,
+            reads=reads,
+            writes=writes,
+            moves=moves,
+            transitions=list(definition.transitions)
+        )
+
+    def intern_state(self, state: str) -> int:
+        id = self.states.intern(state)
+
+        while len(self.dispatch) < len(self.states):
+            self.dispatch.append([])
+            self.outgoing.append([])
+
+        return id
+
+    def find_transition(self, state: int, cells: List[array], indexes: List[int]) -> int:
+        best = NO_SYMBOL
+
+        for positions, table in self.dispatch[state]:
+            key = 0
+
+            for i in positions:
+                key = (key << KEY_BITS) | cells[i][indexes[i]]
+
+            transition = table.get(key, NO_SYMBOL)
+
+            if transition != NO_SYMBOL and (best == NO_SYMBOL or transition < best):
+                best = transition
+
+        return best
+
+    def find_sweep_cycle(self, transition: int) -> Optional[SweepCycle]:
+        source = self.sources[transition]
+        chain = [transition]
+
+        if len(self.dispatch[source]) != 1:
+            return None
+
+        while self.next_states[chain[-1]] != source:
+            outgoing = self.outgoing[self.next_states[chain[-1]]]
+
+            if len(outgoing) != 1 or len(chain) == MAX_CYCLE_LENGTH:
+                return None
+
+            chain.append(outgoing[0])
+
+        scans = []
+        shifts = []
+        constants = []
+
+        for i in range(self.tapes):
+            offset = 0
+            accesses = []
+
+            for t in chain:
+                base = t * self.tapes + i
+
+                if self.reads[base] != NO_SYMBOL:
+                    accesses.append((offset, self.reads[base], self.writes[base]))
+                else:
+                    offset += self.moves[base]
+
+            if offset == 0:
+                if any(move != 0 for move in (self.moves[t * self.tapes + i] for t in chain)):
+                    return None
+
+                if any(read != write or read != accesses[0][1] for _, read, write in accesses):
+                    return None
+
+                if len(accesses) > 0:
+                    constants.append((i, accesses[0][1]))
+            elif abs(offset) == 1:
+                if len(accesses) > 1:
+                    return None
+
+                if len(accesses) == 1:
+                    scans.append((i, offset) + accesses[0])
+                else:
+                    shifts.append((i, offset))
+            else:
+                return None
+
+        if len(scans) == 0:
+            return None
+
+        probes = tuple((i, offset + direction * (MIN_SWEEP_CYCLES - 1), read) for i, direction, offset, read, _ in scans)
+
+        return SweepCycle(len(chain), tuple(scans), tuple(shifts), tuple(constants), probes)
+
+    def _build_dispatch(self) -> None:
+        self.dispatch = [[] for _ in range(len(self.states))]
+        self.outgoing = [[] for _ in range(len(self.states))]
+
+        for transition, source in enumerate(self.sources):
+            self.outgoing[source].append(transition)
+
+        for transition, source in enumerate(self.sources):
+            base = transition * self.tapes
+            positions = tuple(i for i in range(self.tapes) if self.reads[base + i] != NO_SYMBOL)
+            key = pack_key([self.reads[base + i] for i in positions])
+
+            groups = self.dispatch[source]
+            table = next((t for p, t in groups if p == positions), None)
+
+            if table is None:
+                table = {}
+                groups.append((positions, table))
+
+            table.setdefault(key, transition)
+
+class CompiledQuadrupleTuringMachineSimulator:
+    machine: CompiledQuadrupleTuringMachine
+
+    tapes: List[ArrayTape]
+    current_state: int
+    steps: int
+    accelerate: bool
+
+    def __init__(self, machine: CompiledQuadrupleTuringMachine, accelerate: bool = True):
+        self.machine = machine
+        self.accelerate = accelerate
+
+        self.tapes = [ArrayTape(machine.marks) for _ in range(machine.tapes)]
+        self.current_state = machine.initial_state
+        self.steps = 0
+
+        self._operations = []
+
+        for transition in range(len(machine.sources)):
+            base = transition * machine.tapes
+            writes = []
+            shifts = []
+
+            for i in range(machine.tapes):
+                if machine.writes[base + i] != NO_SYMBOL:
+                    writes.append((i, machine.writes[base + i]))
+                elif machine.moves[base + i] != 0:
+                    shifts.append((i, machine.moves[base + i]))
+
+            cycle = machine.find_sweep_cycle(transition) if accelerate else None
+            self._operations.append((machine.next_states[transition], tuple(writes), tuple(shifts), cycle))
+
+    def reset(self) -> None:
+        self.tapes = [ArrayTape(self.machine.marks) for _ in range(self.machine.tapes)]
+        self.current_state = self.machine.initial_state
+        self.steps = 0
+
+    def load(self, simulator: QuadrupleTuringMachineSimulator) -> None:
+        self.current_state = self.machine.intern_state(simulator.current_state)
+
+        for i, tape in enumerate(simulator.tapes):
+            array_tape = ArrayTape(self.machine.marks)
+            extents = tape.extents()
+
+            if extents is not None:
+                array_tape.write_slice(tape.read_slice(extents[0], extents[1] + 1), extents[0])
+
+            array_tape.head = tape.head
+            array_tape.widen(len(self.machine.marks))
+
+            self.tapes[i] = array_tape
+
+    def store(self, simulator: QuadrupleTuringMachineSimulator) -> None:
+        simulator.current_state = self.state()
+
+        for tape, array_tape in zip(simulator.tapes, self.tapes):
+            extents = array_tape.extents()
+
+            if extents is None:
+                tape.overwrite([])
+            else:
+                tape.overwrite(array_tape.read_slice(extents[0], extents[1] + 1), extents[0])
+
+            tape.head = array_tape.head
+
+    def state(self) -> str:
+        return self.machine.states.lookup(self.current_state)
+
+    def read(self, tape: int) -> Any:
+        return self.tapes[tape].read()
+
+    def step(self) -> Optional[QuadrupleTransition]:
+        transition = self._find_next_transition()
+
+        if transition == NO_SYMBOL:
+            return None
+
+        state, writes, shifts, _ = self._operations[transition]
+
+        for i, mark in writes:
+            self.tapes[i].write_id(mark)
+
+        for i, direction in shifts:
+            self.tapes[i].shift(Direction(direction))
+
+        self.current_state = state
+        self.steps += 1
+
+        if self.machine.transitions is None:
+            return None
+
+        return self.machine.transitions[transition]
+
+    def run(
+        self,
+        max_steps: Optional[int] = None,
+        until: Optional[Callable[['CompiledQuadrupleTuringMachineSimulator'], bool]] = None) -> RunResult:
+        if until is None:
+            steps, halted = self._run(max_steps)
+            reason = None if halted else HaltReason.BUDGET
+        else:
+            steps = 0
+            reason = None
+
+            while True:
+                if until(self):
+                    reason = HaltReason.INTERRUPTED
+                    break
+
+                if self._find_next_transition() == NO_SYMBOL:
+                    break
+
+                if max_steps is not None and steps >= max_steps:
+                    reason = HaltReason.BUDGET
+                    break
+
+                self.step()
+                steps += 1
+
+        if reason is None:
+            reason = HaltReason.ACCEPTED if self.has_accepted() else HaltReason.REJECTED
+
+        return RunResult(
+            reason=reason,
+            steps=steps,
+            final_state=self.state(),
+            extents=[tape.extents() for tape in self.tapes]
+        )
+
+    def _run(self, max_steps: Optional[int]) -> Tuple[int, bool]:
+        dispatch = self.machine.dispatch
+        operations = self._operations
+        tapes = self.tapes
+        cells = [tape.cells for tape in tapes]
+        indexes = [tape.index for tape in tapes]
+
+        state = self.current_state
+        limit = -1 if max_steps is None else max_steps
+        steps = 0
+        resume = 0
+        halted = False
+
+        while True:
+            groups = dispatch[state]
+
+            if len(groups) == 1:
+                positions, table = groups[0]
+                key = 0
+
+                for i in positions:
+                    key = (key << KEY_BITS) | cells[i][indexes[i]]
+
+                transition = table.get(key, NO_SYMBOL)
+            else:
+                transition = self.machine.find_transition(state, cells, indexes)
+
+            if transition == NO_SYMBOL:
+                halted = True
+                break
+
+            if steps == limit:
+                break
+
+            state, writes, shifts, cycle = operations[transition]
+
+            # A failed probe means the current run is shorter than MIN_SWEEP_CYCLES, so
+            # probing is paused until that run is over.
+            if cycle is not None and steps >= resume:
+                for i, probe, mark in cycle.probes:
+                    index = indexes[i] + probe
+
+                    if (cells[i][index] if 0 <= index < len(cells[i]) else 0) != mark:
+                        resume = steps + cycle.length * MIN_SWEEP_CYCLES
+                        break
+                else:
+                    cycles = self._sweep(cycle, cells, indexes, sys.maxsize if limit < 0 else (limit - steps) // cycle.length)
+
+                    if cycles > 0:
+                        state = self.machine.sources[transition]
+                        steps += cycles * cycle.length
+                        continue
+
+                    resume = steps + cycle.length * MIN_SWEEP_CYCLES
+
+            for i, mark in writes:
+                cells[i][indexes[i]] = mark
+
+            for i, direction in shifts:
+                index = indexes[i] + direction
+
+                if index < 0 or index >= len(cells[i]):
+                    origin = tapes[i].origin
+                    tapes[i].reserve(origin + index, origin + index + 1)
+                    index += origin - tapes[i].origin
+
+                indexes[i] = index
+
+            steps += 1
+
+        for tape, index in zip(tapes, indexes):
+            tape.index = index
+
+            if steps > 0:
+                tape.touch(tape.origin, tape.origin + len(tape.cells) - 1)
+
+        self.current_state = state
+        self.steps += steps
+
+        return steps, halted
+
+    def _sweep(self, cycle: SweepCycle, cells: List[array], indexes: List[int], limit: int) -> int:
+        for i, mark in cycle.constants:
+            if cells[i][indexes[i]] != mark:
+                return 0
+
+        count = limit
+
+        for i, direction, offset, read, _ in cycle.scans:
+            count = min(count, run_length(cells[i], indexes[i] + offset, direction, read, count))
+
+        if count < MIN_SWEEP_CYCLES or count == sys.maxsize:
+            return 0
+
+        for i, direction, offset, _, write in cycle.scans + tuple((i, direction, 0, None, None) for i, direction in cycle.shifts):
+            tape = self.tapes[i]
+            first = indexes[i] + offset
+            final = first + direction * (count - 1)
+            last = indexes[i] + direction * count
+            origin = tape.origin
+            tape.reserve(origin + min(first, final, last), origin + max(first, final, last) + 1)
+            moved = origin - tape.origin
+
+            if write is not None:
+                start = min(first, final) + moved
+                cells[i][start:start + count] = array(cells[i].typecode, [write]) * count
+
+            indexes[i] = last + moved
+
+        return count
+
+    def has_accepted(self) -> bool:
+        return self.current_state in self.machine.final_states
+
+    def has_halted(self) -> bool:
+        return self._find_next_transition() == NO_SYMBOL
+
+    def _find_next_transition(self) -> int:
+        return self.machine.find_transition(
+            self.current_state,
+            [tape.cells for tape in self.tapes],
+            [tape.index for tape in self.tapes]
+        )
@@ -0,0 +1,184 @@
+from typing import List, Optional, Tuple
+from dataclasses import dataclass
+import hashlib
+import os
+import struct
+import tempfile
+import time
+
+from quintuple_turing_machine import QuintupleTuringMachineDefinition
+from quadruple_turing_machine import QuadrupleTuringMachineDefinition
+from compiled_turing_machine import CompiledQuadrupleTuringMachine
+from benett_reversibility import create_reversible_machine
+from machine_serialization import dumps, loads, dumps_compiled, loads_compiled
+
+ENTRY_MAGIC = b'TMCE'
+ENTRY_VERSION = 1
+ENTRY_SUFFIX = '.tmce'
+TEMPORARY_SUFFIX = '.tmp'
+
+# A temporary file this old was left behind by a writer that died before renaming it;
+# younger ones may still be in flight in another process.
+STALE_TEMPORARY_SECONDS = 60 * 60
+
+ENTRY_HEADER = struct.Struct('<4sHxxQ')
+
+@dataclass
+class CachedConversion:
+    definition: QuadrupleTuringMachineDefinition
+    compiled: CompiledQuadrupleTuringMachine
+
+def conversion_key(definition: QuintupleTuringMachineDefinition) -> str:
+    digest = hashlib.sha256(dumps(definition))
+    digest.update(struct.pack('<H', ENTRY_VERSION))
+
+    return digest.hexdigest()
+
+def pack_conversion(definition: QuadrupleTuringMachineDefinition, compiled: CompiledQuadrupleTuringMachine) -> bytes:
+    data = dumps(definition)
+
+    return ENTRY_HEADER.pack(ENTRY_MAGIC, ENTRY_VERSION, len(data)) + data + dumps_compiled(compiled)
+
+def unpack_conversion(data: bytes) -> CachedConversion:
+    magic, version, size = ENTRY_HEADER.unpack_from(data, 0)
+
+    if magic != ENTRY_MAGIC or version != ENTRY_VERSION:
+        raise ValueError('Not a conversion cache entry')
+
+    view = memoryview(data)
+    definition = loads(view[ENTRY_HEADER.size:ENTRY_HEADER.size + size])
+    compiled = loads_compiled(view[ENTRY_HEADER.size + size:], definition.transitions)
+
+    return CachedConversion(definition, compiled)
+
+class ConversionCache:
+    directory: str
+    max_bytes: int
+
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, definition: QuintupleTuringMachineDefinition) -> Optional[CachedConversion]:
+        path = self._path(conversion_key(definition))
+
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+
+            conversion = unpack_conversion(data)
+        except (OSError, ValueError, struct.error):
+            self.misses += 1
+            return None
+
+        self._touch(path)
+        self.hits += 1
+
+        return conversion
+
+    def put(self, definition: QuintupleTuringMachineDefinition, conversion: CachedConversion) -> None:
+        data = pack_conversion(conversion.definition, conversion.compiled)
+        path = self._path(conversion_key(definition))
+
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=TEMPORARY_SUFFIX)
+
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(data)
+
+            os.replace(temporary_path, path)
+        except BaseException:
+            self._remove(temporary_path)
+            raise
+
+        self.evict()
+
+    def convert(self, definition: QuintupleTuringMachineDefinition) -> CachedConversion:
+        conversion = self.get(definition)
+
+        if conversion is None:
+            reversible_definition = create_reversible_machine(definition)
+            conversion = CachedConversion(reversible_definition, CompiledQuadrupleTuringMachine.compile(reversible_definition))
+            self.put(definition, conversion)
+
+        return conversion
+
+    def create_reversible_machine(self, definition: QuintupleTuringMachineDefinition) -> QuadrupleTuringMachineDefinition:
+        return self.convert(definition).definition
+
+    def evict(self) -> None:
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries) + self._sweep_temporaries()
+
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if total <= self.max_bytes:
+                break
+
+            if self._remove(path):
+                self.evictions += 1
+
+            total -= size
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self._entries() + self._entries(TEMPORARY_SUFFIX))
+
+    def clear(self) -> None:
+        for path, _, _ in self._entries():
+            self._remove(path)
+
+        self._sweep_temporaries()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def _entries(self, suffix: str = ENTRY_SUFFIX) -> List[Tuple[str, int, int]]:
+        entries = []
+
+        with os.scandir(self.directory) as iterator:
+            for entry in iterator:
+                if not entry.name.endswith(suffix):
+                    continue
+
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+
+                entries.append((entry.path, stat.st_size, stat.st_mtime_ns))
+
+        return entries
+
+    def _sweep_temporaries(self) -> int:
+        stale = time.time_ns() - STALE_TEMPORARY_SECONDS * 1_000_000_000
+        remaining = 0
+
+        for path, size, modified in self._entries(TEMPORARY_SUFFIX):
+            if modified < stale:
+                self._remove(path)
+            else:
+                remaining += size
+
+        return remaining
+
+    def _touch(self, path: str) -> None:
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _remove(self, path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
@@ -0,0 +1,174 @@
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import random
+
+from run_result import HaltReason, RunResult
+from simulator_copy import clone
+
+Snapshot = Tuple[str, Tuple[int, ...], Tuple[Any, ...]]
+
+MASK = (1 << 64) - 1
+
+def mix(value: int) -> int:
+    value = (value + 0x9E3779B97F4A7C15) & MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK
+
+    return value ^ (value >> 31)
+
+# Random keys are only drawn per state and per (tape, mark); keys for positions are
+# derived from them with splitmix64, so memory stays bounded however far a head runs.
+class ConfigurationHasher:
+    keys: Dict[Hashable, int]
+
+    def __init__(self, seed: Optional[int] = None):
+        self.keys = {}
+        self._random = random.Random(seed)
+
+    def key(self, item: Hashable) -> int:
+        key = self.keys.get(item)
+
+        if key is None:
+            key = self._random.getrandbits(64)
+            self.keys[item] = key
+
+        return key
+
+    def cell(self, tape: int, position: int, mark: Any) -> int:
+        if mark == 'B':
+            return 0
+
+        return mix(self.key(('cell', tape, mark)) ^ (position & MASK))
+
+    def head(self, tape: int, position: int) -> int:
+        return mix(self.key(('head', tape)) ^ (position & MASK))
+
+    def state(self, state: str) -> int:
+        return self.key(('state', state))
+
+    def hash(self, simulator: Any) -> int:
+        result = self.state(simulator.current_state)
+
+        for i, tape in enumerate(simulator.tapes):
+            result ^= self.head(i, tape.head)
+            extents = tape.extents()
+
+            if extents is not None:
+                for position, mark in enumerate(tape.read_slice(extents[0], extents[1] + 1), extents[0]):
+                    result ^= self.cell(i, position, mark)
+
+        return result
+
+def capture(simulator: Any) -> Snapshot:
+    contents = []
+
+    for tape in simulator.tapes:
+        extents = tape.extents()
+        contents.append(None if extents is None else (extents, tuple(tape.read_slice(extents[0], extents[1] + 1))))
+
+    return simulator.current_state, tuple(tape.head for tape in simulator.tapes), tuple(contents)
+
+class HashedSimulation:
+    simulator: Any
+    hasher: ConfigurationHasher
+    hash: int
+
+    def __init__(self, simulator: Any, hasher: ConfigurationHasher):
+        self.simulator = simulator
+        self.hasher = hasher
+        self.hash = hasher.hash(simulator)
+
+    def step(self) -> Optional[Any]:
+        state = self.simulator.current_state
+        heads = [tape.head for tape in self.simulator.tapes]
+
+        transition = self.simulator.step()
+
+        if transition is None:
+            return None
+
+        self.hash ^= self.hasher.state(state) ^ self.hasher.state(transition.destination_state)
+
+        for i, (read, write, move) in enumerate(transition.effects()):
+            if write is not None and write != read:
+                self.hash ^= self.hasher.cell(i, heads[i], read) ^ self.hasher.cell(i, heads[i], write)
+
+            if move != 0:
+                self.hash ^= self.hasher.head(i, heads[i]) ^ self.hasher.head(i, heads[i] + move)
+
+        return transition
+
+    def matches(self, other: 'HashedSimulation') -> bool:
+        return self.hash == other.hash and capture(self.simulator) == capture(other.simulator)
+
+def run_with_cycle_detection(
+    simulator: Any,
+    max_steps: Optional[int] = None,
+    until: Optional[Callable[[Any], bool]] = None,
+    seed: Optional[int] = None) -> RunResult:
+    hasher = ConfigurationHasher(seed)
+    initial = clone(simulator)
+    hare = HashedSimulation(simulator, hasher)
+
+    tortoise_hash = hare.hash
+    tortoise_snapshot = capture(simulator)
+    power = 1
+    period = 0
+    steps = 0
+
+    while True:
+        if until is not None and until(simulator):
+            reason = HaltReason.INTERRUPTED
+            break
+
+        if max_steps is not None and steps >= max_steps:
+            if simulator.has_halted():
+                reason = HaltReason.ACCEPTED if simulator.has_accepted() else HaltReason.REJECTED
+            else:
+                reason = HaltReason.BUDGET
+            break
+
+        if hare.step() is None:
+            reason = HaltReason.ACCEPTED if simulator.has_accepted() else HaltReason.REJECTED
+            break
+
+        steps += 1
+        period += 1
+
+        if hare.hash == tortoise_hash and capture(simulator) == tortoise_snapshot:
+            return RunResult(
+                reason=HaltReason.CYCLE,
+                steps=steps,
+                final_state=simulator.current_state,
+                extents=[tape.extents() for tape in simulator.tapes],
+                cycle_start=find_cycle_start(initial, hasher, period),
+                cycle_period=period
+            )
+
+        if period == power:
+            tortoise_hash = hare.hash
+            tortoise_snapshot = capture(simulator)
+            power *= 2
+            period = 0
+
+    return RunResult(
+        reason=reason,
+        steps=steps,
+        final_state=simulator.current_state,
+        extents=[tape.extents() for tape in simulator.tapes]
+    )
+
+def find_cycle_start(initial: Any, hasher: ConfigurationHasher, period: int) -> int:
+    tortoise = HashedSimulation(clone(initial), hasher)
+    hare = HashedSimulation(clone(initial), hasher)
+
+    for _ in range(period):
+        hare.step()
+
+    start = 0
+
+    while not tortoise.matches(hare):
+        tortoise.step()
+        hare.step()
+        start += 1
+
+    return start
@@ -0,0 +1,198 @@
+from typing import Any, List, Optional, Tuple
+from dataclasses import dataclass
+import copy
+import sys
+
+from simulator_copy import clone
+
+@dataclass(slots=True)
+class TimelineDelta:
+    transition: Any
+    writes: Tuple[Tuple[int, int, Any, Any], ...]
+    moves: Tuple[Tuple[int, int], ...]
+
+    def cost(self) -> int:
+        cost = DELTA_BYTES
+
+        if self.writes:
+            cost += TUPLE_BYTES + WRITE_BYTES * len(self.writes)
+
+        if self.moves:
+            cost += TUPLE_BYTES + MOVE_BYTES * len(self.moves)
+
+        return cost
+
+# Approximate CPython footprint, in bytes, of the objects a timeline keeps
+# alive; positions are counted as boxed ints and marks as shared objects.
+POINTER_BYTES = 8
+INT_BYTES = sys.getsizeof(1 << 30)
+TUPLE_BYTES = sys.getsizeof(())
+DELTA_BYTES = POINTER_BYTES + sys.getsizeof(TimelineDelta(None, (), ()))
+WRITE_BYTES = POINTER_BYTES + sys.getsizeof((0, 0, None, None)) + INT_BYTES
+MOVE_BYTES = POINTER_BYTES + sys.getsizeof((0, 0))
+
+def approximate_size(tape: Any) -> int:
+    size = sys.getsizeof(tape)
+
+    for value in vars(tape).values():
+        size += sys.getsizeof(value)
+
+        if isinstance(value, (list, dict)):
+            size += INT_BYTES * len(value)
+
+    return size
+
+def create_delta(transition: Any, heads: List[int]) -> TimelineDelta:
+    writes = []
+    moves = []
+
+    for i, (read, write, move) in enumerate(transition.effects()):
+        if write is not None and write != read:
+            writes.append((i, heads[i], read, write))
+
+        if move != 0:
+            moves.append((i, move))
+
+    return TimelineDelta(transition, tuple(writes), tuple(moves))
+
+def apply_delta(tapes: List[Any], delta: TimelineDelta) -> None:
+    for i, position, _, new in delta.writes:
+        tapes[i].write_slice([new], position)
+
+    for i, move in delta.moves:
+        tapes[i].head += move
+
+def revert_delta(tapes: List[Any], delta: TimelineDelta) -> None:
+    for i, move in delta.moves:
+        tapes[i].head -= move
+
+    for i, position, old, _ in delta.writes:
+        tapes[i].write_slice([old], position)
+
+@dataclass
+class TimelineFrame:
+    step: int
+    current_state: str
+    transition: Optional[Any]
+    tapes: List[Any]
+
+class ExecutionTimeline:
+    simulator: Any
+    keyframe_interval: int
+    # In approximate bytes, as estimated by TimelineDelta.cost and approximate_size
+    memory_budget: Optional[int]
+
+    deltas: List[TimelineDelta]
+    keyframes: List[TimelineFrame]
+    cost: int
+    halted: bool
+    truncated: bool
+
+    def __init__(self, simulator: Any, keyframe_interval: int = 1024, memory_budget: Optional[int] = None):
+        if keyframe_interval < 1:
+            raise ValueError(f'Invalid keyframe interval: {keyframe_interval}')
+
+        self.simulator = clone(simulator)
+        self.keyframe_interval = keyframe_interval
+        self.memory_budget = memory_budget
+
+        self.deltas = []
+        self.keyframes = []
+        self.cost = 0
+        self.halted = False
+        self.truncated = False
+
+        self._add_keyframe(None)
+        self._cursor = self._restore(self.keyframes[0])
+
+    def __len__(self) -> int:
+        return len(self.deltas) + 1
+
+    def is_complete(self) -> bool:
+        return self.halted or self.truncated
+
+    def record(self, max_steps: Optional[int] = None) -> int:
+        steps = 0
+
+        while not self.is_complete() and (max_steps is None or steps < max_steps):
+            if self.memory_budget is not None and self.cost >= self.memory_budget:
+                self.truncated = True
+                break
+
+            heads = [tape.head for tape in self.simulator.tapes]
+            transition = self.simulator.step()
+
+            if transition is None:
+                self.halted = True
+                break
+
+            self._append(create_delta(transition, heads))
+            steps += 1
+
+        return steps
+
+    def extend(self, deltas: List[TimelineDelta], halted: bool = False) -> int:
+        steps = 0
+
+        for delta in deltas:
+            if self.memory_budget is not None and self.cost >= self.memory_budget:
+                self.truncated = True
+                return steps
+
+            apply_delta(self.simulator.tapes, delta)
+            self.simulator.current_state = delta.transition.destination_state
+            self.simulator.steps += 1
+
+            self._append(delta)
+            steps += 1
+
+        self.halted = self.halted or halted
+
+        return steps
+
+    def seek(self, step: int) -> TimelineFrame:
+        if step < 0 or step >= len(self):
+            raise IndexError(f'Step {step} is outside of the timeline (0 to {len(self) - 1})')
+
+        keyframe = self.keyframes[step // self.keyframe_interval]
+
+        if abs(step - self._cursor.step) > step - keyframe.step:
+            self._cursor = self._restore(keyframe)
+
+        while self._cursor.step < step:
+            self._redo(self.deltas[self._cursor.step])
+
+        while self._cursor.step > step:
+            self._undo(self.deltas[self._cursor.step - 1])
+
+        return self._cursor
+
+    def _append(self, delta: TimelineDelta) -> None:
+        self.deltas.append(delta)
+        self.cost += delta.cost()
+
+        if len(self.deltas) % self.keyframe_interval == 0:
+            self._add_keyframe(delta.transition)
+
+    def _add_keyframe(self, transition: Optional[Any]) -> None:
+        tapes = copy.deepcopy(self.simulator.tapes)
+
+        self.keyframes.append(TimelineFrame(len(self.deltas), self.simulator.current_state, transition, tapes))
+        self.cost += sys.getsizeof(self.keyframes[-1]) + sum(approximate_size(tape) for tape in tapes)
+
+    def _restore(self, keyframe: TimelineFrame) -> TimelineFrame:
+        return TimelineFrame(keyframe.step, keyframe.current_state, keyframe.transition, copy.deepcopy(keyframe.tapes))
+
+    def _redo(self, delta: TimelineDelta) -> None:
+        apply_delta(self._cursor.tapes, delta)
+
+        self._cursor.step += 1
+        self._cursor.current_state = delta.transition.destination_state
+        self._cursor.transition = delta.transition
+
+    def _undo(self, delta: TimelineDelta) -> None:
+        revert_delta(self._cursor.tapes, delta)
+
+        self._cursor.step -= 1
+        self._cursor.current_state = delta.transition.source_state
+        self._cursor.transition = self.deltas[self._cursor.step - 1].transition if self._cursor.step > 0 else None
@@ -0,0 +1,134 @@
+from typing import Any, Iterable, Optional, Tuple
+from dataclasses import fields, is_dataclass
+from enum import Enum
+import hashlib
+import marshal
+
+from direction import Direction
+from transition_index import VersionedList
+
+def encode(value: Any) -> bytes:
+    if type(value) is str:
+        data = value.encode('utf-8')
+        return b's%d:' % len(data) + data
+
+    if type(value) is int:
+        data = b'%d' % value
+        return b'i%d:' % len(data) + data
+
+    if value is None:
+        return b'n'
+
+    if isinstance(value, Enum):
+        return b'e' + encode(type(value).__name__) + encode(value.value)
+
+    if isinstance(value, bool):
+        return b't' if value else b'f'
+
+    if isinstance(value, int):
+        data = str(value).encode('ascii')
+        return b'i%d:' % len(data) + data
+
+    if isinstance(value, str):
+        data = value.encode('utf-8')
+        return b's%d:' % len(data) + data
+
+    if isinstance(value, (tuple, list)):
+        return b'(' + b''.join(map(encode, value)) + b')'
+
+    if is_dataclass(value):
+        return b'd' + encode(type(value).__name__) + encode([getattr(value, f.name) for f in fields(value) if f.compare])
+
+    raise ValueError(f'Unsupported value type for fingerprint: {type(value)}')
+
+def encode_multiset(values: Iterable[Any]) -> bytes:
+    return b'{' + b''.join(sorted(map(encode, values))) + b'}'
+
+# Version 2 is the newest marshal format without back-references, so its output depends
+# only on the values. It covers the plain str, int and None fields of almost every
+# transition; anything else falls back to encode(), whose output never starts with '['.
+MARSHAL_VERSION = 2
+
+# Directions are singletons, so their id is a cheaper key than the Python-level Enum hash.
+DIRECTION_ENCODINGS = {id(direction): encode(direction) for direction in [None, *Direction]}
+
+def encode_transition(transition: Any) -> bytes:
+    return encode([
+        transition.source_state,
+        transition.destination_state,
+        [(act.read, act.write, act.direction) for act in transition.acts]
+    ])
+
+def digest_transitions(transitions: Iterable[Any]) -> bytes:
+    encoded = []
+
+    for transition in transitions:
+        fields = [transition.source_state, transition.destination_state]
+
+        try:
+            for act in transition.acts:
+                fields += (act.read, act.write, DIRECTION_ENCODINGS[id(act.direction)])
+
+            encoded.append(marshal.dumps(fields, MARSHAL_VERSION))
+        except (KeyError, ValueError):
+            encoded.append(encode_transition(transition))
+
+    encoded.sort()
+
+    return hashlib.sha256(b'{' + b''.join(encoded) + b'}').digest()
+
+def fingerprint_definition(definition: Any) -> str:
+    digest = hashlib.sha256()
+
+    digest.update(encode(type(definition).__name__))
+    digest.update(encode(definition.tapes))
+    digest.update(encode_multiset(definition.alphabet))
+    digest.update(digest_transitions(definition.transitions))
+    digest.update(encode(definition.initial_state))
+    digest.update(encode_multiset(definition.final_states))
+
+    return digest.hexdigest()
+
+FINGERPRINTED_FIELDS = ('tapes', 'alphabet', 'transitions', 'initial_state', 'final_states')
+VERSIONED_FIELDS = ('alphabet', 'transitions', 'final_states')
+
+# The lists are wrapped in a VersionedList, so the cached fingerprint is dropped on
+# reassignment and recomputed once their versions show an in-place edit.
+class FingerprintedDefinition:
+    _fingerprint: Optional[str] = None
+    _fingerprinted_versions: Tuple[int, ...] = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in VERSIONED_FIELDS:
+            value = VersionedList(value)
+
+        if name in FINGERPRINTED_FIELDS:
+            super().__setattr__('_fingerprint', None)
+
+        super().__setattr__(name, value)
+
+    def fingerprint(self) -> str:
+        versions = tuple(getattr(self, name).version for name in VERSIONED_FIELDS)
+
+        if self._fingerprint is None or self._fingerprinted_versions != versions:
+            self._fingerprint = fingerprint_definition(self)
+            self._fingerprinted_versions = versions
+
+        return self._fingerprint
+
+    def __eq__(self, value) -> bool:
+        if not isinstance(value, type(self)):
+            return False
+
+        if (
+            self.tapes != value.tapes or
+            self.initial_state != value.initial_state or
+            len(self.alphabet) != len(value.alphabet) or
+            len(self.transitions) != len(value.transitions) or
+            len(self.final_states) != len(value.final_states)
+        ):
+            return False
+
+        return self.fingerprint() == value.fingerprint()
+
+    __hash__ = None
@@ -1,7 +1,9 @@
 import pygame
 
+from gui.surface_cache import shared_surface_cache
+
 class Button:
-    def __init__(self, rect, text, action, normal_color, hover_color, click_color):
+    def __init__(self, rect, text, action, normal_color, hover_color, click_color, surface_cache=shared_surface_cache):
         self.rect = rect
         self.text = text  
         self.action = action
@@ -12,6 +14,7 @@ class Button:
         }
         self.current_color = normal_color
         self.click_effect = False
+        self.surface_cache = surface_cache
 
     def get_text(self):
         return self.text() if callable(self.text) else self.text
@@ -39,6 +42,6 @@ class Button:
         pygame.draw.rect(surface, current_color, self.rect, border_radius=5)
         pygame.draw.rect(surface, (0, 0, 0), self.rect, 2, border_radius=5)
         
-        text_surf = font.render(self.get_text(), True, (255, 255, 255))
+        text_surf = self.surface_cache.render(font, self.get_text(), (255, 255, 255))
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
\ No newline at end of file
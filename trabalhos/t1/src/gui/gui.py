@@ -5,6 +5,10 @@ import pygame
 from gui.button import Button
 from gui.slider import Slider
 from gui.tape_view import TapeView 
+from gui.surface_cache import shared_surface_cache
+from gui.redraw_scheduler import RedrawScheduler
+from execution_timeline import ExecutionTimeline
+from simulation_worker import SimulationWorker, format_step_count
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -15,9 +19,15 @@ DARK_BLUE = (0, 0, 139)
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 700
 FPS = 60
+MEMORY_BUDGET = 512 * 1024 * 1024
+WORKER_TARGET = 1_000_000
+CONSUME_BUDGET_MS = 8
+IDLE_TIMEOUT_MS = 250
+MIN_SPEED = 1
+MAX_SPEED = 5_000_000
 
 class GUI:
-    def __init__(self, simulator, all_transitions):
+    def __init__(self, simulator, all_transitions, memory_budget=MEMORY_BUDGET):
         pygame.init()
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("T1 - Guilherme, Jaime e Luís")
@@ -28,24 +38,36 @@ class GUI:
         self.original_simulator = simulator
         self.simulator = copy.deepcopy(self.original_simulator)
         self.all_transitions = all_transitions
-        self.simulation_steps = []
+        self.memory_budget = memory_budget
+        self.timeline = None
+        self.worker = None
         self.current_step = 0
         self.running = False
-        self.animation_frame = 0
+        self.playback_progress = 0.0
+        self.elapsed_ms = 0
         self.clock = pygame.time.Clock()
+        self.surface_cache = shared_surface_cache
         
-        self.precompute_simulation_steps()
+        self.start_simulation_worker()
+        self.screen.fill(WHITE)
         
         self.buttons = self.create_buttons()
-        self.slider = Slider(900, WINDOW_HEIGHT - 130, 200, 30, 600, 60)
+        self.slider = Slider(
+            900, WINDOW_HEIGHT - 130, 200, MIN_SPEED, MAX_SPEED, MIN_SPEED,
+            logarithmic=True,
+            format_value=lambda val: format_step_count(int(val))
+        )
         self.hovered_button = None
 
         self.tape_guis = [
-            TapeView(self.simulation_steps[0]["tapes"][0], 170, "Working Tape"),
-            TapeView(self.simulation_steps[0]["tapes"][1], 310, "History Tape"),
-            TapeView(self.simulation_steps[0]["tapes"][2], 450, "Output Tape")
+            TapeView(self.timeline.seek(0).tapes[0], 170, "Working Tape"),
+            TapeView(self.timeline.seek(0).tapes[1], 310, "History Tape"),
+            TapeView(self.timeline.seek(0).tapes[2], 450, "Output Tape")
         ]
 
+        self.scheduler = self.create_scheduler()
+        self.needs_flip = True
+
     def create_buttons(self):
         button_width = 130
         button_y = WINDOW_HEIGHT - 70
@@ -73,106 +95,163 @@ class GUI:
                 BLUE, (100, 150, 200), (40, 110, 160))
         ]
 
-    def update_slider_position(self):
-        self.animation_speed = (60 * FPS) // self.slider.val
-        
-    def precompute_simulation_steps(self):
-        simulator_copy = copy.deepcopy(self.original_simulator)
-        self.simulation_steps = []
-        
-        self.simulation_steps.append({
-            "tapes": copy.deepcopy(simulator_copy.tapes),
-            "state": simulator_copy.current_state,
-            "transition": None
-        })
-        
-        step = 0
-        while step < 1000:  
-            transition = simulator_copy.step()
+    def create_scheduler(self):
+        scheduler = RedrawScheduler(WHITE)
+
+        for tape_gui in self.tape_guis:
+            scheduler.add(
+                tape_gui.get_rect(),
+                lambda: self.current_step,
+                lambda tape_gui=tape_gui: tape_gui.draw(
+                    screen=self.screen,
+                    title_font=self.title_font,
+                    regular_font=self.font,
+                    small_font=self.small_font
+                )
+            )
+
+        scheduler.add(
+            pygame.Rect(50, 30, WINDOW_WIDTH - 100, 80),
+            lambda: (self.current_step, len(self.timeline), self.worker.progress()),
+            self.draw_transition_info
+        )
+
+        for button in self.buttons:
+            scheduler.add(
+                button.rect,
+                lambda button=button: (button.get_text(), button.current_color, button.click_effect),
+                lambda button=button: button.draw(self.screen, self.font)
+            )
+
+        scheduler.add(
+            pygame.Rect(self.slider.rect.left - 10, self.slider.rect.top - 30, WINDOW_WIDTH - self.slider.rect.left + 10, 65),
+            lambda: (self.slider.format_value(self.slider.val), self.slider.handle_rect.x),
+            self.draw_slider
+        )
+
+        return scheduler
+
+    def is_animating(self):
+        if self.running and self.current_step < len(self.timeline) - 1:
+            return True
+
+        return self.slider.dragging or any(button.click_effect for button in self.buttons)
 
-            if transition is None:
+    def start_simulation_worker(self):
+        self.timeline = ExecutionTimeline(self.original_simulator, memory_budget=self.memory_budget)
+        self.worker = SimulationWorker(self.original_simulator, target=WORKER_TARGET)
+        self.worker.start()
+
+    def consume_simulation_steps(self):
+        deadline = pygame.time.get_ticks() + CONSUME_BUDGET_MS
+
+        while pygame.time.get_ticks() < deadline:
+            batches = self.worker.poll(1)
+
+            if not batches:
                 break
 
-            step += 1
-            
-            self.simulation_steps.append({
-                "tapes": copy.deepcopy(simulator_copy.tapes),
-                "state": simulator_copy.current_state,
-                "transition": transition
-            })
+            self.timeline.extend(batches[0].deltas, batches[0].halted)
+
+        if self.timeline.truncated and not self.worker.is_cancelled():
+            self.worker.cancel()
+
+    def extend_simulation(self):
+        if not self.timeline.is_complete():
+            self.worker.extend(WORKER_TARGET)
+
+    def cancel_simulation(self):
+        self.worker.cancel()
     
     def reset_simulation(self):
         self.current_step = 0
-        self.animation_frame = 0
+        self.playback_progress = 0.0
         self.running = False
         
     def go_to_first_step(self):
         self.current_step = 0
-        self.animation_frame = 0
+        self.playback_progress = 0.0
         self.running = False
         
     def go_to_last_step(self):
-        self.current_step = len(self.simulation_steps) - 1
-        self.animation_frame = 0
+        self.current_step = len(self.timeline) - 1
+        self.playback_progress = 0.0
         self.running = False
         
     def next_step(self):
-        if self.current_step < len(self.simulation_steps) - 1:
+        if self.current_step < len(self.timeline) - 1:
             self.current_step += 1
-            self.animation_frame = self.animation_speed
+            self.playback_progress = 0.0
             
     def previous_step(self):
         if self.current_step > 0:
             self.current_step -= 1
-            self.animation_frame = self.animation_speed
+            self.playback_progress = 0.0
             
     def toggle_play(self):
         self.running = not self.running
+        self.playback_progress = 0.0
+        self.elapsed_ms = 0
+        self.clock.tick()
         
     def update_tapes(self):
-        current_tapes = self.simulation_steps[self.current_step]["tapes"]
+        current_tapes = self.timeline.seek(self.current_step).tapes
         for tape_gui, tape in zip(self.tape_guis, current_tapes):
             tape_gui.tape = tape
 
-    def draw_tapes(self):
-        for tape_gui in self.tape_guis:
-            tape_gui.draw(
-                screen=self.screen,
-                title_font=self.title_font,
-                regular_font=self.font,
-                small_font=self.small_font
-            )
-            
     def draw_transition_info(self):
         if self.current_step == 0:
             transition_text = "Initial state"
         else:
-            transition = self.simulation_steps[self.current_step]["transition"]
+            transition = self.timeline.seek(self.current_step).transition
             transition_text = str(transition) if transition else "No transition"
         
-        state_text = f"Current State: {self.simulation_steps[self.current_step]['state']}"
-        step_text = f"Step {self.current_step}/{len(self.simulation_steps)-1}"
+        state_text = f"Current State: {self.timeline.seek(self.current_step).current_state}"
+        step_text = f"Step {self.current_step}/{len(self.timeline)-1}"
         
         info_rect = pygame.Rect(50, 30, WINDOW_WIDTH - 100, 80)
         pygame.draw.rect(self.screen, LIGHT_BLUE, info_rect)
         pygame.draw.rect(self.screen, BLACK, info_rect, 2)
         
-        transition_surface = self.font.render(transition_text, True, BLACK)
-        state_surface = self.font.render(state_text, True, BLACK)
-        step_surface = self.title_font.render(step_text, True, BLACK)
+        transition_surface = self.surface_cache.render(self.font, transition_text, BLACK)
+        state_surface = self.surface_cache.render(self.font, state_text, BLACK)
+        step_surface = self.surface_cache.render(self.title_font, step_text, BLACK)
+        progress_surface = self.surface_cache.render(self.small_font, self.worker.progress(), BLACK)
         
         self.screen.blit(transition_surface, (60, 50))
         self.screen.blit(state_surface, (60, 80))
-        self.screen.blit(step_surface, (WINDOW_WIDTH - 250, 60))
+        self.screen.blit(step_surface, (WINDOW_WIDTH - 250, 50))
+        self.screen.blit(progress_surface, (WINDOW_WIDTH - 250, 82))
         
-    def handle_events(self):
+    def wait_for_events(self):
+        if self.is_animating():
+            self.elapsed_ms = self.clock.tick(FPS)
+            return pygame.event.get()
+
+        event = pygame.event.wait(IDLE_TIMEOUT_MS)
+        self.elapsed_ms = self.clock.tick()
+
+        return ([event] if event.type != pygame.NOEVENT else []) + pygame.event.get()
+
+    def handle_events(self, events):
         mouse_pos = pygame.mouse.get_pos()
         self.hovered_button = None
         
-        for event in pygame.event.get():
+        for event in events:
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.scheduler.invalidate()
+                self.needs_flip = True
+
             if event.type == pygame.QUIT:
+                self.worker.cancel()
                 pygame.quit()
                 sys.exit()
+
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_e:
+                    self.extend_simulation()
+                elif event.key == pygame.K_ESCAPE:
+                    self.cancel_simulation()
             
             for button in self.buttons:
                 if button.handle_event(event):
@@ -183,17 +262,20 @@ class GUI:
         for button in self.buttons:
             if button.check_hover(mouse_pos):
                 self.hovered_button = button
-        self.update_slider_position()
 
     def animate_transition(self):
-        if self.animation_frame > 0:
-            self.animation_frame -= 1
+        if not self.running or self.current_step >= len(self.timeline) - 1:
+            self.playback_progress = 0.0
             return
-            
-        if self.running and self.current_step < len(self.simulation_steps) - 1:
-            self.next_step()
 
-    def draw_buttons(self):
+        self.playback_progress += self.slider.val * self.elapsed_ms / 1000
+        steps = int(self.playback_progress)
+
+        if steps > 0:
+            self.playback_progress -= steps
+            self.current_step = min(self.current_step + steps, len(self.timeline) - 1)
+
+    def update_buttons(self):
         for button in self.buttons:
             if button.get_text() in ["Play", "Pause"]: 
                 button.colors['normal'] = DARK_BLUE if self.running else BLUE
@@ -201,30 +283,24 @@ class GUI:
                 button.colors['click'] = BLUE if self.running else (40, 110, 160)
                 
                 button.text = lambda: "Pause" if self.running else "Play"
-                
-            button.draw(self.screen, self.font)
 
     def draw_slider(self):
         self.slider.draw(self.screen, self.font)
-        label = self.font.render("instructions/min:", True, BLACK)
+        label = self.surface_cache.render(self.font, "steps/s:", BLACK)
         self.screen.blit(label, (self.slider.rect.left, self.slider.rect.top - 30))
 
     def run(self):
         while True:
-            self.clock.tick(FPS)
-            self.handle_events()
+            self.handle_events(self.wait_for_events())
+            self.consume_simulation_steps()
             self.animate_transition()
             self.update_tapes()
-            
-            self.screen.fill(WHITE)
-            
-            self.draw_tapes()
-            
-            self.draw_transition_info()
-            
-            self.draw_buttons()
-            self.draw_slider()
-            
-            pygame.display.flip()
+            self.update_buttons()
 
+            dirty_rects = self.scheduler.redraw(self.screen)
 
+            if self.needs_flip:
+                pygame.display.flip()
+                self.needs_flip = False
+            elif dirty_rects:
+                pygame.display.update(dirty_rects)
@@ -0,0 +1,52 @@
+from typing import Any, Callable, List, Optional, Tuple
+
+import pygame
+
+class RedrawRegion:
+    rect: pygame.Rect
+    key: Callable[[], Any]
+    draw: Callable[[], None]
+    last_key: Optional[Any]
+    dirty: bool
+
+    def __init__(self, rect: pygame.Rect, key: Callable[[], Any], draw: Callable[[], None]):
+        self.rect = rect
+        self.key = key
+        self.draw = draw
+        self.last_key = None
+        self.dirty = True
+
+class RedrawScheduler:
+    background: Tuple[int, int, int]
+    regions: List[RedrawRegion]
+
+    def __init__(self, background: Tuple[int, int, int]):
+        self.background = background
+        self.regions = []
+
+    def add(self, rect: pygame.Rect, key: Callable[[], Any], draw: Callable[[], None]) -> None:
+        self.regions.append(RedrawRegion(rect, key, draw))
+
+    def invalidate(self) -> None:
+        for region in self.regions:
+            region.dirty = True
+
+    def redraw(self, screen: pygame.Surface) -> List[pygame.Rect]:
+        rects = []
+
+        for region in self.regions:
+            key = region.key()
+
+            if not region.dirty and key == region.last_key:
+                continue
+
+            screen.fill(self.background, region.rect)
+            screen.set_clip(region.rect)
+            region.draw()
+            screen.set_clip(None)
+
+            region.last_key = key
+            region.dirty = False
+            rects.append(region.rect)
+
+        return rects
@@ -1,23 +1,36 @@
+import math
 import pygame
 
+from gui.surface_cache import shared_surface_cache
+
 class Slider:
-    def __init__(self, x, y, width, min_val, max_val, initial_val):
+    def __init__(self, x, y, width, min_val, max_val, initial_val, surface_cache=shared_surface_cache, logarithmic=False, format_value=None):
         self.rect = pygame.Rect(x, y, width, 20)
         self.handle_rect = pygame.Rect(x, y - 5, 15, 30)
         self.min = min_val
         self.max = max_val
         self.val = initial_val
         self.dragging = False
+        self.surface_cache = surface_cache
+        self.logarithmic = logarithmic
+        self.format_value = format_value if format_value is not None else lambda val: f"{int(val)}"
         self.update_handle()
 
     def update_handle(self):
-        ratio = (self.val - self.min) / (self.max - self.min)
+        if self.logarithmic:
+            ratio = math.log(self.val / self.min) / math.log(self.max / self.min)
+        else:
+            ratio = (self.val - self.min) / (self.max - self.min)
         x = self.rect.left + ratio * self.rect.width
         self.handle_rect.centerx = x
 
     def update_value(self, mouse_pos):
         x = max(self.rect.left, min(mouse_pos[0], self.rect.right))
-        self.val = self.min + ((x - self.rect.left) / self.rect.width) * (self.max - self.min)
+        ratio = (x - self.rect.left) / self.rect.width
+        if self.logarithmic:
+            self.val = self.min * (self.max / self.min) ** ratio
+        else:
+            self.val = self.min + ratio * (self.max - self.min)
         self.update_handle()
 
     def handle_event(self, event):
@@ -35,5 +48,5 @@ class Slider:
         pygame.draw.rect(surface, (70, 130, 180), self.handle_rect, border_radius=3)
         pygame.draw.rect(surface, (0, 0, 0), self.handle_rect, 1, border_radius=3)
 
-        text = font.render(f"{int(self.val)}", True, (0, 0, 0))
+        text = self.surface_cache.render(font, self.format_value(self.val), (0, 0, 0))
         surface.blit(text, (self.rect.right + 10, self.rect.centery - 10))
\ No newline at end of file
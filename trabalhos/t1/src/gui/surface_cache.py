@@ -0,0 +1,80 @@
+from typing import Any, Hashable, Optional, Tuple
+from collections import OrderedDict
+
+import pygame
+
+Color = Tuple[int, int, int]
+
+class SurfaceCache:
+    capacity: int
+    surfaces: 'OrderedDict[Hashable, pygame.Surface]'
+    hits: int
+    misses: int
+
+    def __init__(self, capacity: int = 2048):
+        if capacity < 1:
+            raise ValueError(f'Invalid surface cache capacity: {capacity}')
+
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font: Any, text: str, color: Color, antialias: bool = True) -> pygame.Surface:
+        key = ('text', font, text, color, antialias)
+        surface = self._get(key)
+
+        if surface is None:
+            surface = self._put(key, font.render(text, antialias, color))
+
+        return surface
+
+    def tile(self, size: Tuple[int, int], color: Color, border_color: Optional[Color] = None, border_width: int = 0) -> pygame.Surface:
+        key = ('tile', size, color, border_color, border_width)
+        surface = self._get(key)
+
+        if surface is None:
+            surface = pygame.Surface(size)
+            surface.fill(color)
+
+            if border_color is not None and border_width > 0:
+                pygame.draw.rect(surface, border_color, surface.get_rect(), border_width)
+
+            surface = self._put(key, surface)
+
+        return surface
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+
+        return self.hits / total if total > 0 else 0.0
+
+    def clear(self) -> None:
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.surfaces)
+
+    def _get(self, key: Hashable) -> Optional[pygame.Surface]:
+        surface = self.surfaces.get(key)
+
+        if surface is None:
+            self.misses += 1
+            return None
+
+        self.surfaces.move_to_end(key)
+        self.hits += 1
+
+        return surface
+
+    def _put(self, key: Hashable, surface: pygame.Surface) -> pygame.Surface:
+        self.surfaces[key] = surface
+
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+
+        return surface
+
+shared_surface_cache = SurfaceCache()
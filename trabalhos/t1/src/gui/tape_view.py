@@ -2,6 +2,7 @@ import pygame
 
 from tape import Tape
 from mark import format_mark_for_display
+from gui.surface_cache import SurfaceCache, shared_surface_cache
 
 CELL_SIZE = 50
 CELL_PADDING = 2
@@ -16,12 +17,16 @@ COLORS = {
 }
 
 class TapeView:
-    def __init__(self, tape: Tape, y_position: int, label: str, visible_cells=16):
+    def __init__(self, tape: Tape, y_position: int, label: str, visible_cells=16, surface_cache: SurfaceCache = shared_surface_cache):
         self.tape = tape
         self.y_position = y_position
         self.label = label
         self.visible_cells = visible_cells
+        self.surface_cache = surface_cache
         
+    def get_rect(self):
+        return pygame.Rect(48, self.y_position - 22, self.visible_cells * CELL_SIZE + 4, 140)
+
     def draw(self, screen, title_font, regular_font, small_font):
         self._draw_label(screen, title_font)
         self._draw_tape_background(screen)
@@ -30,7 +35,7 @@ class TapeView:
         self._draw_indices(screen, small_font)
         
     def _draw_label(self, screen, font):
-        label_surface = font.render(self.label, True, COLORS['text'])
+        label_surface = self.surface_cache.render(font, self.label, COLORS['text'])
         screen.blit(label_surface, (50, self.y_position - 20))
         
     def _draw_tape_background(self, screen):
@@ -41,20 +46,20 @@ class TapeView:
         
     def _draw_cells(self, screen, font):
         start_pos = max(0, self.tape.head - self.visible_cells // 2)
-        for i in range(self.visible_cells):
+        marks = self.tape.read_slice(start_pos, start_pos + self.visible_cells)
+        for i, mark in enumerate(marks):
             cell_pos = start_pos + i
             x = 50 + i * CELL_SIZE
-            self._draw_single_cell(screen, font, cell_pos, x)
+            self._draw_single_cell(screen, font, cell_pos, mark, x)
             
-    def _draw_single_cell(self, screen, font, cell_pos, x):
+    def _draw_single_cell(self, screen, font, cell_pos, mark, x):
         cell_rect = pygame.Rect(x, self.y_position + 30, CELL_SIZE - CELL_PADDING, CELL_SIZE - CELL_PADDING)
         color = COLORS['highlight'] if cell_pos == self.tape.head else COLORS['cell']
-        pygame.draw.rect(screen, color, cell_rect)
-        pygame.draw.rect(screen, COLORS['text'], cell_rect, 1)
+        screen.blit(self.surface_cache.tile(cell_rect.size, color, COLORS['text'], 1), cell_rect)
         
-        value = format_mark_for_display(self.tape.content.get(cell_pos, "B"))
+        value = format_mark_for_display(mark)
 
-        text = font.render(str(value), True, COLORS['text'])
+        text = self.surface_cache.render(font, str(value), COLORS['text'])
         screen.blit(text, text.get_rect(center=cell_rect.center))
         
     def _draw_head(self, screen):
@@ -71,5 +76,5 @@ class TapeView:
         for i in range(self.visible_cells):
             cell_pos = start_pos + i
             x = 50 + i * CELL_SIZE + CELL_SIZE // 2
-            text = font.render(str(cell_pos), True, COLORS['index'])
+            text = self.surface_cache.render(font, str(cell_pos), COLORS['index'])
             screen.blit(text, text.get_rect(center=(x, self.y_position + 30 + CELL_SIZE + 15)))
\ No newline at end of file
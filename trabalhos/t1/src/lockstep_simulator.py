@@ -0,0 +1,473 @@
+from typing import Any, Iterable, List, Optional, Self, Sequence, Tuple, Union
+
+import numpy as np
+
+from symbol_table import SymbolTable
+from run_result import HaltReason, RunResult
+from quintuple_turing_machine import QuintupleTuringMachineDefinition
+from quadruple_turing_machine import QuadrupleActType, QuadrupleTuringMachineDefinition
+from batch_runner import BatchInput, BatchResult, normalize_inputs
+
+NO_SYMBOL = -1
+RUNNING = 0
+DENSE_TABLE_LIMIT = 1 << 22
+KEY_LIMIT = 1 << 62
+
+Definition = Union[QuintupleTuringMachineDefinition, QuadrupleTuringMachineDefinition]
+
+def select_dtype(symbols: int) -> np.dtype:
+    for dtype in [np.uint8, np.uint16, np.uint32]:
+        if symbols <= np.iinfo(dtype).max + 1:
+            return np.dtype(dtype)
+
+    raise ValueError(f'Too many symbols for a tape: {symbols}')
+
+class LockstepTable:
+    dense: Optional[np.ndarray]
+    keys: Optional[np.ndarray]
+    values: Optional[np.ndarray]
+
+    def __init__(self, entries: List[Tuple[int, int]], size: int):
+        self.dense = None
+        self.keys = None
+        self.values = None
+
+        if size <= DENSE_TABLE_LIMIT:
+            self.dense = np.full(size, NO_SYMBOL, dtype=np.int32)
+
+            for key, transition in reversed(entries):
+                self.dense[key] = transition
+        else:
+            first = {}
+
+            for key, transition in entries:
+                first.setdefault(key, transition)
+
+            self.keys = np.array(sorted(first), dtype=np.int64)
+            self.values = np.array([first[key] for key in self.keys.tolist()], dtype=np.int32)
+
+    def lookup(self, keys: np.ndarray) -> np.ndarray:
+        if self.dense is not None:
+            return self.dense[keys]
+
+        if len(self.keys) == 0:
+            return np.full(len(keys), NO_SYMBOL, dtype=np.int32)
+
+        positions = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+
+        return np.where(self.keys[positions] == keys, self.values[positions], NO_SYMBOL)
+
+# The transitions that share one read pattern per state. Tapes are looked up in stages:
+# each stage maps the id of the (state, marks read so far) prefix and the marks under the
+# stage's tapes to the id of the longer prefix, and the last stage to a transition. Prefix
+# ids only count prefixes that occur in the machine, so keys stay below KEY_LIMIT however
+# many marks there are, and small machines need a single stage.
+class LockstepGroup:
+    strides: np.ndarray
+    stages: List[Tuple[int, int, int]]
+    tables: List[LockstepTable]
+
+    def __init__(
+        self,
+        tapes: int,
+        states: int,
+        marks: int,
+        patterns: List[Optional[Tuple[int, ...]]],
+        entries: List[Tuple[int, List[int], int]]):
+        self.stages = []
+        start = 0
+        prefixes = states
+
+        while start < tapes:
+            stop = start + 1
+
+            while stop < tapes and prefixes * marks ** (stop + 1 - start) < KEY_LIMIT:
+                stop += 1
+
+            if prefixes * marks ** (stop - start) >= KEY_LIMIT:
+                raise ValueError(f'Machine is too large for lockstep simulation: {prefixes} prefixes, {marks} marks')
+
+            self.stages.append((start, stop, marks ** (stop - start)))
+            start = stop
+            prefixes = max(len(entries), 1)
+
+        self.strides = np.zeros((states, tapes), dtype=np.int64)
+
+        for state, pattern in enumerate(patterns):
+            if pattern is not None:
+                for i in pattern:
+                    start = next(start for start, stop, _ in self.stages if start <= i < stop)
+                    self.strides[state, i] = marks ** (i - start)
+
+        self.tables = []
+        prefixes = [state for state, _, _ in entries]
+        size = states
+
+        for number, (start, stop, span) in enumerate(self.stages):
+            keys = [
+                prefix * span + sum(read[i] * int(self.strides[state, i]) for i in range(start, stop))
+                for prefix, (state, read, _) in zip(prefixes, entries)
+            ]
+
+            if number == len(self.stages) - 1:
+                self.tables.append(LockstepTable([(key, transition) for key, (_, _, transition) in zip(keys, entries)], size * span))
+            else:
+                ids = {}
+
+                for key in keys:
+                    ids.setdefault(key, len(ids))
+
+                self.tables.append(LockstepTable(list(ids.items()), size * span))
+                prefixes = [ids[key] for key in keys]
+                size = max(len(ids), 1)
+
+    def lookup(self, states: np.ndarray, marks: List[np.ndarray]) -> np.ndarray:
+        strides = self.strides[states]
+        prefixes = states
+
+        for number, ((start, stop, span), table) in enumerate(zip(self.stages, self.tables)):
+            keys = prefixes * span
+
+            for i in range(start, stop):
+                keys += marks[i] * strides[:, i]
+
+            if number == 0:
+                prefixes = table.lookup(keys)
+            else:
+                missing = prefixes == NO_SYMBOL
+                keys[missing] = 0
+                prefixes = table.lookup(keys)
+                prefixes[missing] = NO_SYMBOL
+
+            if number < len(self.stages) - 1:
+                prefixes = prefixes.astype(np.int64)
+
+        return prefixes
+
+class LockstepMachine:
+    tapes: int
+    states: SymbolTable
+    marks: SymbolTable
+
+    initial_state: int
+    final_states: np.ndarray
+
+    next_states: np.ndarray
+    writes: np.ndarray
+    moves: np.ndarray
+    groups: List[LockstepGroup]
+
+    def __init__(
+        self,
+        tapes: int,
+        states: SymbolTable,
+        marks: SymbolTable,
+        initial_state: int,
+        final_states: Iterable[int],
+        sources: List[int],
+        next_states: List[int],
+        reads: List[List[int]],
+        writes: List[List[int]],
+        moves: List[List[int]]):
+        self.tapes = tapes
+        self.states = states
+        self.marks = marks
+        self.initial_state = initial_state
+
+        self.final_states = np.zeros(len(states), dtype=bool)
+        self.final_states[list(final_states)] = True
+
+        self.next_states = np.array(next_states, dtype=np.int64)
+        self.writes = np.array(writes, dtype=np.int64).reshape(len(sources), tapes)
+        self.moves = np.array(moves, dtype=np.int64).reshape(len(sources), tapes)
+
+        self._build_tables(sources, reads)
+
+    def compile(definition: Definition) -> Self:
+        tapes = definition.tapes
+
+        states = SymbolTable([definition.initial_state], blank=None)
+        marks = SymbolTable(definition.alphabet)
+
+        sources = []
+        next_states = []
+        reads = []
+        writes = []
+        moves = []
+
+        for transition in definition.transitions:
+            if len(transition.acts) != tapes:
+                raise ValueError(f'Transition {transition} does not have exactly {tapes} acts')
+
+            sources.append(states.intern(transition.source_state))
+            next_states.append(states.intern(transition.destination_state))
+
+            read = []
+            write = []
+            move = []
+
+            for act in transition.acts:
+                if isinstance(definition, QuintupleTuringMachineDefinition):
+                    read.append(marks.intern(act.read))
+                    write.append(marks.intern(act.write))
+                    move.append(act.direction.value)
+                elif act.kind == QuadrupleActType.READ_WRITE:
+                    read.append(marks.intern(act.read))
+                    write.append(marks.intern(act.write))
+                    move.append(0)
+                elif act.kind == QuadrupleActType.SHIFT:
+                    read.append(NO_SYMBOL)
+                    write.append(NO_SYMBOL)
+                    move.append(act.direction.value)
+                else:
+                    raise ValueError(f'Unknown act type: {act.kind}')
+
+            reads.append(read)
+            writes.append(write)
+            moves.append(move)
+
+        return LockstepMachine(
+            tapes=tapes,
+            states=states,
+            marks=marks,
+            initial_state=states.intern(definition.initial_state),
+            final_states=[states.intern(state) for state in definition.final_states],
+            sources=sources,
+            next_states=next_states,
+            reads=reads,
+            writes=writes,
+            moves=moves
+        )
+
+    def lookup(self, states: np.ndarray, marks: List[np.ndarray]) -> np.ndarray:
+        transitions = None
+
+        for group in self.groups:
+            found = group.lookup(states, marks)
+
+            if transitions is None:
+                transitions = found
+            else:
+                transitions = np.where(
+                    (found != NO_SYMBOL) & ((transitions == NO_SYMBOL) | (found < transitions)),
+                    found,
+                    transitions
+                )
+
+        if transitions is None:
+            return np.full(len(states), NO_SYMBOL, dtype=np.int32)
+
+        return transitions
+
+    def _build_tables(self, sources: List[int], reads: List[List[int]]) -> None:
+        patterns = [[] for _ in range(len(self.states))]
+        grouped = []
+
+        for transition, (source, read) in enumerate(zip(sources, reads)):
+            positions = tuple(i for i in range(self.tapes) if read[i] != NO_SYMBOL)
+
+            if positions not in patterns[source]:
+                patterns[source].append(positions)
+
+            group = patterns[source].index(positions)
+
+            while len(grouped) <= group:
+                grouped.append([])
+
+            grouped[group].append((source, read, transition))
+
+        self.groups = [
+            LockstepGroup(
+                self.tapes,
+                len(self.states),
+                len(self.marks),
+                [state_patterns[group] if group < len(state_patterns) else None for state_patterns in patterns],
+                entries
+            )
+            for group, entries in enumerate(grouped)
+        ]
+
+class LockstepSimulator:
+    machine: LockstepMachine
+    instances: int
+
+    cells: np.ndarray
+    origin: int
+    heads: np.ndarray
+
+    states: np.ndarray
+    steps: np.ndarray
+    budgets: np.ndarray
+    reasons: np.ndarray
+    active: np.ndarray
+
+    def __init__(
+        self,
+        machine: LockstepMachine,
+        inputs: Sequence[Sequence[Any]],
+        budgets: Optional[Sequence[Optional[int]]] = None,
+        capacity: int = 16):
+        self.machine = machine
+        self.instances = len(inputs)
+
+        width = max([capacity] + [len(input) + 2 for input in inputs])
+        ids = machine.marks.ids
+
+        self.cells = np.zeros((machine.tapes, self.instances, width), dtype=select_dtype(len(machine.marks)))
+        self.origin = -1
+        self.heads = np.ones((machine.tapes, self.instances), dtype=np.int64)
+
+        for index, input in enumerate(inputs):
+            try:
+                self.cells[0, index, 2:2 + len(input)] = [ids[mark] for mark in input]
+            except KeyError as error:
+                raise ValueError(f'Input {index} has a mark outside the alphabet: {error.args[0]}')
+
+        self.states = np.full(self.instances, machine.initial_state, dtype=np.int64)
+        self.steps = np.zeros(self.instances, dtype=np.int64)
+        self.budgets = np.full(self.instances, -1, dtype=np.int64)
+        self.reasons = np.full(self.instances, RUNNING, dtype=np.int8)
+        self.active = np.arange(self.instances, dtype=np.int64)
+
+        if budgets is not None:
+            self.budgets[:] = [-1 if budget is None else budget for budget in budgets]
+
+        self._written = [bool((machine.writes[:, i] != NO_SYMBOL).any()) for i in range(machine.tapes)]
+        self._moved = [bool(machine.moves[:, i].any()) for i in range(machine.tapes)]
+
+    def step(self) -> int:
+        active = self.active
+
+        if len(active) == 0:
+            return 0
+
+        width = self.cells.shape[2]
+        base = active * width
+        flat = [self.cells[i].reshape(-1) for i in range(self.machine.tapes)]
+        positions = [base + self.heads[i, active] for i in range(self.machine.tapes)]
+
+        states = self.states[active]
+        marks = [flat[i][positions[i]].astype(np.int64) for i in range(self.machine.tapes)]
+        transitions = self.machine.lookup(states, marks)
+
+        halted = transitions == NO_SYMBOL
+        exhausted = (self.steps[active] == self.budgets[active]) & ~halted
+
+        if halted.any() or exhausted.any():
+            accepted = self.machine.final_states[states]
+
+            self.reasons[active[halted & accepted]] = HaltReason.ACCEPTED.value
+            self.reasons[active[halted & ~accepted]] = HaltReason.REJECTED.value
+            self.reasons[active[exhausted]] = HaltReason.BUDGET.value
+
+            running = ~(halted | exhausted)
+            active = active[running]
+            transitions = transitions[running]
+            positions = [position[running] for position in positions]
+
+            self.active = active
+
+        for i in range(self.machine.tapes):
+            if self._written[i]:
+                writes = self.machine.writes[transitions, i]
+                mask = writes != NO_SYMBOL
+                flat[i][positions[i][mask]] = writes[mask]
+
+            if self._moved[i]:
+                self.heads[i, active] += self.machine.moves[transitions, i]
+
+        self.states[active] = self.machine.next_states[transitions]
+        self.steps[active] += 1
+
+        if len(active) > 0 and (self.heads.min() < 0 or self.heads.max() >= width):
+            self._grow()
+
+        return len(active)
+
+    def run(self) -> List[RunResult]:
+        while len(self.active) > 0:
+            self.step()
+
+        return self.results()
+
+    def results(self) -> List[RunResult]:
+        extents = self.extents()
+
+        return [
+            RunResult(
+                reason=HaltReason(reason) if reason != RUNNING else HaltReason.INTERRUPTED,
+                steps=steps,
+                final_state=self.machine.states.lookup(state),
+                extents=[tape[index] for tape in extents]
+            )
+            for index, (reason, steps, state) in enumerate(zip(self.reasons.tolist(), self.steps.tolist(), self.states.tolist()))
+        ]
+
+    def extents(self) -> List[List[Optional[Tuple[int, int]]]]:
+        result = []
+
+        for cells in self.cells:
+            marked = cells != 0
+            any_marked = marked.any(axis=1).tolist()
+            first = marked.argmax(axis=1).tolist()
+            last = (cells.shape[1] - 1 - marked[:, ::-1].argmax(axis=1)).tolist()
+
+            result.append([
+                (start + self.origin, stop + self.origin) if has_marks else None
+                for has_marks, start, stop in zip(any_marked, first, last)
+            ])
+
+        return result
+
+    def read_slice(self, instance: int, tape: int, start: int, stop: int) -> List[Any]:
+        symbols = self.machine.marks.symbols
+        cells = self.cells[tape, instance]
+        first = max(start - self.origin, 0)
+        last = min(stop - self.origin, len(cells))
+
+        if first >= last:
+            return [symbols[0]] * max(0, stop - start)
+
+        return (
+            [symbols[0]] * (first - (start - self.origin)) +
+            [symbols[id] for id in cells[first:last].tolist()] +
+            [symbols[0]] * ((stop - self.origin) - last)
+        )
+
+    def head(self, instance: int, tape: int) -> int:
+        return int(self.heads[tape, instance]) + self.origin
+
+    def state(self, instance: int) -> Any:
+        return self.machine.states.lookup(int(self.states[instance]))
+
+    def _grow(self) -> None:
+        tapes, instances, width = self.cells.shape
+        padding = width // 2
+
+        cells = np.zeros((tapes, instances, width + 2 * padding), dtype=self.cells.dtype)
+        cells[:, :, padding:padding + width] = self.cells
+
+        self.cells = cells
+        self.heads += padding
+        self.origin -= padding
+
+def run_lockstep(definition: Definition, inputs: Iterable[BatchInput], max_steps: Optional[int] = None) -> List[BatchResult]:
+    tasks = list(normalize_inputs(inputs, max_steps))
+
+    simulator = LockstepSimulator(
+        LockstepMachine.compile(definition),
+        [list(input) for _, input, _ in tasks],
+        [budget for _, _, budget in tasks]
+    )
+
+    results = []
+
+    for (index, input, _), result in zip(tasks, simulator.run()):
+        tapes = [
+            [] if extents is None else simulator.read_slice(index, tape, extents[0], extents[1] + 1)
+            for tape, extents in enumerate(result.extents)
+        ]
+
+        results.append(BatchResult(index, input, result, tapes))
+
+    return results
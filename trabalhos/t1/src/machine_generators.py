@@ -0,0 +1,129 @@
+from typing import Dict, List, Tuple
+from io import StringIO
+import random
+
+from symbol_table import BLANK
+from quintuple_turing_machine import QuintupleTuringMachineDefinition
+
+Rule = Tuple[int, str, int, str, str]
+
+BUSY_BEAVER_CHAMPIONS: Dict[int, Dict[Tuple[str, str], Tuple[str, str, str]]] = {
+    2: {
+        ('A', '0'): ('1', 'R', 'B'), ('A', '1'): ('1', 'L', 'B'),
+        ('B', '0'): ('1', 'L', 'A'), ('B', '1'): ('1', 'R', 'H'),
+    },
+    3: {
+        ('A', '0'): ('1', 'R', 'B'), ('A', '1'): ('1', 'R', 'H'),
+        ('B', '0'): ('0', 'R', 'C'), ('B', '1'): ('1', 'R', 'B'),
+        ('C', '0'): ('1', 'L', 'C'), ('C', '1'): ('1', 'L', 'A'),
+    },
+    4: {
+        ('A', '0'): ('1', 'R', 'B'), ('A', '1'): ('1', 'L', 'B'),
+        ('B', '0'): ('1', 'L', 'A'), ('B', '1'): ('0', 'L', 'C'),
+        ('C', '0'): ('1', 'R', 'H'), ('C', '1'): ('1', 'L', 'D'),
+        ('D', '0'): ('1', 'R', 'D'), ('D', '1'): ('0', 'R', 'A'),
+    },
+}
+
+def format_definition(states: int, input_symbols: List[str], tape_symbols: List[str], rules: List[Rule]) -> str:
+    lines = [
+        f'{states} {len(input_symbols)} {len(tape_symbols)} {len(rules)}',
+        ' '.join(str(state) for state in range(1, states + 1)),
+        ' '.join(input_symbols),
+        ' '.join(tape_symbols),
+    ]
+
+    lines.extend(f'({source},{read})=({destination},{write},{shift})' for source, read, destination, write, shift in rules)
+
+    return '\n'.join(lines) + '\n'
+
+def build_definition(states: int, input_symbols: List[str], tape_symbols: List[str], rules: List[Rule]) -> QuintupleTuringMachineDefinition:
+    return QuintupleTuringMachineDefinition.parse(StringIO(format_definition(states, input_symbols, tape_symbols, rules)))
+
+def wrap_rules(states: int, marks: List[str], rules: List[Rule]) -> List[Rule]:
+    halt = states + 2
+    final = states + 3
+
+    wrapped = [(1, BLANK, 2, BLANK, 'R')]
+    wrapped.extend((source + 1, read, halt if destination is None else destination + 1, write, shift) for source, read, destination, write, shift in rules)
+    wrapped.extend((halt, mark, halt, mark, 'R') for mark in marks if mark != BLANK)
+    wrapped.append((halt, BLANK, final, BLANK, 'S'))
+
+    return wrapped
+
+def wrap_machine(states: int, marks: List[str], rules: List[Rule]) -> QuintupleTuringMachineDefinition:
+    return build_definition(states + 3, [mark for mark in marks if mark != BLANK], marks, wrap_rules(states, marks, rules))
+
+def binary_counter() -> QuintupleTuringMachineDefinition:
+    return build_definition(5, ['0', '1'], ['0', '1', BLANK], [
+        (1, BLANK, 2, BLANK, 'R'),
+        (2, '0', 2, '0', 'R'),
+        (2, '1', 2, '1', 'R'),
+        (2, BLANK, 3, BLANK, 'L'),
+        (3, '1', 3, '0', 'L'),
+        (3, '0', 4, '1', 'L'),
+        (3, BLANK, 5, BLANK, 'S'),
+        (4, '0', 4, '0', 'L'),
+        (4, '1', 4, '1', 'L'),
+        (4, BLANK, 2, BLANK, 'R'),
+    ])
+
+def binary_counter_input(bits: int) -> str:
+    return '0' * bits
+
+def unary_adder() -> QuintupleTuringMachineDefinition:
+    return build_definition(6, ['0', '1'], ['0', '1', BLANK], [
+        (1, BLANK, 2, BLANK, 'R'),
+        (2, '1', 2, '1', 'R'),
+        (2, '0', 3, '1', 'R'),
+        (3, '1', 3, '1', 'R'),
+        (3, BLANK, 4, BLANK, 'L'),
+        (4, '1', 5, BLANK, 'L'),
+        (5, '1', 5, '1', 'L'),
+        (5, BLANK, 6, BLANK, 'S'),
+    ])
+
+def unary_adder_input(left: int, right: int) -> str:
+    return '1' * left + '0' + '1' * right
+
+def busy_beaver(states: int) -> QuintupleTuringMachineDefinition:
+    champion = BUSY_BEAVER_CHAMPIONS.get(states)
+
+    if champion is None:
+        raise ValueError(f'No busy beaver champion for {states} states')
+
+    names = sorted({state for state, _ in champion})
+    marks = {'0': BLANK, '1': '1'}
+
+    rules = [
+        (names.index(state) + 1, marks[read], None if destination == 'H' else names.index(destination) + 1, marks[write], shift)
+        for (state, read), (write, shift, destination) in champion.items()
+    ]
+
+    return wrap_machine(len(names), [BLANK, '1'], rules)
+
+def random_machine_source(states: int, symbols: int, seed: int, halt_probability: float = 0.05) -> str:
+    if states < 1 or symbols < 2:
+        raise ValueError('Random machines need at least one state and two symbols')
+
+    generator = random.Random(seed)
+    marks = [BLANK] + [str(i) for i in range(symbols - 1)]
+    rules = []
+
+    for state in range(1, states + 1):
+        for read in marks:
+            destination = None if generator.random() < halt_probability else generator.randint(1, states)
+            rules.append((state, read, destination, generator.choice(marks), generator.choice('LR')))
+
+    return format_definition(states + 3, marks[1:], marks, wrap_rules(states, marks, rules))
+
+def random_machine(states: int, symbols: int, seed: int, halt_probability: float = 0.05) -> QuintupleTuringMachineDefinition:
+    return QuintupleTuringMachineDefinition.parse(StringIO(random_machine_source(states, symbols, seed, halt_probability)))
+
+def random_input(symbols: int, length: int, seed: int) -> str:
+    if symbols > 11:
+        raise ValueError(f'Random inputs use single-digit marks, {symbols} symbols requested')
+
+    generator = random.Random(seed)
+
+    return ''.join(str(generator.randrange(symbols - 1)) for _ in range(length))
@@ -0,0 +1,307 @@
+from typing import Any, BinaryIO, List, Optional, Tuple, Union
+from array import array
+import mmap
+import struct
+
+from direction import Direction
+from symbol_table import SymbolTable
+from quadruple_turing_machine import QuadrupleAct, QuadrupleActType, QuadrupleTransition, QuadrupleTuringMachineDefinition
+from quintuple_turing_machine import QuintupleAct, QuintupleTransition, QuintupleTuringMachineDefinition
+from compiled_turing_machine import CompiledQuadrupleTuringMachine
+
+MAGIC = b'TMDF'
+COMPILED_MAGIC = b'TMCM'
+VERSION = 1
+
+QUINTUPLE_KIND = 1
+QUADRUPLE_KIND = 2
+
+STRING_ENTRY = 0
+INTEGER_ENTRY = 1
+
+NO_ENTRY = 0xFFFFFFFF
+
+HEADER = struct.Struct('<4sHBxIIIII')
+STRING_HEADER = struct.Struct('<BI')
+INTEGER = struct.Struct('<Bq')
+ID = struct.Struct('<I')
+TRANSITION_HEADER = struct.Struct('<II')
+QUINTUPLE_ACT = struct.Struct('<IIb')
+QUADRUPLE_ACT = struct.Struct('<BbII')
+COMPILED_HEADER = struct.Struct('<4sHxxIIIqI')
+ARRAY_HEADER = struct.Struct('<cxxxQ')
+
+Definition = Union[QuintupleTuringMachineDefinition, QuadrupleTuringMachineDefinition]
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+def dumps(definition: Definition) -> bytes:
+    table = SymbolTable(blank=None)
+
+    alphabet = [table.intern(mark) for mark in definition.alphabet]
+    initial_state = table.intern(definition.initial_state)
+    final_states = [table.intern(state) for state in definition.final_states]
+
+    if isinstance(definition, QuintupleTuringMachineDefinition):
+        kind = QUINTUPLE_KIND
+        records = [pack_quintuple_transition(table, definition.tapes, transition) for transition in definition.transitions]
+    elif isinstance(definition, QuadrupleTuringMachineDefinition):
+        kind = QUADRUPLE_KIND
+        records = [pack_quadruple_transition(table, definition.tapes, transition) for transition in definition.transitions]
+    else:
+        raise ValueError(f'Unsupported definition type: {type(definition)}')
+
+    chunks = [HEADER.pack(
+        MAGIC,
+        VERSION,
+        kind,
+        definition.tapes,
+        len(table),
+        len(alphabet),
+        len(final_states),
+        len(records)
+    )]
+
+    for entry in table.symbols:
+        chunks.append(pack_entry(entry))
+
+    chunks.append(pack_ids(alphabet))
+    chunks.append(ID.pack(initial_state))
+    chunks.append(pack_ids(final_states))
+    chunks.extend(records)
+
+    return b''.join(chunks)
+
+def dump(definition: Definition, stream: BinaryIO) -> None:
+    stream.write(dumps(definition))
+
+def loads(buffer: Buffer) -> Definition:
+    with memoryview(buffer) as view:
+        try:
+            return unpack_definition(view)
+        except (struct.error, IndexError) as error:
+            raise ValueError(f'Truncated or corrupt machine definition: {error}') from None
+
+def unpack_definition(view: memoryview) -> Definition:
+    magic, version, kind, tapes, entries, alphabet_size, final_states_size, transitions = HEADER.unpack_from(view, 0)
+
+    if magic != MAGIC:
+        raise ValueError('Not a machine definition file')
+
+    if version != VERSION:
+        raise ValueError(f'Unsupported machine definition version: {version}')
+
+    offset = HEADER.size
+    table = []
+
+    for _ in range(entries):
+        entry, offset = unpack_entry(view, offset)
+        table.append(entry)
+
+    alphabet, offset = unpack_ids(view, offset, alphabet_size)
+    initial_state = ID.unpack_from(view, offset)[0]
+    final_states, offset = unpack_ids(view, offset + ID.size, final_states_size)
+
+    if kind == QUINTUPLE_KIND:
+        size = TRANSITION_HEADER.size + tapes * QUINTUPLE_ACT.size
+        check_records(view, offset, transitions, size)
+
+        return QuintupleTuringMachineDefinition(
+            tapes=tapes,
+            alphabet=[table[id] for id in alphabet],
+            transitions=[unpack_quintuple_transition(table, tapes, view, offset + i * size) for i in range(transitions)],
+            initial_state=table[initial_state],
+            final_states=[table[id] for id in final_states]
+        )
+    elif kind == QUADRUPLE_KIND:
+        size = TRANSITION_HEADER.size + tapes * QUADRUPLE_ACT.size
+        check_records(view, offset, transitions, size)
+
+        return QuadrupleTuringMachineDefinition(
+            tapes=tapes,
+            alphabet=[table[id] for id in alphabet],
+            transitions=[unpack_quadruple_transition(table, tapes, view, offset + i * size) for i in range(transitions)],
+            initial_state=table[initial_state],
+            final_states=[table[id] for id in final_states]
+        )
+    else:
+        raise ValueError(f'Unknown machine definition kind: {kind}')
+
+def check_records(view: memoryview, offset: int, count: int, size: int) -> None:
+    if offset + count * size > len(view):
+        raise ValueError(f'Truncated machine definition: expected {count} transitions of {size} bytes at offset {offset}, found {len(view) - offset} bytes')
+
+def load(path: str) -> Definition:
+    with open(path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return loads(buffer)
+
+def dumps_compiled(machine: CompiledQuadrupleTuringMachine) -> bytes:
+    chunks = [COMPILED_HEADER.pack(
+        COMPILED_MAGIC,
+        VERSION,
+        machine.tapes,
+        len(machine.states),
+        len(machine.marks),
+        machine.initial_state,
+        len(machine.final_states)
+    )]
+
+    chunks.extend(pack_entry(state) for state in machine.states.symbols)
+    chunks.extend(pack_entry(mark) for mark in machine.marks.symbols)
+    chunks.append(pack_ids(sorted(machine.final_states)))
+
+    for values in [machine.sources, machine.next_states, machine.reads, machine.writes, machine.moves]:
+        chunks.append(ARRAY_HEADER.pack(values.typecode.encode('ascii'), len(values)))
+        chunks.append(values.tobytes())
+
+    return b''.join(chunks)
+
+# With copy=False the tables are memoryview casts into buffer rather than arrays, so the
+# buffer must stay open (and unmodified) for as long as the machine is in use.
+def loads_compiled(buffer: Buffer, transitions: Optional[List[QuadrupleTransition]] = None, copy: bool = True) -> CompiledQuadrupleTuringMachine:
+    with memoryview(buffer) as view:
+        try:
+            return unpack_compiled(view, transitions, copy)
+        except (struct.error, IndexError) as error:
+            raise ValueError(f'Truncated or corrupt compiled machine: {error}') from None
+
+def unpack_compiled(view: memoryview, transitions: Optional[List[QuadrupleTransition]], copy: bool = True) -> CompiledQuadrupleTuringMachine:
+    magic, version, tapes, states_size, marks_size, initial_state, final_states_size = COMPILED_HEADER.unpack_from(view, 0)
+
+    if magic != COMPILED_MAGIC:
+        raise ValueError('Not a compiled machine file')
+
+    if version != VERSION:
+        raise ValueError(f'Unsupported compiled machine version: {version}')
+
+    offset = COMPILED_HEADER.size
+    states = SymbolTable(blank=None)
+    marks = SymbolTable(blank=None)
+
+    for table, size in [(states, states_size), (marks, marks_size)]:
+        for _ in range(size):
+            entry, offset = unpack_entry(view, offset)
+            table.intern(entry)
+
+    final_states, offset = unpack_ids(view, offset, final_states_size)
+    arrays = []
+
+    for _ in range(5):
+        typecode, count = ARRAY_HEADER.unpack_from(view, offset)
+        values = array(typecode.decode('ascii'))
+        start = offset + ARRAY_HEADER.size
+        stop = start + count * values.itemsize
+
+        if stop > len(view):
+            raise ValueError(f'Truncated compiled machine: expected {count} values at offset {start}')
+
+        if copy:
+            with view[start:stop] as data:
+                values.frombytes(data)
+        else:
+            values = view[start:stop].cast(values.typecode)
+
+        arrays.append(values)
+        offset = stop
+
+    sources, next_states, reads, writes, moves = arrays
+
+    return CompiledQuadrupleTuringMachine(
+        tapes=tapes,
+        states=states,
+        marks=marks,
+        initial_state=initial_state,
+        final_states=set(final_states),
+        sources=sources,
+        next_states=next_states,
+        reads=reads,
+        writes=writes,
+        moves=moves,
+        transitions=transitions
+    )
+
+def pack_entry(entry: Any) -> bytes:
+    if isinstance(entry, bool) or not isinstance(entry, (int, str)):
+        raise ValueError(f'Unsupported entry type: {type(entry)}')
+
+    if isinstance(entry, int):
+        return INTEGER.pack(INTEGER_ENTRY, entry)
+
+    data = entry.encode('utf-8')
+
+    return STRING_HEADER.pack(STRING_ENTRY, len(data)) + data
+
+def unpack_entry(view: memoryview, offset: int) -> Tuple[Any, int]:
+    if view[offset] == INTEGER_ENTRY:
+        return INTEGER.unpack_from(view, offset)[1], offset + INTEGER.size
+
+    _, length = STRING_HEADER.unpack_from(view, offset)
+    start = offset + STRING_HEADER.size
+    stop = start + length
+
+    if stop > len(view):
+        raise ValueError(f'Truncated string entry at offset {offset}')
+
+    with view[start:stop] as data:
+        return str(data, 'utf-8'), stop
+
+def pack_ids(ids: List[int]) -> bytes:
+    return struct.pack(f'<{len(ids)}I', *ids)
+
+def unpack_ids(view: memoryview, offset: int, count: int) -> Tuple[List[int], int]:
+    return list(struct.unpack_from(f'<{count}I', view, offset)), offset + count * ID.size
+
+def pack_quintuple_transition(table: SymbolTable, tapes: int, transition: QuintupleTransition) -> bytes:
+    if len(transition.acts) != tapes:
+        raise ValueError(f'Transition has {len(transition.acts)} acts for {tapes} tapes: {transition}')
+
+    return TRANSITION_HEADER.pack(table.intern(transition.source_state), table.intern(transition.destination_state)) + b''.join(
+        QUINTUPLE_ACT.pack(table.intern(act.read), table.intern(act.write), act.direction.value)
+        for act in transition.acts
+    )
+
+def unpack_quintuple_transition(table: List[Any], tapes: int, view: memoryview, offset: int) -> QuintupleTransition:
+    source_state, destination_state = TRANSITION_HEADER.unpack_from(view, offset)
+    offset += TRANSITION_HEADER.size
+
+    return QuintupleTransition(
+        source_state=table[source_state],
+        destination_state=table[destination_state],
+        acts=[
+            QuintupleAct(table[read], table[write], Direction(direction))
+            for read, write, direction in (QUINTUPLE_ACT.unpack_from(view, offset + i * QUINTUPLE_ACT.size) for i in range(tapes))
+        ]
+    )
+
+def pack_quadruple_transition(table: SymbolTable, tapes: int, transition: QuadrupleTransition) -> bytes:
+    if len(transition.acts) != tapes:
+        raise ValueError(f'Transition has {len(transition.acts)} acts for {tapes} tapes: {transition}')
+
+    acts = []
+
+    for act in transition.acts:
+        if act.kind == QuadrupleActType.SHIFT:
+            acts.append(QUADRUPLE_ACT.pack(act.kind.value, act.direction.value, NO_ENTRY, NO_ENTRY))
+        else:
+            acts.append(QUADRUPLE_ACT.pack(act.kind.value, 0, table.intern(act.read), table.intern(act.write)))
+
+    return TRANSITION_HEADER.pack(table.intern(transition.source_state), table.intern(transition.destination_state)) + b''.join(acts)
+
+def unpack_quadruple_transition(table: List[Any], tapes: int, view: memoryview, offset: int) -> QuadrupleTransition:
+    source_state, destination_state = TRANSITION_HEADER.unpack_from(view, offset)
+    offset += TRANSITION_HEADER.size
+    acts = []
+
+    for i in range(tapes):
+        kind, direction, read, write = QUADRUPLE_ACT.unpack_from(view, offset + i * QUADRUPLE_ACT.size)
+
+        if kind == QuadrupleActType.SHIFT.value:
+            acts.append(QuadrupleAct.shift(Direction(direction)))
+        else:
+            acts.append(QuadrupleAct.read_write(table[read], table[write]))
+
+    return QuadrupleTransition(
+        source_state=table[source_state],
+        destination_state=table[destination_state],
+        acts=acts
+    )
@@ -0,0 +1,205 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+from dataclasses import dataclass
+from collections import OrderedDict
+
+from quadruple_turing_machine import QuadrupleTuringMachineSimulator
+from quintuple_turing_machine import QuintupleTuringMachineSimulator
+from run_result import HaltReason, RunResult
+
+Simulator = Union[QuadrupleTuringMachineSimulator, QuintupleTuringMachineSimulator]
+Window = Tuple[str, Tuple[int, ...], Tuple[Tuple[Any, ...], ...]]
+
+@dataclass
+class MacroStep:
+    state: str
+    offsets: Tuple[int, ...]
+    contents: Tuple[Tuple[Any, ...], ...]
+    steps: int
+    halted: bool
+
+@dataclass
+class MacroStepStatistics:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+
+        return self.hits / lookups if lookups > 0 else 0.0
+
+class MacroStepSimulator:
+    simulator: Simulator
+    width: int
+    cache_size: int
+    cache: OrderedDict[Window, MacroStep]
+    statistics: MacroStepStatistics
+
+    def __init__(self, simulator: Simulator, width: int = 8, cache_size: int = 1 << 16):
+        if width < 1:
+            raise ValueError(f'Invalid window width: {width}')
+
+        self.simulator = simulator
+        self.width = width
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.statistics = MacroStepStatistics()
+
+        self._effects = {}
+        self._cached_index = None
+
+    def run(self, max_steps: Optional[int] = None) -> RunResult:
+        self._invalidate()
+
+        blocks = self._load_blocks()
+        heads = [tape.head for tape in self.simulator.tapes]
+        state = self.simulator.current_state
+        blank = ('B',) * self.width
+
+        steps = 0
+        halted = False
+
+        while not halted and (max_steps is None or steps < max_steps):
+            indexes = [head // self.width for head in heads]
+            offsets = tuple(head - index * self.width for head, index in zip(heads, indexes))
+            contents = tuple(tape_blocks.get(index, blank) for tape_blocks, index in zip(blocks, indexes))
+
+            window = (state, offsets, contents)
+            step = self.cache.get(window)
+
+            if step is not None and (max_steps is None or steps + step.steps <= max_steps):
+                self.statistics.hits += 1
+                self.cache.move_to_end(window)
+            else:
+                if step is None:
+                    self.statistics.misses += 1
+
+                step = self._simulate(state, offsets, contents, None if max_steps is None else max_steps - steps)
+
+                if step is None:
+                    break
+
+                if step.halted or self._has_left_window(step.offsets):
+                    self._remember(window, step)
+
+            for tape_blocks, index, content in zip(blocks, indexes, step.contents):
+                tape_blocks[index] = content
+
+            heads = [index * self.width + offset for index, offset in zip(indexes, step.offsets)]
+            state = step.state
+            steps += step.steps
+            halted = step.halted
+
+        self._store_blocks(blocks)
+
+        for tape, head in zip(self.simulator.tapes, heads):
+            tape.head = head
+
+        self.simulator.current_state = state
+        self.simulator.steps += steps
+
+        if not halted:
+            halted = self.simulator.has_halted()
+
+        if halted:
+            reason = HaltReason.ACCEPTED if self.simulator.has_accepted() else HaltReason.REJECTED
+        else:
+            reason = HaltReason.BUDGET
+
+        return RunResult(
+            reason=reason,
+            steps=steps,
+            final_state=state,
+            extents=[tape.extents() for tape in self.simulator.tapes]
+        )
+
+    def _simulate(
+        self,
+        state: str,
+        offsets: Tuple[int, ...],
+        contents: Tuple[Tuple[Any, ...], ...],
+        budget: Optional[int]) -> Optional[MacroStep]:
+        index = self.simulator.definition.transition_index
+        cells = [list(content) for content in contents]
+        heads = list(offsets)
+        steps = 0
+        halted = False
+
+        while not self._has_left_window(heads):
+            transition = index.find(state, [cell[head] for cell, head in zip(cells, heads)])
+
+            if transition is None:
+                halted = True
+                break
+
+            if budget is not None and steps >= budget:
+                break
+
+            for i, (_, write, move) in enumerate(self._transition_effects(transition)):
+                if write is not None:
+                    cells[i][heads[i]] = write
+
+                heads[i] += move
+
+            state = transition.destination_state
+            steps += 1
+
+        if steps == 0 and not halted:
+            return None
+
+        return MacroStep(
+            state=state,
+            offsets=tuple(heads),
+            contents=tuple(tuple(cell) for cell in cells),
+            steps=steps,
+            halted=halted
+        )
+
+    def _has_left_window(self, heads: Tuple[int, ...]) -> bool:
+        return any(head < 0 or head >= self.width for head in heads)
+
+    def _invalidate(self) -> None:
+        index = self.simulator.definition.transition_index
+
+        # Cached windows and effects describe the transitions of one index;
+        # a rebuilt index means the definition changed underneath us.
+        if index is not self._cached_index:
+            self.cache.clear()
+            self._effects = {}
+            self._cached_index = index
+
+    def _remember(self, window: Window, step: MacroStep) -> None:
+        self.cache[window] = step
+
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+            self.statistics.evictions += 1
+
+    def _transition_effects(self, transition: Any) -> Tuple[Tuple[Optional[Any], Optional[Any], int], ...]:
+        effects = self._effects.get(id(transition))
+
+        if effects is None:
+            effects = transition.effects()
+            self._effects[id(transition)] = effects
+
+        return effects
+
+    def _load_blocks(self) -> List[Dict[int, Tuple[Any, ...]]]:
+        blocks = []
+
+        for tape in self.simulator.tapes:
+            tape_blocks = {}
+            extents = tape.extents()
+
+            if extents is not None:
+                for index in range(extents[0] // self.width, extents[1] // self.width + 1):
+                    tape_blocks[index] = tuple(tape.read_slice(index * self.width, (index + 1) * self.width))
+
+            blocks.append(tape_blocks)
+
+        return blocks
+
+    def _store_blocks(self, blocks: List[Dict[int, Tuple[Any, ...]]]) -> None:
+        for tape, tape_blocks in zip(self.simulator.tapes, blocks):
+            for index, content in tape_blocks.items():
+                tape.write_slice(list(content), index * self.width)
@@ -1,10 +1,20 @@
 import sys
+import argparse
 
 from quintuple_turing_machine import QuintupleTuringMachineDefinition
 from quadruple_turing_machine import QuadrupleTuringMachineSimulator
 from benett_reversibility import create_reversible_machine
+from mark import format_mark_for_display
+from tape import Tape
+from symbol_table import BLANK
+from run_result import HaltReason, RunResult
 
-from gui.gui import GUI
+TAPE_LABELS = ['working', 'history', 'output']
+
+# Headless and batch runs are unattended, so a divergent machine must not run
+# forever; the GUI stays unbounded since the user can stop it.
+HEADLESS_MAX_STEPS = 10_000_000
+BUDGET_EXIT_STATUS = 3
 
 def read_quintuple_machine_definition() -> QuintupleTuringMachineDefinition:
     return QuintupleTuringMachineDefinition.parse(sys.stdin)
@@ -12,16 +22,116 @@ def read_quintuple_machine_definition() -> QuintupleTuringMachineDefinition:
 def read_quintuple_machine_initial_state():
     return list(input())
 
+def parse_arguments(args=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Simulates the reversible (Bennett) version of a quintuple Turing machine read from stdin.',
+        epilog=f'exit status: 0 when the run finishes, 1 when --verify finds a mismatch, {BUDGET_EXIT_STATUS} when a --headless run exhausts its step budget'
+    )
+    parser.add_argument('--headless', action='store_true', help='run without the GUI and print the final configuration')
+    parser.add_argument('--max-steps', type=int, default=None, help=f'step budget per input (defaults to {HEADLESS_MAX_STEPS} for --headless and --batch, and to 1000000 for --verify)')
+    parser.add_argument('--batch', metavar='FILE', default=None, help='run every line of FILE as an input, in parallel, instead of reading one input from stdin')
+    parser.add_argument('--processes', type=int, default=None, help='number of worker processes for --batch')
+    parser.add_argument('--lockstep', action='store_true', help='run --batch inputs together on the NumPy lockstep simulator')
+    parser.add_argument('--verify', metavar='LENGTH', type=int, default=None, help='check the reversible machine against the original on every input up to LENGTH marks')
+    parser.add_argument('--alphabet', default=None, help='input marks enumerated by --verify (defaults to every non-blank tape mark)')
+
+    return parser.parse_args(args)
+
+def format_tape(tape: Tape) -> str:
+    extents = tape.extents()
+    start, stop = (tape.head, tape.head) if extents is None else (min(extents[0], tape.head), max(extents[1], tape.head))
+
+    return ' '.join(
+        f'[{format_mark_for_display(mark)}]' if position == tape.head else format_mark_for_display(mark)
+        for position, mark in enumerate(tape.read_slice(start, stop + 1), start)
+    )
+
+def run_headless(simulator: QuadrupleTuringMachineSimulator, max_steps=HEADLESS_MAX_STEPS) -> RunResult:
+    result = simulator.run(max_steps)
+
+    print(f'result: {result}')
+    print(f'state: {simulator.current_state}')
+    print(f'steps: {simulator.steps}')
+
+    for label, tape in zip(TAPE_LABELS, simulator.tapes):
+        print(f'{label} tape: {format_tape(tape)}')
+
+    return result
+
+def run_batch_file(definition, path: str, max_steps=HEADLESS_MAX_STEPS, processes=None, lockstep=False) -> None:
+    with open(path) as file:
+        inputs = [line.rstrip('\n') for line in file]
+
+    if lockstep:
+        from lockstep_simulator import run_lockstep
+
+        batch_results = run_lockstep(definition, inputs, max_steps)
+    else:
+        from batch_runner import run_batch
+
+        batch_results = run_batch(definition, inputs, max_steps, processes)
+
+    for batch_result in batch_results:
+        output = ' '.join(map(format_mark_for_display, batch_result.tapes[-1]))
+        print(f'{batch_result.index}\t{batch_result.input}\t{batch_result.result}\t{output}', flush=True)
+
+def run_verification(definition: QuintupleTuringMachineDefinition, max_length: int, alphabet=None, max_steps=None, processes=None) -> None:
+    from reversibility_verification import DEFAULT_MAX_STEPS, count_inputs, verify_reversible_machine
+
+    if max_steps is None:
+        max_steps = DEFAULT_MAX_STEPS
+
+    if alphabet is None:
+        alphabet = [mark for mark in definition.alphabet if mark != BLANK]
+    else:
+        alphabet = list(alphabet)
+
+    total = count_inputs(alphabet, max_length)
+
+    def progress(report) -> None:
+        print(f'{report.checked + report.skipped}/{total} inputs', end='\r', file=sys.stderr, flush=True)
+
+    report = verify_reversible_machine(definition, alphabet, max_length, max_steps, processes=processes, progress=progress)
+    print(file=sys.stderr)
+    print(report)
+
+    if not report.has_passed():
+        sys.exit(1)
+
+def run_gui(simulator: QuadrupleTuringMachineSimulator) -> None:
+    from gui.gui import GUI
+
+    gui = GUI(simulator, simulator.definition.transitions)
+
+    gui.run()
+
 if __name__ == '__main__':
+    arguments = parse_arguments()
+
     quintuple_machine_definition = read_quintuple_machine_definition()
-    quintuple_machine_initial_state = read_quintuple_machine_initial_state()
+
+    if arguments.verify is not None:
+        run_verification(quintuple_machine_definition, arguments.verify, arguments.alphabet, arguments.max_steps, arguments.processes)
+        sys.exit()
 
     quadruple_machine_definition = create_reversible_machine(quintuple_machine_definition)
+
+    if arguments.batch is not None:
+        max_steps = HEADLESS_MAX_STEPS if arguments.max_steps is None else arguments.max_steps
+
+        run_batch_file(quadruple_machine_definition, arguments.batch, max_steps, arguments.processes, arguments.lockstep)
+        sys.exit()
+
+    quintuple_machine_initial_state = read_quintuple_machine_initial_state()
+
     quadruple_machine_simulator = QuadrupleTuringMachineSimulator(quadruple_machine_definition)
 
     quadruple_machine_simulator.tapes[0].overwrite(quintuple_machine_initial_state, 1)
 
-    gui = GUI(quadruple_machine_simulator, quadruple_machine_definition.transitions)
+    if arguments.headless:
+        max_steps = HEADLESS_MAX_STEPS if arguments.max_steps is None else arguments.max_steps
 
-    gui.run()
- 
\ No newline at end of file
+        if run_headless(quadruple_machine_simulator, max_steps).reason == HaltReason.BUDGET:
+            sys.exit(BUDGET_EXIT_STATUS)
+    else:
+        run_gui(quadruple_machine_simulator)
@@ -1,12 +1,15 @@
-from typing import Any, Optional, List
-from dataclasses import dataclass
-from collections import Counter
+from typing import Any, Callable, Iterator, Optional, List, Set, TextIO, Tuple
+from dataclasses import dataclass, field
 from enum import Enum, auto
 
 from direction import Direction
 from tape import Tape
 from state import format_state_for_code
 from mark import format_mark_for_display, format_mark_for_code
+from transition_index import TransitionIndex
+from fingerprint import FingerprintedDefinition
+from run_result import HaltReason, RunResult
+from cycle_detection import run_with_cycle_detection
 
 class QuadrupleActType(Enum):
     SHIFT = auto()
@@ -24,7 +27,7 @@ class QuadrupleActType(Enum):
 
         return self.value > other.value
 
-@dataclass(order=True)
+@dataclass(order=True, frozen=True, slots=True)
 class QuadrupleAct:
     kind: QuadrupleActType
     direction: Optional[Direction] = None
@@ -54,11 +57,15 @@ class QuadrupleAct:
             write=write
         )
 
-@dataclass(order=True)
+@dataclass(order=True, frozen=True, slots=True)
 class QuadrupleTransition:
     source_state: str
     destination_state: str
-    acts: List[QuadrupleAct]
+    acts: Tuple[QuadrupleAct, ...]
+
+    def __post_init__(self):
+        if type(self.acts) is not tuple:
+            object.__setattr__(self, 'acts', tuple(self.acts))
 
     def matches(self, state: str, data: List[Any]) -> bool:
         if self.source_state != state:
@@ -69,20 +76,45 @@ class QuadrupleTransition:
                 return False
 
         return True
+
+    def read_positions(self) -> Tuple[int, ...]:
+        return tuple(i for i, act in enumerate(self.acts) if act.kind == QuadrupleActType.READ_WRITE)
+
+    def read_marks(self) -> Tuple[Any, ...]:
+        return tuple(act.read for act in self.acts if act.kind == QuadrupleActType.READ_WRITE)
+
+    def write_marks(self) -> Tuple[Any, ...]:
+        return tuple(act.write for act in self.acts if act.kind == QuadrupleActType.READ_WRITE)
+
+    def effects(self) -> Tuple[Tuple[Optional[Any], Optional[Any], int], ...]:
+        return tuple(
+            (act.read, act.write, 0) if act.kind == QuadrupleActType.READ_WRITE else (None, None, act.direction.value)
+            for act in self.acts
+        )
+
+    def is_sweep(self) -> bool:
+        if self.source_state != self.destination_state:
+            return False
+
+        return all(act.read == act.write for act in self.acts if act.kind == QuadrupleActType.READ_WRITE)
     
-    def to_code(self):
-        result = f'QuadrupleTransition(\n'
-        result += f"    source_state={format_state_for_code(self.source_state)},\n"
-        result += f"    destination_state={format_state_for_code(self.destination_state)},\n"
-        result += f'    acts=[\n'
-        
-        for act in self.acts:
-            result += f'        {act.to_code()},\n'
+    def to_code(self) -> str:
+        return ''.join(self.iter_code())
 
-        result += f'    ]\n'
-        result += f')'
+    def write_code(self, stream: TextIO, indent: str = '') -> None:
+        stream.writelines(self.iter_code(indent))
 
-        return result
+    def iter_code(self, indent: str = '') -> Iterator[str]:
+        yield f'{indent}QuadrupleTransition(\n'
+        yield f"{indent}    source_state={format_state_for_code(self.source_state)},\n"
+        yield f"{indent}    destination_state={format_state_for_code(self.destination_state)},\n"
+        yield f'{indent}    acts=[\n'
+
+        for act in self.acts:
+            yield f'{indent}        {act.to_code()},\n'
+
+        yield f'{indent}    ]\n'
+        yield f'{indent})'
     
     def __str__(self):
         inputs = []
@@ -104,84 +136,202 @@ class QuadrupleTransition:
 
         return result
 
-@dataclass
-class QuadrupleTuringMachineDefinition:
+@dataclass(eq=False)
+class QuadrupleTuringMachineDefinition(FingerprintedDefinition):
     tapes: int
     alphabet: List[Any]
+    # Transitions and acts are frozen and FingerprintedDefinition wraps the lists in a
+    # VersionedList, so reassigning or editing them in place is enough for the caches to follow.
     transitions: List[QuadrupleTransition]
     initial_state: str
     final_states: List[str]
 
+    _transition_index: Optional[TransitionIndex[QuadrupleTransition]] = field(default=None, init=False, repr=False, compare=False)
+    _indexed_version: int = field(default=0, init=False, repr=False, compare=False)
+    _reverse_transition_index: Optional[TransitionIndex[QuadrupleTransition]] = field(default=None, init=False, repr=False, compare=False)
+    _reverse_indexed_version: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == 'transitions':
+            super().__setattr__('_transition_index', None)
+            super().__setattr__('_reverse_transition_index', None)
+
+        super().__setattr__(name, value)
+
     def find_matching_transition(self, state: str, data: List[Any]) -> Optional[QuadrupleTransition]:
-        for transition in self.transitions:
-            if transition.matches(state, data):
-                return transition
+        return self.transition_index.find(state, data)
+
+    @property
+    def transition_index(self) -> TransitionIndex[QuadrupleTransition]:
+        if self._transition_index is None or self._indexed_version != self.transitions.version:
+            self._transition_index = TransitionIndex(
+                (t.source_state, t.read_positions(), t.read_marks(), t) for t in self.transitions
+            )
+            self._indexed_version = self.transitions.version
+
+        return self._transition_index
+
+    @property
+    def reverse_transition_index(self) -> TransitionIndex[QuadrupleTransition]:
+        if self._reverse_transition_index is None or self._reverse_indexed_version != self.transitions.version:
+            self._reverse_transition_index = TransitionIndex(
+                (t.destination_state, t.read_positions(), t.write_marks(), t) for t in self.transitions
+            )
+            self._reverse_indexed_version = self.transitions.version
+
+        return self._reverse_transition_index
 
-        return None
-    
     def to_code(self) -> str:
-        result = f'QuadrupleTuringMachineDefinition(\n'
-        result += f"    tapes={self.tapes},\n"
-        result += f"    alphabet=[{', '.join(map(format_mark_for_code, self.alphabet))}],\n"
-        result += f"    transitions=[\n"
+        return ''.join(self.iter_code())
 
-        for transition in self.transitions:
-            lines = transition.to_code().splitlines()
-            
-            for line in lines[:-1]:
-                result += f"        {line}\n"
-            
-            result += f"        {lines[-1]},\n"
-        
-        result += f"    ],\n"
-        result += f"    initial_state={format_state_for_code(self.initial_state)},\n"
-        result += f"    final_states=[{', '.join(map(format_state_for_code, self.final_states))}]\n"
-        result += f")"
+    def write_code(self, stream: TextIO) -> None:
+        stream.writelines(self.iter_code())
 
-        return result
-    
-    def __eq__(self, value) -> bool:
-        if not isinstance(value, QuadrupleTuringMachineDefinition):
-            return False
+    def iter_code(self) -> Iterator[str]:
+        yield f'QuadrupleTuringMachineDefinition(\n'
+        yield f"    tapes={self.tapes},\n"
+        yield f"    alphabet=[{', '.join(map(format_mark_for_code, self.alphabet))}],\n"
+        yield f"    transitions=[\n"
 
-        return (
-            self.tapes == value.tapes and
-            Counter(self.alphabet) == Counter(value.alphabet) and
-            sorted(self.transitions) == sorted(value.transitions) and
-            self.initial_state == value.initial_state and
-            Counter(self.final_states) == Counter(value.final_states)
-        )
+        for transition in self.transitions:
+            yield from transition.iter_code('        ')
+            yield ',\n'
+
+        yield f"    ],\n"
+        yield f"    initial_state={format_state_for_code(self.initial_state)},\n"
+        yield f"    final_states=[{', '.join(map(format_state_for_code, self.final_states))}]\n"
+        yield f")"
 
 class QuadrupleTuringMachineSimulator:
     definition: QuadrupleTuringMachineDefinition
 
     tapes: List[Tape]
     current_state: str
+    final_states: Set[str]
+    steps: int
+    accelerate: bool
 
-    def __init__(self, definition: QuadrupleTuringMachineDefinition):
-        self.tapes = [Tape() for _ in range(definition.tapes)]
+    def __init__(
+        self,
+        definition: QuadrupleTuringMachineDefinition,
+        tape_factory: Callable[[], Tape] = Tape,
+        accelerate: bool = False):
+        self.tapes = [tape_factory() for _ in range(definition.tapes)]
 
         self.definition = definition
         self.current_state = definition.initial_state
+        self.final_states = set(definition.final_states)
+        self.steps = 0
+        self.accelerate = accelerate
+        self._sweeps = {}
+        self._sweep_index = None
+
+        if accelerate and not all(hasattr(tape, 'run_length') for tape in self.tapes):
+            raise ValueError('Acceleration requires run-length encoded tapes')
     
     def step(self):
         transition = self._find_next_transition()
 
+        if transition is None:
+            return None
+
+        self._apply(transition)
+
+        return transition
+
+    def run(
+        self,
+        max_steps: Optional[int] = None,
+        until: Optional[Callable[['QuadrupleTuringMachineSimulator'], bool]] = None,
+        detect_cycles: bool = False) -> RunResult:
+        # Cycle detection hashes every configuration one step at a time, so it
+        # never takes sweep jumps: accelerate has no effect on these runs.
+        if detect_cycles:
+            return run_with_cycle_detection(self, max_steps, until)
+
+        steps = 0
+
+        while True:
+            if until is not None and until(self):
+                reason = HaltReason.INTERRUPTED
+                break
+
+            transition = self._find_next_transition()
+
+            if transition is None:
+                reason = HaltReason.ACCEPTED if self.has_accepted() else HaltReason.REJECTED
+                break
+
+            if max_steps is not None and steps >= max_steps:
+                reason = HaltReason.BUDGET
+                break
+
+            if self.accelerate and until is None and self._is_sweep(transition):
+                if max_steps is None:
+                    reason = HaltReason.DIVERGED
+                    break
+
+                self._sweep(transition, max_steps - steps)
+                steps = max_steps
+                continue
+
+            self._apply(transition)
+            steps += 1
+
+        return RunResult(
+            reason=reason,
+            steps=steps,
+            final_state=self.current_state,
+            extents=[tape.extents() for tape in self.tapes]
+        )
+    
+    def step_backward(self) -> Optional[QuadrupleTransition]:
+        transition = self._find_previous_transition()
+
         if transition is None:
             return None
 
         for i, act in enumerate(transition.acts):
             if act.kind == QuadrupleActType.READ_WRITE:
-                self.tapes[i].write(act.write)
+                self.tapes[i].write(act.read)
             elif act.kind == QuadrupleActType.SHIFT:
-                self.tapes[i].shift(act.direction)
-        
-        self.current_state = transition.destination_state
+                self.tapes[i].head -= act.direction.value
+
+        self.current_state = transition.source_state
+        self.steps -= 1
 
         return transition
-    
+
+    def run_backward(
+        self,
+        max_steps: Optional[int] = None,
+        until: Optional[Callable[['QuadrupleTuringMachineSimulator'], bool]] = None) -> RunResult:
+        steps = 0
+
+        while True:
+            if until is not None and until(self):
+                reason = HaltReason.INTERRUPTED
+                break
+
+            if max_steps is not None and steps >= max_steps:
+                reason = HaltReason.BUDGET if self._find_previous_transition() is not None else HaltReason.NO_PREDECESSOR
+                break
+
+            if self.step_backward() is None:
+                reason = HaltReason.NO_PREDECESSOR
+                break
+
+            steps += 1
+
+        return RunResult(
+            reason=reason,
+            steps=steps,
+            final_state=self.current_state,
+            extents=[tape.extents() for tape in self.tapes]
+        )
+
     def has_accepted(self) -> bool:
-        return self.current_state in self.definition.final_states
+        return self.current_state in self.final_states
     
     def has_rejected(self) -> bool:
         if self.has_accepted():
@@ -193,6 +343,47 @@ class QuadrupleTuringMachineSimulator:
         return self._find_next_transition() is None
     
     def _find_next_transition(self) -> Optional[QuadrupleTransition]:
-        data = [tape.read() for tape in self.tapes]
-        return self.definition.find_matching_transition(self.current_state, data)
-        
\ No newline at end of file
+        return self.definition.transition_index.find_on_tapes(self.current_state, self.tapes)
+
+    def _find_previous_transition(self) -> Optional[QuadrupleTransition]:
+        transitions = self.definition.reverse_transition_index.find_all_on_tapes(self.current_state, self.tapes)
+
+        if len(transitions) > 1:
+            raise ValueError(
+                f'The machine is not backward deterministic: {len(transitions)} transitions lead to state {self.current_state}'
+            )
+
+        return transitions[0] if len(transitions) == 1 else None
+
+    def _apply(self, transition: QuadrupleTransition) -> None:
+        for i, act in enumerate(transition.acts):
+            if act.kind == QuadrupleActType.READ_WRITE:
+                self.tapes[i].write(act.write)
+            elif act.kind == QuadrupleActType.SHIFT:
+                self.tapes[i].shift(act.direction)
+        
+        self.current_state = transition.destination_state
+        self.steps += 1
+
+    def _is_sweep(self, transition: QuadrupleTransition) -> bool:
+        index = self.definition.transition_index
+
+        if index is not self._sweep_index:
+            self._sweeps = {}
+            self._sweep_index = index
+
+        sweep = self._sweeps.get(id(transition))
+
+        if sweep is None:
+            groups = index.groups[transition.source_state]
+            sweep = transition.is_sweep() and len(groups) == 1
+            self._sweeps[id(transition)] = sweep
+
+        return sweep
+
+    def _sweep(self, transition: QuadrupleTransition, steps: int) -> None:
+        for tape, act in zip(self.tapes, transition.acts):
+            if act.kind == QuadrupleActType.SHIFT:
+                tape.head += act.direction.value * steps
+
+        self.steps += steps
@@ -1,13 +1,38 @@
-from typing import Any, Self, List, TextIO
-from dataclasses import dataclass
-from collections import Counter
+from typing import Any, Callable, Dict, Iterator, Optional, Self, Set, List, TextIO, Tuple
+from dataclasses import dataclass, field
+from itertools import islice
 import re
 
 from direction import Direction
+from tape import Tape
 from state import format_state_for_code
 from mark import format_mark_for_code
+from transition_index import TransitionIndex
+from fingerprint import FingerprintedDefinition
+from run_result import HaltReason, RunResult
+from cycle_detection import run_with_cycle_detection
 
-@dataclass(order=True)
+QUINTUPLE_PATTERN = re.compile(r'\((?P<source>\d+),(?P<read>.+)\)=\((?P<destination>\d+),(?P<write>.+),(?P<shift>[RLS])\)')
+
+DIRECTION_LOOKUP = {
+    'L': Direction.LEFT,
+    'R': Direction.RIGHT,
+    'S': Direction.STAY
+}
+
+def read_header_line(stream: TextIO, line_number: int, description: str) -> List[str]:
+    line = stream.readline()
+
+    if not line:
+        raise ValueError(f'Line {line_number}: Missing {description}')
+
+    return line.split()
+
+def check_count(line_number: int, description: str, expected: int, actual: int) -> None:
+    if expected != actual:
+        raise ValueError(f'Line {line_number}: Expected {expected} {description}, found {actual}')
+
+@dataclass(order=True, frozen=True, slots=True)
 class QuintupleAct:
     read: Any
     write: Any
@@ -22,125 +47,303 @@ class QuintupleAct:
             ')'
         )
 
-@dataclass(order=True)
+@dataclass(order=True, frozen=True, slots=True)
 class QuintupleTransition:
     source_state: int
     destination_state: int
-    acts: List[QuintupleAct]
+    acts: Tuple[QuintupleAct, ...]
+
+    def __post_init__(self):
+        if type(self.acts) is not tuple:
+            object.__setattr__(self, 'acts', tuple(self.acts))
+
+    def read_positions(self) -> Tuple[int, ...]:
+        return tuple(range(len(self.acts)))
+
+    def read_marks(self) -> Tuple[Any, ...]:
+        return tuple(act.read for act in self.acts)
+
+    def effects(self) -> Tuple[Tuple[Optional[Any], Optional[Any], int], ...]:
+        return tuple((act.read, act.write, act.direction.value) for act in self.acts)
+
+    def is_sweep(self) -> bool:
+        if self.source_state != self.destination_state:
+            return False
+
+        if any(act.read != act.write for act in self.acts):
+            return False
+
+        return len([act for act in self.acts if act.direction != Direction.STAY]) == 1
 
     def to_code(self) -> str:
-        result = f'QuintupleTransition(\n'
-        result += f"    source_state={format_state_for_code(self.source_state)},\n"
-        result += f"    destination_state={format_state_for_code(self.destination_state)},\n"
-        result += f"    acts=[\n"
+        return ''.join(self.iter_code())
+
+    def write_code(self, stream: TextIO, indent: str = '') -> None:
+        stream.writelines(self.iter_code(indent))
+
+    def iter_code(self, indent: str = '') -> Iterator[str]:
+        yield f'{indent}QuintupleTransition(\n'
+        yield f"{indent}    source_state={format_state_for_code(self.source_state)},\n"
+        yield f"{indent}    destination_state={format_state_for_code(self.destination_state)},\n"
+        yield f'{indent}    acts=[\n'
 
         for act in self.acts:
-            result += f"        {act.to_code()},\n"
-        
-        result += f"    ]\n"
-        result += f")"
+            yield f'{indent}        {act.to_code()},\n'
 
-        return result
+        yield f'{indent}    ]\n'
+        yield f'{indent})'
 
-    def parse(line: str) -> Self:
-        p = re.compile(r'\((?P<source>\d+),(?P<read>.+)\)=\((?P<destination>\d+),(?P<write>.+),(?P<shift>[RLS])\)')
-        match = p.match(line)
+    # Acts are frozen, so a caller parsing many lines can pass one dict to share
+    # equal act tuples instead of building a new act for every line.
+    def parse(line: str, acts: Optional[Dict[Tuple[str, str, str], Tuple[QuintupleAct, ...]]] = None) -> Self:
+        match = QUINTUPLE_PATTERN.match(line)
 
         if not match:
-            raise ValueError(f'Invalid quintuple format: {line}')
-        
-        source_state = match.group('source')
-        read_symbol = match.group('read')
-        destination_state = match.group('destination')
-        write_symbol = match.group('write')
-        shift = match.group('shift')
-
-        direction_lookup = {
-            'L': Direction.LEFT,
-            'R': Direction.RIGHT,
-            'S': Direction.STAY
-        }
-
-        return QuintupleTransition(
-            source_state=source_state,
-            destination_state=destination_state,
-            acts=[
-                QuintupleAct(
-                    read=read_symbol,
-                    write=write_symbol,
-                    direction=direction_lookup[shift]
-                )
-            ]
-        )
+            raise ValueError(f'Invalid quintuple format: {line.rstrip()}')
+
+        source_state, read_symbol, destination_state, write_symbol, shift = match.groups()
+        key = (read_symbol, write_symbol, shift)
+        transition_acts = acts.get(key) if acts is not None else None
+
+        if transition_acts is None:
+            transition_acts = (QuintupleAct(read_symbol, write_symbol, DIRECTION_LOOKUP[shift]),)
+
+            if acts is not None:
+                acts[key] = transition_acts
+
+        return QuintupleTransition(source_state, destination_state, transition_acts)
     
-@dataclass
-class QuintupleTuringMachineDefinition:
+@dataclass(eq=False)
+class QuintupleTuringMachineDefinition(FingerprintedDefinition):
     tapes: int
     alphabet: List[Any]
+    # Transitions and acts are frozen and FingerprintedDefinition wraps the lists in a
+    # VersionedList, so reassigning or editing them in place is enough for the caches to follow.
     transitions: List[QuintupleTransition]
     initial_state: str
     final_states: List[str]
 
+    _transition_index: Optional[TransitionIndex[QuintupleTransition]] = field(default=None, init=False, repr=False, compare=False)
+    _indexed_version: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == 'transitions':
+            super().__setattr__('_transition_index', None)
+
+        super().__setattr__(name, value)
+
+    def find_matching_transition(self, state: str, data: List[Any]) -> Optional[QuintupleTransition]:
+        return self.transition_index.find(state, data)
+
+    @property
+    def transition_index(self) -> TransitionIndex[QuintupleTransition]:
+        if self._transition_index is None or self._indexed_version != self.transitions.version:
+            self._transition_index = TransitionIndex(
+                (t.source_state, t.read_positions(), t.read_marks(), t) for t in self.transitions
+            )
+            self._indexed_version = self.transitions.version
+
+        return self._transition_index
+
     def to_code(self) -> str:
-        result = f'QuintupleTuringMachineDefinition(\n'
-        result += f"    tapes={self.tapes},\n"
-        result += f"    alphabet=[{', '.join(map(format_mark_for_code, self.alphabet))}],\n"
-        result += f"    transitions=[\n"
+        return ''.join(self.iter_code())
+
+    def write_code(self, stream: TextIO) -> None:
+        stream.writelines(self.iter_code())
+
+    def iter_code(self) -> Iterator[str]:
+        yield f'QuintupleTuringMachineDefinition(\n'
+        yield f"    tapes={self.tapes},\n"
+        yield f"    alphabet=[{', '.join(map(format_mark_for_code, self.alphabet))}],\n"
+        yield f"    transitions=[\n"
 
         for transition in self.transitions:
-            lines = transition.to_code().splitlines()
-            
-            for line in lines[:-1]:
-                result += f"        {line}\n"
-            
-            result += f"        {lines[-1]},\n"
-        
-        result += f"    ],\n"
-        result += f"    initial_state={format_state_for_code(self.initial_state)},\n"
-        result += f"    final_states=[{', '.join(map(format_state_for_code, self.final_states))}]\n"
-        result += f")"
-
-        return result
-    
-    def __eq__(self, value) -> bool:
-        if not isinstance(value, QuintupleTuringMachineDefinition):
-            return False
+            yield from transition.iter_code('        ')
+            yield ',\n'
 
-        return (
-            self.tapes == value.tapes and
-            Counter(self.alphabet) == Counter(value.alphabet) and
-            sorted(self.transitions) == sorted(value.transitions) and
-            self.initial_state == value.initial_state and
-            Counter(self.final_states) == Counter(value.final_states)
-        )
+        yield f"    ],\n"
+        yield f"    initial_state={format_state_for_code(self.initial_state)},\n"
+        yield f"    final_states=[{', '.join(map(format_state_for_code, self.final_states))}]\n"
+        yield f")"
 
     def parse(stream: TextIO) -> Self:
-        quintuple_machine_definition = QuintupleTuringMachineDefinition(
+        size_parameters = read_header_line(stream, 1, 'size parameters')
+
+        if len(size_parameters) != 4 or not all(parameter.isdigit() for parameter in size_parameters):
+            raise ValueError(f'Line 1: Invalid size parameters: {' '.join(size_parameters)}')
+
+        number_of_states, number_of_input_symbols, number_of_tape_symbols, number_of_transitions = map(int, size_parameters)
+
+        states = read_header_line(stream, 2, 'states')
+        check_count(2, 'states', number_of_states, len(states))
+
+        if len(states) == 0:
+            raise ValueError('Line 2: Expected at least one state')
+
+        input_symbols = read_header_line(stream, 3, 'input symbols')
+        check_count(3, 'input symbols', number_of_input_symbols, len(input_symbols))
+
+        tape_symbols = read_header_line(stream, 4, 'tape symbols')
+        check_count(4, 'tape symbols', number_of_tape_symbols, len(tape_symbols))
+
+        transitions = []
+        acts = {}
+
+        for line_number, line in enumerate(islice(stream, number_of_transitions), 5):
+            try:
+                transitions.append(QuintupleTransition.parse(line, acts))
+            except ValueError as error:
+                raise ValueError(f'Line {line_number}: {error}') from None
+
+        check_count(5 + len(transitions), 'transitions', number_of_transitions, len(transitions))
+
+        return QuintupleTuringMachineDefinition(
             tapes=1,
-            alphabet=[],
-            transitions=[],
-            initial_state='',
-            final_states=[]
+            alphabet=tape_symbols,
+            transitions=transitions,
+            initial_state=states[0],
+            final_states=[states[-1]]
         )
 
-        size_parameters = map(int, stream.readline().split())
 
-        number_of_states = next(size_parameters)
-        number_of_input_symbols = next(size_parameters)
-        number_of_tape_symbols = next(size_parameters)
-        number_of_transitions = next(size_parameters)
+class QuintupleTuringMachineSimulator:
+    definition: QuintupleTuringMachineDefinition
+
+    tapes: List[Tape]
+    current_state: str
+    final_states: Set[str]
+    steps: int
+    accelerate: bool
+
+    def __init__(
+        self,
+        definition: QuintupleTuringMachineDefinition,
+        tape_factory: Callable[[], Tape] = Tape,
+        accelerate: bool = False):
+        self.tapes = [tape_factory() for _ in range(definition.tapes)]
+
+        self.definition = definition
+        self.current_state = definition.initial_state
+        self.final_states = set(definition.final_states)
+        self.steps = 0
+        self.accelerate = accelerate
+        self._sweeps = {}
+        self._sweep_index = None
+
+        if accelerate and not all(hasattr(tape, 'run_length') for tape in self.tapes):
+            raise ValueError('Acceleration requires run-length encoded tapes')
+
+    def step(self) -> Optional[QuintupleTransition]:
+        transition = self._find_next_transition()
+
+        if transition is None:
+            return None
+
+        self._apply(transition)
+
+        return transition
+
+    def run(
+        self,
+        max_steps: Optional[int] = None,
+        until: Optional[Callable[['QuintupleTuringMachineSimulator'], bool]] = None,
+        detect_cycles: bool = False) -> RunResult:
+        # Cycle detection hashes every configuration one step at a time, so it
+        # never takes sweep jumps: accelerate has no effect on these runs.
+        if detect_cycles:
+            return run_with_cycle_detection(self, max_steps, until)
+
+        steps = 0
+
+        while True:
+            if until is not None and until(self):
+                reason = HaltReason.INTERRUPTED
+                break
+
+            transition = self._find_next_transition()
+
+            if transition is None:
+                reason = HaltReason.ACCEPTED if self.has_accepted() else HaltReason.REJECTED
+                break
+
+            if max_steps is not None and steps >= max_steps:
+                reason = HaltReason.BUDGET
+                break
+
+            if self.accelerate and until is None and self._is_sweep(transition):
+                sweep = self._sweep(transition, None if max_steps is None else max_steps - steps)
+
+                if sweep is None:
+                    reason = HaltReason.DIVERGED
+                    break
+
+                steps += sweep
+                continue
+
+            self._apply(transition)
+            steps += 1
+
+        return RunResult(
+            reason=reason,
+            steps=steps,
+            final_state=self.current_state,
+            extents=[tape.extents() for tape in self.tapes]
+        )
+
+    def has_accepted(self) -> bool:
+        return self.current_state in self.final_states
+
+    def has_rejected(self) -> bool:
+        if self.has_accepted():
+            return False
+
+        return self.has_halted()
+
+    def has_halted(self) -> bool:
+        return self._find_next_transition() is None
+
+    def _find_next_transition(self) -> Optional[QuintupleTransition]:
+        return self.definition.transition_index.find_on_tapes(self.current_state, self.tapes)
+
+    def _apply(self, transition: QuintupleTransition) -> None:
+        for tape, act in zip(self.tapes, transition.acts):
+            tape.write(act.write)
+            tape.shift(act.direction)
+
+        self.current_state = transition.destination_state
+        self.steps += 1
+
+    def _is_sweep(self, transition: QuintupleTransition) -> bool:
+        index = self.definition.transition_index
+
+        if index is not self._sweep_index:
+            self._sweeps = {}
+            self._sweep_index = index
+
+        sweep = self._sweeps.get(id(transition))
+
+        if sweep is None:
+            groups = index.groups[transition.source_state]
+            sweep = transition.is_sweep() and len(groups) == 1
+            self._sweeps[id(transition)] = sweep
+
+        return sweep
+
+    def _sweep(self, transition: QuintupleTransition, budget: Optional[int]) -> Optional[int]:
+        i, act = next((i, act) for i, act in enumerate(transition.acts) if act.direction != Direction.STAY)
+        length = self.tapes[i].run_length(act.direction)
 
-        states = list(stream.readline().split())
+        if length is None and budget is None:
+            return None
 
-        quintuple_machine_definition.initial_state = states[0]
-        quintuple_machine_definition.final_states = list(states[-1])
-        
-        input_symbols = list(stream.readline().split())
-        tape_symbols = list(stream.readline().split())
+        if length is None:
+            steps = budget
+        elif budget is None:
+            steps = length
+        else:
+            steps = min(length, budget)
 
-        quintuple_machine_definition.alphabet = tape_symbols
+        self.tapes[i].head += act.direction.value * steps
+        self.steps += steps
 
-        for _ in range(number_of_transitions):
-            quintuple_machine_definition.transitions.append(QuintupleTransition.parse(stream.readline()))
-        
-        return quintuple_machine_definition
+        return steps
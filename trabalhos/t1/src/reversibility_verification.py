@@ -0,0 +1,211 @@
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+from multiprocessing import Pool
+
+from symbol_table import BLANK
+from tape import Tape
+from run_result import RunResult
+from quintuple_turing_machine import QuintupleTuringMachineDefinition, QuintupleTuringMachineSimulator
+from quadruple_turing_machine import QuadrupleTuringMachineDefinition
+from compiled_turing_machine import CompiledQuadrupleTuringMachine, CompiledQuadrupleTuringMachineSimulator
+from benett_reversibility import create_reversible_machine
+from batch_runner import run_input
+
+REVERSIBLE_STEP_FACTOR = 4
+REVERSIBLE_STEP_MARGIN = 64
+
+# Inputs on which the original machine runs past this many steps are counted
+# as skipped, so a non-halting input can never stall a worker.
+DEFAULT_MAX_STEPS = 1_000_000
+
+Block = Tuple[int, int, int]
+
+@dataclass
+class Mismatch:
+    input: str
+    reason: str
+    original: RunResult
+    reversible: RunResult
+
+@dataclass
+class BlockReport:
+    checked: int
+    skipped: int
+    mismatch: Optional[Mismatch]
+
+@dataclass
+class VerificationReport:
+    checked: int
+    skipped: int
+    counterexample: Optional[Mismatch]
+
+    def has_passed(self) -> bool:
+        return self.counterexample is None
+
+    def __str__(self):
+        if self.counterexample is None:
+            return f'passed: {self.checked} inputs checked, {self.skipped} skipped'
+
+        return (
+            f'failed on input {self.counterexample.input!r}: {self.counterexample.reason} '
+            f'({self.checked} inputs checked, {self.skipped} skipped)'
+        )
+
+class InputChecker:
+    definition: QuintupleTuringMachineDefinition
+    simulator: CompiledQuadrupleTuringMachineSimulator
+    max_steps: int
+
+    def __init__(
+        self,
+        definition: QuintupleTuringMachineDefinition,
+        reversible_definition: QuadrupleTuringMachineDefinition,
+        max_steps: int = DEFAULT_MAX_STEPS):
+        self.definition = definition
+        self.simulator = CompiledQuadrupleTuringMachineSimulator(CompiledQuadrupleTuringMachine.compile(reversible_definition))
+        self.max_steps = max_steps
+
+    def check(self, input: str) -> Tuple[bool, Optional[Mismatch]]:
+        original = QuintupleTuringMachineSimulator(self.definition)
+        original.tapes[0].overwrite(list(input), 1)
+        original_result = original.run(self.max_steps)
+
+        if not original_result.has_halted():
+            return False, None
+
+        extents = original_result.extents[0]
+        span = 0 if extents is None else extents[1] - extents[0] + 1
+        budget = REVERSIBLE_STEP_FACTOR * (original_result.steps + span + len(input)) + REVERSIBLE_STEP_MARGIN
+
+        reversible = run_input(self.simulator, 0, input, budget)
+        reversible_result = reversible.result
+
+        def mismatch(reason: str) -> Tuple[bool, Mismatch]:
+            return True, Mismatch(input, reason, original_result, reversible_result)
+
+        if not reversible_result.has_halted():
+            return mismatch(f'reversible machine did not halt within {budget} steps')
+
+        if reversible_result.reason != original_result.reason:
+            return mismatch(f'original machine was {original_result.reason.name.lower()}, reversible machine was {reversible_result.reason.name.lower()}')
+
+        if not original.has_accepted():
+            return True, None
+
+        working = Tape()
+        working.overwrite(list(input), 1)
+
+        if (reversible_result.extents[0], reversible.tapes[0]) != tape_contents(working):
+            return mismatch(f'working tape was not restored: {reversible.tapes[0]}')
+
+        if reversible_result.extents[1] is not None:
+            return mismatch(f'history tape was not cleared: {reversible.tapes[1]}')
+
+        if (reversible_result.extents[2], reversible.tapes[2]) != tape_contents(original.tapes[0]):
+            return mismatch(f'output tape {reversible.tapes[2]} does not match original tape {tape_contents(original.tapes[0])[1]}')
+
+        return True, None
+
+    def check_block(self, alphabet: Sequence[str], block: Block) -> BlockReport:
+        length, start, count = block
+        checked = 0
+        skipped = 0
+
+        for index in range(start, start + count):
+            input = decode_input(alphabet, length, index)
+            conclusive, mismatch = self.check(input)
+
+            if not conclusive:
+                skipped += 1
+                continue
+
+            checked += 1
+
+            if mismatch is not None:
+                return BlockReport(checked, skipped, mismatch)
+
+        return BlockReport(checked, skipped, None)
+
+def tape_contents(tape: Tape) -> Tuple[Optional[Tuple[int, int]], List[Any]]:
+    extents = tape.extents()
+
+    if extents is None:
+        return None, []
+
+    return extents, tape.read_slice(extents[0], extents[1] + 1)
+
+def decode_input(alphabet: Sequence[str], length: int, index: int) -> str:
+    marks = []
+
+    for _ in range(length):
+        index, digit = divmod(index, len(alphabet))
+        marks.append(alphabet[digit])
+
+    return ''.join(reversed(marks))
+
+def iter_blocks(alphabet: Sequence[str], max_length: int, block_size: int) -> Iterator[Block]:
+    for length in range(max_length + 1):
+        total = len(alphabet) ** length
+
+        for start in range(0, total, block_size):
+            yield length, start, min(block_size, total - start)
+
+def count_inputs(alphabet: Sequence[str], max_length: int) -> int:
+    return sum(len(alphabet) ** length for length in range(max_length + 1))
+
+def verify_reversible_machine(
+    definition: QuintupleTuringMachineDefinition,
+    alphabet: Sequence[str],
+    max_length: int,
+    max_steps: int = DEFAULT_MAX_STEPS,
+    reversible_definition: Optional[QuadrupleTuringMachineDefinition] = None,
+    processes: Optional[int] = None,
+    block_size: int = 1024,
+    progress: Optional[Callable[[VerificationReport], None]] = None) -> VerificationReport:
+    if len(alphabet) == 0:
+        raise ValueError('Input alphabet must not be empty')
+
+    if BLANK in alphabet:
+        raise ValueError(f'Input alphabet must not contain the blank symbol {BLANK}')
+
+    if max_steps is None or max_steps < 0:
+        raise ValueError('Verification needs a finite, non-negative step budget')
+
+    if reversible_definition is None:
+        reversible_definition = create_reversible_machine(definition)
+
+    report = VerificationReport(0, 0, None)
+
+    pool = Pool(processes, initializer=_attach, initargs=(definition, reversible_definition, max_steps))
+
+    try:
+        blocks = ((alphabet, block) for block in iter_blocks(alphabet, max_length, block_size))
+
+        for block_report in pool.imap(_check_block, blocks):
+            report.checked += block_report.checked
+            report.skipped += block_report.skipped
+
+            if block_report.mismatch is not None:
+                report.counterexample = block_report.mismatch
+                break
+
+            if progress is not None:
+                progress(report)
+    finally:
+        pool.terminate()
+        pool.join()
+
+    return report
+
+_checker: Optional[InputChecker] = None
+
+def _attach(
+    definition: QuintupleTuringMachineDefinition,
+    reversible_definition: QuadrupleTuringMachineDefinition,
+    max_steps: int) -> None:
+    global _checker
+
+    _checker = InputChecker(definition, reversible_definition, max_steps)
+
+def _check_block(task: Tuple[Sequence[str], Block]) -> BlockReport:
+    return _checker.check_block(*task)
@@ -0,0 +1,132 @@
+from typing import Any, List, Optional, Tuple
+from bisect import bisect_right
+
+from direction import Direction
+
+class RunLengthTape:
+    head: int
+    starts: List[int]
+    ends: List[int]
+    marks: List[Any]
+
+    def __init__(self):
+        self.head = 0
+        self.starts = []
+        self.ends = []
+        self.marks = []
+
+    def read(self) -> Any:
+        i = self._find_run(self.head)
+
+        return self.marks[i] if i is not None else 'B'
+
+    def write(self, mark: Any) -> None:
+        if self.read() == mark:
+            return
+
+        self._clear(self.head, self.head + 1)
+
+        if mark != 'B':
+            self._insert(self.head, self.head + 1, mark)
+
+    def shift(self, direction: Direction) -> None:
+        self.head += direction.value
+
+    def run_length(self, direction: Direction) -> Optional[int]:
+        i = bisect_right(self.starts, self.head) - 1
+
+        if i >= 0 and self.head < self.ends[i]:
+            if direction == Direction.RIGHT:
+                return self.ends[i] - self.head
+            elif direction == Direction.LEFT:
+                return self.head - self.starts[i] + 1
+        else:
+            if direction == Direction.RIGHT:
+                return self.starts[i + 1] - self.head if i + 1 < len(self.starts) else None
+            elif direction == Direction.LEFT:
+                return self.head - self.ends[i] + 1 if i >= 0 else None
+
+        raise ValueError(f'Unsupported sweep direction: {direction}')
+
+    def read_slice(self, start: int, stop: int) -> List[Any]:
+        result = ['B'] * max(0, stop - start)
+        i = max(0, bisect_right(self.starts, start) - 1)
+
+        while i < len(self.starts) and self.starts[i] < stop:
+            for position in range(max(start, self.starts[i]), min(stop, self.ends[i])):
+                result[position - start] = self.marks[i]
+
+            i += 1
+
+        return result
+
+    def write_slice(self, content: List[Any], offset: int = 0) -> None:
+        self._clear(offset, offset + len(content))
+
+        start = offset
+
+        for i in range(1, len(content) + 1):
+            if i == len(content) or content[i] != content[start - offset]:
+                if content[start - offset] != 'B':
+                    self._insert(start, offset + i, content[start - offset])
+
+                start = offset + i
+
+    def overwrite(self, content: List[Any], offset: int = 0) -> None:
+        self.starts.clear()
+        self.ends.clear()
+        self.marks.clear()
+
+        self.write_slice(content, offset)
+
+    def extents(self) -> Optional[Tuple[int, int]]:
+        if len(self.starts) == 0:
+            return None
+
+        return self.starts[0], self.ends[-1] - 1
+
+    def _find_run(self, position: int) -> Optional[int]:
+        i = bisect_right(self.starts, position) - 1
+
+        if i >= 0 and position < self.ends[i]:
+            return i
+
+        return None
+
+    def _clear(self, start: int, stop: int) -> None:
+        i = max(0, bisect_right(self.starts, start) - 1)
+
+        while i < len(self.starts) and self.starts[i] < stop:
+            if self.ends[i] <= start:
+                i += 1
+                continue
+
+            run_start, run_end, mark = self.starts[i], self.ends[i], self.marks[i]
+
+            del self.starts[i], self.ends[i], self.marks[i]
+
+            if run_end > stop:
+                self._put(i, stop, run_end, mark)
+
+            if run_start < start:
+                self._put(i, run_start, start, mark)
+                i += 1
+
+    def _insert(self, start: int, stop: int, mark: Any) -> None:
+        i = bisect_right(self.starts, start)
+
+        if i > 0 and self.ends[i - 1] == start and self.marks[i - 1] == mark:
+            i -= 1
+            start = self.starts[i]
+            del self.starts[i], self.ends[i], self.marks[i]
+
+        if i < len(self.starts) and self.starts[i] == stop and self.marks[i] == mark:
+            stop = self.ends[i]
+            del self.starts[i], self.ends[i], self.marks[i]
+
+        self._put(i, start, stop, mark)
+
+    def _put(self, i: int, start: int, stop: int, mark: Any) -> None:
+        self.starts.insert(i, start)
+        self.ends.insert(i, stop)
+        self.marks.insert(i, mark)
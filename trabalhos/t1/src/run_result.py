@@ -0,0 +1,40 @@
+from typing import List, Optional, Tuple
+from dataclasses import dataclass
+from enum import Enum, auto
+
+class HaltReason(Enum):
+    ACCEPTED = auto()
+    REJECTED = auto()
+    BUDGET = auto()
+    INTERRUPTED = auto()
+    DIVERGED = auto()
+    CYCLE = auto()
+    NO_PREDECESSOR = auto()
+
+@dataclass
+class RunResult:
+    reason: HaltReason
+    steps: int
+    final_state: str
+    extents: List[Optional[Tuple[int, int]]]
+    cycle_start: Optional[int] = None
+    cycle_period: Optional[int] = None
+
+    def has_halted(self) -> bool:
+        return self.reason in (HaltReason.ACCEPTED, HaltReason.REJECTED)
+
+    def __str__(self):
+        if self.reason == HaltReason.ACCEPTED:
+            return f'accepted in state {self.final_state} after {self.steps} steps'
+        elif self.reason == HaltReason.REJECTED:
+            return f'rejected in state {self.final_state} after {self.steps} steps'
+        elif self.reason == HaltReason.BUDGET:
+            return f'stopped in state {self.final_state} after exhausting the budget of {self.steps} steps'
+        elif self.reason == HaltReason.INTERRUPTED:
+            return f'interrupted in state {self.final_state} after {self.steps} steps'
+        elif self.reason == HaltReason.DIVERGED:
+            return f'diverges in state {self.final_state} after step {self.steps}'
+        elif self.reason == HaltReason.CYCLE:
+            return f'cycles with period {self.cycle_period} after step {self.cycle_start}'
+        else:
+            return f'rewound to state {self.final_state} after {self.steps} steps'
@@ -0,0 +1,174 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass
+from io import StringIO
+import argparse
+import math
+import os
+import sys
+import time
+
+from quintuple_turing_machine import QuintupleTuringMachineDefinition
+from benett_reversibility import create_reversible_machine, is_machine_reversible
+from machine_generators import random_machine_source
+from fingerprint import fingerprint_definition
+from benchmark import DEFAULT_TOLERANCE, MIN_SAMPLE_TIME, Measurement, best_time, report
+
+SIZES = [10 ** exponent for exponent in range(1, 7)]
+DEFAULT_MAX_SIZE = 10 ** 5
+DEFAULT_MAX_SECONDS = 10.0
+# Parsing is always measured at this size, whatever --max-size says, and checked
+# against the recorded baseline so a slowdown of large inputs is caught.
+PARSE_SIZE = 10 ** 6
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scaling_baseline.json')
+LONG_SAMPLE_TIME = 1.0
+FIT_POINTS = 3
+SUPERLINEAR_EXPONENT = 1.3
+QUADRATIC_EXPONENT = 1.7
+
+OPERATIONS = ['parse', 'is_machine_reversible', 'create_reversible_machine', 'to_code', 'eq']
+
+@dataclass
+class Fit:
+    operation: str
+    exponent: float
+    points: List[Tuple[int, float]]
+
+    def growth(self) -> str:
+        if self.exponent >= QUADRATIC_EXPONENT:
+            return 'quadratic or worse'
+
+        if self.exponent >= SUPERLINEAR_EXPONENT:
+            return 'superlinear'
+
+        return 'linear'
+
+    def __str__(self):
+        return f'{self.operation}: time ~ n^{self.exponent:.2f} ({self.growth()})'
+
+def fit_exponent(points: List[Tuple[int, float]]) -> float:
+    xs = [math.log(n) for n, _ in points]
+    ys = [math.log(seconds) for _, seconds in points]
+
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+
+    if variance == 0:
+        return 0.0
+
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+
+def create_source(size: int, seed: int = 0) -> str:
+    return random_machine_source(max(1, (size - 3) // 2), 2, seed)
+
+def create_operations(source: str, operations: Iterable[str] = OPERATIONS) -> Dict[str, Callable[[], Any]]:
+    operations = set(operations)
+    definition = QuintupleTuringMachineDefinition.parse(StringIO(source))
+
+    functions = {
+        'parse': lambda: QuintupleTuringMachineDefinition.parse(StringIO(source)),
+        'is_machine_reversible': lambda: is_machine_reversible(definition),
+        'create_reversible_machine': lambda: create_reversible_machine(definition),
+    }
+
+    if 'to_code' in operations:
+        functions['to_code'] = create_reversible_machine(definition).to_code
+
+    if 'eq' in operations:
+        other = QuintupleTuringMachineDefinition.parse(StringIO(source))
+        functions['eq'] = lambda: fingerprint_definition(definition) == fingerprint_definition(other)
+
+    return functions
+
+def measure(function: Callable[[], Any], repeat: int, min_time: float = MIN_SAMPLE_TIME) -> float:
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+
+    if elapsed >= LONG_SAMPLE_TIME:
+        return elapsed
+
+    return best_time(function, repeat, min_time)[0]
+
+def run_scaling_benchmarks(
+    max_size: int = DEFAULT_MAX_SIZE,
+    max_seconds: float = DEFAULT_MAX_SECONDS,
+    repeat: int = 3,
+    operations: Optional[List[str]] = None,
+    min_time: float = MIN_SAMPLE_TIME,
+    progress: Optional[Callable[[str, int, float], None]] = None,
+    parse_size: Optional[int] = PARSE_SIZE) -> Tuple[List[Measurement], List[Fit]]:
+    selected = OPERATIONS if operations is None else operations
+    points = {operation: [] for operation in selected}
+    active = set(selected)
+
+    for size in SIZES:
+        if size > max_size or len(active) == 0:
+            break
+
+        source = create_source(size)
+        functions = create_operations(source, active)
+        transitions = source.count('\n') - 4
+
+        for operation in selected:
+            if operation not in active:
+                continue
+
+            seconds = measure(functions[operation], repeat, min_time)
+            points[operation].append((transitions, seconds))
+
+            if progress is not None:
+                progress(operation, transitions, seconds)
+
+            if seconds > max_seconds:
+                active.discard(operation)
+
+    if 'parse' in selected and parse_size is not None and parse_size > max_size:
+        source = create_source(parse_size)
+        transitions = source.count('\n') - 4
+        seconds = measure(lambda: QuintupleTuringMachineDefinition.parse(StringIO(source)), repeat, min_time)
+        points['parse'].append((transitions, seconds))
+
+        if progress is not None:
+            progress('parse', transitions, seconds)
+
+    measurements = []
+    fits = []
+
+    for operation in selected:
+        for transitions, seconds in points[operation]:
+            measurements.append(Measurement(f'scaling/{operation}/{transitions}', 'seconds', seconds, higher_is_better=False))
+
+        if len(points[operation]) >= 2:
+            fit = Fit(operation, fit_exponent(points[operation][-FIT_POINTS:]), points[operation])
+            fits.append(fit)
+            measurements.append(Measurement(f'scaling/{operation}', 'exponent', fit.exponent, higher_is_better=False))
+
+    return measurements, fits
+
+def parse_arguments(args=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Measures how parsing, Bennett construction, to_code and equality scale with the number of transitions.')
+    parser.add_argument('--output', default=None, help='write the JSON results to this file instead of stdout')
+    parser.add_argument('--baseline', default=BASELINE, help='compare against a JSON file written by a previous run (defaults to the recorded baseline, "" to skip)')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='allowed slowdown before a measurement counts as a regression')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement; the best one is kept')
+    parser.add_argument('--max-size', type=int, default=DEFAULT_MAX_SIZE, help='largest number of transitions to generate (up to 1000000)')
+    parser.add_argument('--max-seconds', type=float, default=DEFAULT_MAX_SECONDS, help='stop growing an operation once one run takes longer than this')
+    parser.add_argument('--operation', action='append', choices=OPERATIONS, default=None, help='only measure this operation (may be repeated)')
+    parser.add_argument('--parse-size', type=int, default=PARSE_SIZE, help='also measure parsing at this many transitions (0 to skip)')
+
+    return parser.parse_args(args)
+
+if __name__ == '__main__':
+    arguments = parse_arguments()
+
+    def progress(operation: str, transitions: int, seconds: float) -> None:
+        print(f'{operation} n={transitions}: {seconds:.6f}s', file=sys.stderr, flush=True)
+
+    measurements, fits = run_scaling_benchmarks(arguments.max_size, arguments.max_seconds, arguments.repeat, arguments.operation, progress=progress, parse_size=arguments.parse_size or None)
+
+    for fit in fits:
+        print(fit, file=sys.stderr)
+
+    if report(measurements, arguments.output, arguments.baseline or None, arguments.tolerance):
+        sys.exit(1)
@@ -0,0 +1,131 @@
+from typing import Any, List, Optional
+from dataclasses import dataclass
+import queue
+import threading
+
+from simulator_copy import clone
+from execution_timeline import TimelineDelta, create_delta
+
+@dataclass
+class WorkerBatch:
+    deltas: List[TimelineDelta]
+    halted: bool
+
+def format_step_count(steps: int) -> str:
+    for divisor, suffix in [(10 ** 9, 'G'), (10 ** 6, 'M'), (10 ** 3, 'K')]:
+        if steps >= divisor:
+            return f'{steps / divisor:.1f}{suffix}'
+
+    return str(steps)
+
+class SimulationWorker:
+    simulator: Any
+    batch_size: int
+    batches: 'queue.Queue[WorkerBatch]'
+
+    steps: int
+    target: Optional[int]
+    halted: bool
+
+    def __init__(self, simulator: Any, target: Optional[int] = None, batch_size: int = 4096, queue_size: int = 64):
+        self.simulator = clone(simulator)
+        self.batch_size = batch_size
+        self.batches = queue.Queue(maxsize=queue_size)
+
+        self.steps = 0
+        self.target = target
+        self.halted = False
+
+        self._condition = threading.Condition()
+        self._cancelled = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def extend(self, steps: int) -> None:
+        with self._condition:
+            if self.target is not None:
+                self.target = max(self.target, self.steps) + steps
+
+            self._condition.notify()
+
+    def cancel(self) -> None:
+        with self._condition:
+            self._cancelled = True
+            self._condition.notify()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        self._thread.join(timeout)
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled
+
+    def is_running(self) -> bool:
+        return self._thread.is_alive() and not self._cancelled and not self.halted
+
+    def poll(self, max_batches: Optional[int] = None) -> List[WorkerBatch]:
+        result = []
+
+        while max_batches is None or len(result) < max_batches:
+            try:
+                result.append(self.batches.get_nowait())
+            except queue.Empty:
+                break
+
+        return result
+
+    def progress(self) -> str:
+        if self.halted:
+            status = 'halted'
+        elif self._cancelled:
+            status = 'cancelled'
+        elif self.target is not None and self.steps >= self.target:
+            status = 'paused'
+        else:
+            status = 'running'
+
+        return f'computed {format_step_count(self.steps)} steps ({status})'
+
+    def _run(self) -> None:
+        while not self.halted:
+            with self._condition:
+                while not self._cancelled and self.target is not None and self.steps >= self.target:
+                    self._condition.wait()
+
+                if self._cancelled:
+                    return
+
+                limit = self.batch_size if self.target is None else min(self.batch_size, self.target - self.steps)
+
+            batch = self._compute(limit)
+
+            if not self._put(batch):
+                return
+
+    def _compute(self, limit: int) -> WorkerBatch:
+        deltas = []
+
+        while len(deltas) < limit:
+            heads = [tape.head for tape in self.simulator.tapes]
+            transition = self.simulator.step()
+
+            if transition is None:
+                self.halted = True
+                break
+
+            deltas.append(create_delta(transition, heads))
+
+        self.steps += len(deltas)
+
+        return WorkerBatch(deltas, self.halted)
+
+    def _put(self, batch: WorkerBatch) -> bool:
+        while not self._cancelled:
+            try:
+                self.batches.put(batch, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+
+        return False
@@ -0,0 +1,8 @@
+from typing import Any
+import copy
+
+def clone(simulator: Any) -> Any:
+    result = copy.copy(simulator)
+    result.tapes = copy.deepcopy(simulator.tapes)
+
+    return result
@@ -0,0 +1,36 @@
+from typing import Any, Dict, Iterable, List
+
+BLANK = 'B'
+
+class SymbolTable:
+    symbols: List[Any]
+    ids: Dict[Any, int]
+
+    def __init__(self, symbols: Iterable[Any] = (), blank: Any = BLANK):
+        self.symbols = []
+        self.ids = {}
+
+        if blank is not None:
+            self.intern(blank)
+
+        for symbol in symbols:
+            self.intern(symbol)
+
+    def intern(self, symbol: Any) -> int:
+        id = self.ids.get(symbol)
+
+        if id is None:
+            id = len(self.symbols)
+            self.ids[symbol] = id
+            self.symbols.append(symbol)
+
+        return id
+
+    def lookup(self, id: int) -> Any:
+        return self.symbols[id]
+
+    def __contains__(self, symbol: Any) -> bool:
+        return symbol in self.ids
+
+    def __len__(self) -> int:
+        return len(self.symbols)
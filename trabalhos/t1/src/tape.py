@@ -1,4 +1,4 @@
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional, Tuple
 
 from direction import Direction
 
@@ -18,9 +18,21 @@ class Tape:
 
     def shift(self, direction: Direction) -> None:
         self.head += direction.value
+
+    def read_slice(self, start: int, stop: int) -> List[Any]:
+        return [self.content.get(i, 'B') for i in range(start, stop)]
+
+    def write_slice(self, content: List[Any], offset: int = 0) -> None:
+        self.content.update(zip(range(offset, offset + len(content)), content))
     
     def overwrite(self, content: List[Any], offset: int = 0) -> None:
         self.content.clear()
+        self.write_slice(content, offset)
+
+    def extents(self) -> Optional[Tuple[int, int]]:
+        positions = [position for position, mark in self.content.items() if mark != 'B']
+
+        if len(positions) == 0:
+            return None
 
-        for i, mark in enumerate(content):
-            self.content[i + offset] = mark
+        return min(positions), max(positions)
@@ -0,0 +1,133 @@
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Sequence, Tuple, TypeVar
+from operator import itemgetter
+
+T = TypeVar('T')
+
+def create_key_function(positions: Tuple[int, ...]) -> Callable[[Sequence[Any]], Any]:
+    if len(positions) == 0:
+        return lambda data: ()
+
+    return itemgetter(*positions)
+
+def create_key(marks: Tuple[Any, ...]) -> Any:
+    if len(marks) == 1:
+        return marks[0]
+
+    return marks
+
+def mutator(name: str) -> Callable[..., Any]:
+    method = getattr(list, name)
+
+    def mutate(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self.version += 1
+
+        return result
+
+    mutate.__name__ = name
+
+    return mutate
+
+# Transitions and marks are immutable, so any change to a definition's lists goes
+# through one of these methods and bumps the version its caches are keyed on.
+class VersionedList(list, Generic[T]):
+    version: int = 0
+
+    def __init__(self, iterable: Iterable[T] = ()):
+        super().__init__(iterable)
+        self.version = 0
+
+    __setitem__ = mutator('__setitem__')
+    __delitem__ = mutator('__delitem__')
+    __iadd__ = mutator('__iadd__')
+    __imul__ = mutator('__imul__')
+    append = mutator('append')
+    extend = mutator('extend')
+    insert = mutator('insert')
+    pop = mutator('pop')
+    remove = mutator('remove')
+    clear = mutator('clear')
+    sort = mutator('sort')
+    reverse = mutator('reverse')
+
+class TransitionIndexGroup(Generic[T]):
+    positions: Tuple[int, ...]
+    key: Callable[[Sequence[Any]], Any]
+    table: Dict[Any, Tuple[int, T]]
+    collisions: Dict[Any, List[T]]
+
+    def __init__(self, positions: Tuple[int, ...]):
+        self.positions = positions
+        self.key = create_key_function(positions)
+        self.table = {}
+        self.collisions = {}
+
+    def read_key(self, tapes: Sequence[Any]) -> Any:
+        if len(self.positions) == 1:
+            return tapes[self.positions[0]].read()
+
+        return tuple(tapes[i].read() for i in self.positions)
+
+class TransitionIndex(Generic[T]):
+    groups: Dict[Any, List[TransitionIndexGroup[T]]]
+
+    def __init__(self, entries: Iterable[Tuple[Any, Tuple[int, ...], Tuple[Any, ...], T]]):
+        self.groups = {}
+
+        for priority, (state, positions, marks, transition) in enumerate(entries):
+            state_groups = self.groups.setdefault(state, [])
+            group = next((g for g in state_groups if g.positions == positions), None)
+
+            if group is None:
+                group = TransitionIndexGroup(positions)
+                state_groups.append(group)
+
+            key = create_key(marks)
+
+            if key in group.table:
+                group.collisions.setdefault(key, []).append(transition)
+            else:
+                group.table[key] = (priority, transition)
+
+    def find(self, state: Any, data: Sequence[Any]) -> Optional[T]:
+        state_groups = self.groups.get(state)
+
+        if state_groups is None:
+            return None
+
+        return self._select([group.table.get(group.key(data)) for group in state_groups])
+
+    def find_on_tapes(self, state: Any, tapes: Sequence[Any]) -> Optional[T]:
+        state_groups = self.groups.get(state)
+
+        if state_groups is None:
+            return None
+
+        if len(state_groups) == 1:
+            entry = state_groups[0].table.get(state_groups[0].read_key(tapes))
+
+            return entry[1] if entry is not None else None
+
+        return self._select([group.table.get(group.read_key(tapes)) for group in state_groups])
+
+    def find_all_on_tapes(self, state: Any, tapes: Sequence[Any]) -> List[T]:
+        result = []
+
+        for group in self.groups.get(state, []):
+            key = group.read_key(tapes)
+            entry = group.table.get(key)
+
+            if entry is not None:
+                result.append(entry[1])
+                result.extend(group.collisions.get(key, []))
+
+        return result
+
+    def _select(self, entries: List[Optional[Tuple[int, T]]]) -> Optional[T]:
+        best = None
+
+        for entry in entries:
+            if entry is not None and (best is None or entry[0] < best[0]):
+                best = entry
+
+        return best[1] if best is not None else None
@@ -0,0 +1,93 @@
+import pytest
+
+from array_tape import ArrayTape
+from symbol_table import SymbolTable
+from direction import Direction
+
+@pytest.fixture
+def tape() -> ArrayTape:
+    return ArrayTape(capacity=4)
+
+def test_defaults(tape: ArrayTape) -> None:
+    assert tape.head == 0
+    assert tape.read() == "B"
+    assert tape.extents() == None
+
+def test_overwrite(tape: ArrayTape) -> None:
+    tape.write("X")
+    tape.overwrite([1, "A", 2], 3)
+
+    assert tape.read() == "B"
+    assert tape.read_slice(2, 7) == ["B", 1, "A", 2, "B"]
+    assert tape.extents() == (3, 5)
+
+def test_shift_grows_in_both_directions(tape: ArrayTape) -> None:
+    for i in range(20):
+        tape.write(i)
+        tape.shift(Direction.RIGHT)
+
+    assert tape.head == 20
+
+    tape.head = 0
+
+    for i in range(20):
+        tape.shift(Direction.LEFT)
+        tape.write(-i - 1)
+
+    assert tape.head == -20
+    assert tape.read_slice(-20, 20) == list(range(-20, 20))
+    assert tape.extents() == (-20, 19)
+
+def test_manipulation(tape: ArrayTape) -> None:
+    tape.write(1)
+    tape.shift(Direction.RIGHT)
+    tape.write("A")
+    tape.shift(Direction.RIGHT)
+    tape.write("B")
+    tape.shift(Direction.RIGHT)
+    tape.write(2)
+    tape.shift(Direction.RIGHT)
+
+    assert tape.read() == "B"
+
+    tape.shift(Direction.LEFT)
+    assert tape.read() == 2
+
+    tape.shift(Direction.LEFT)
+    assert tape.read() == "B"
+
+    tape.shift(Direction.LEFT)
+    assert tape.read() == "A"
+
+    tape.shift(Direction.LEFT)
+    assert tape.read() == 1
+
+def test_extents_ignore_blanks(tape: ArrayTape) -> None:
+    tape.write_slice(["B", "0", "B", "1", "B"], -2)
+    assert tape.extents() == (-1, 1)
+
+    tape.write_slice(["B", "B", "B"], -1)
+    assert tape.extents() == None
+
+def test_read_slice_outside_buffer(tape: ArrayTape) -> None:
+    tape.write("0")
+
+    assert tape.read_slice(100, 103) == ["B", "B", "B"]
+    assert tape.read_slice(-1, 2) == ["B", "0", "B"]
+
+def test_cells_are_compact(tape: ArrayTape) -> None:
+    tape.write_slice(list(range(1, 256)))
+    assert tape.cells.itemsize == 1
+
+    tape.write(1000)
+    assert tape.cells.itemsize == 2
+    assert tape.read() == 1000
+    assert tape.read_slice(0, 3) == [1000, 2, 3]
+
+def test_shared_symbols() -> None:
+    symbols = SymbolTable(["0", "1"])
+    tape = ArrayTape(symbols)
+
+    tape.write("1")
+
+    assert tape.read_id() == symbols.intern("1")
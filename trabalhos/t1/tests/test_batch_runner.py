@@ -0,0 +1,64 @@
+import pytest
+
+from io import StringIO
+
+from quintuple_turing_machine import QuintupleTuringMachineDefinition
+from quadruple_turing_machine import QuadrupleTuringMachineDefinition, QuadrupleTuringMachineSimulator
+from compiled_turing_machine import CompiledQuadrupleTuringMachine, CompiledQuadrupleTuringMachineSimulator
+from benett_reversibility import create_reversible_machine
+from batch_runner import run_batch, run_input
+from run_result import HaltReason
+
+@pytest.fixture
+def definition() -> QuadrupleTuringMachineDefinition:
+    return create_reversible_machine(QuintupleTuringMachineDefinition.parse(StringIO(
+        '4 2 3 7\n'
+        '1 2 3 4\n'
+        '0 1\n'
+        '0 1 B\n'
+        '(1,B)=(2,B,R)\n'
+        '(2,0)=(2,1,R)\n'
+        '(2,1)=(2,0,R)\n'
+        '(2,B)=(3,B,L)\n'
+        '(3,0)=(3,0,L)\n'
+        '(3,1)=(3,1,L)\n'
+        '(3,B)=(4,B,S)\n'
+    )))
+
+def test_run_input_resets_simulator(definition: QuadrupleTuringMachineDefinition) -> None:
+    simulator = CompiledQuadrupleTuringMachineSimulator(CompiledQuadrupleTuringMachine.compile(definition))
+
+    first = run_input(simulator, 0, '0110', None)
+    second = run_input(simulator, 1, '1', None)
+    third = run_input(simulator, 2, '0110', None)
+
+    assert second.tapes[-1] == ['0']
+    assert third.result == first.result
+    assert third.tapes == first.tapes
+
+def test_run_batch_matches_simulator(definition: QuadrupleTuringMachineDefinition) -> None:
+    inputs = ['', '0', '1', '10', '0110', '111000']
+
+    results = sorted(run_batch(definition, inputs, processes=2, chunksize=1), key=lambda batch_result: batch_result.index)
+
+    assert [batch_result.input for batch_result in results] == inputs
+
+    for batch_result in results:
+        simulator = QuadrupleTuringMachineSimulator(definition)
+        simulator.tapes[0].overwrite(list(batch_result.input), 1)
+        result = simulator.run()
+
+        assert batch_result.result.reason == result.reason
+        assert batch_result.result.steps == result.steps
+        assert batch_result.result.final_state == result.final_state
+
+        output_extents = simulator.tapes[-1].extents()
+        expected_output = [] if output_extents is None else simulator.tapes[-1].read_slice(output_extents[0], output_extents[1] + 1)
+
+        assert batch_result.tapes[-1] == expected_output
+
+def test_run_batch_with_step_budgets(definition: QuadrupleTuringMachineDefinition) -> None:
+    results = sorted(run_batch(definition, [('0110', 5), '0110', ('0110', None)], max_steps=3, processes=1), key=lambda batch_result: batch_result.index)
+
+    assert [batch_result.result.reason for batch_result in results] == [HaltReason.BUDGET, HaltReason.BUDGET, HaltReason.ACCEPTED]
+    assert [batch_result.result.steps for batch_result in results][:2] == [5, 3]
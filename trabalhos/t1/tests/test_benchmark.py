@@ -0,0 +1,52 @@
+from benchmark import Measurement, best_time, compare, create_workloads, from_json, measure_compiled_simulator, measure_simulator, to_json
+from benett_reversibility import create_reversible_machine
+
+def test_best_time_repeats_until_minimum_time() -> None:
+    calls = []
+    elapsed, value = best_time(lambda: calls.append(1) or len(calls), repeat=2, min_time=0.001)
+
+    assert elapsed > 0
+    assert value == len(calls)
+    assert len(calls) > 2
+
+def test_measure_simulator() -> None:
+    workload = next(workload for workload in create_workloads() if workload.name == 'busy_beaver-4')
+    measurements = measure_simulator(workload, create_reversible_machine(workload.definition), repeat=1)
+
+    assert [(measurement.name, measurement.metric) for measurement in measurements] == [
+        ('simulator/busy_beaver-4', 'steps_per_second'),
+        ('simulator/busy_beaver-4', 'peak_memory_bytes'),
+    ]
+    assert all(measurement.value > 0 for measurement in measurements)
+
+def test_measure_compiled_simulator() -> None:
+    workload = next(workload for workload in create_workloads() if workload.name == 'busy_beaver-4')
+    measurements = measure_compiled_simulator(workload, create_reversible_machine(workload.definition), repeat=1)
+
+    assert [measurement.name for measurement in measurements] == ['compiled/busy_beaver-4', 'compiled_accelerated/busy_beaver-4']
+    assert all(measurement.value > 0 for measurement in measurements)
+
+def test_json_round_trip() -> None:
+    measurements = [Measurement('a', 'steps_per_second', 10.0), Measurement('a', 'peak_memory_bytes', 5, higher_is_better=False)]
+
+    assert from_json(to_json(measurements)) == measurements
+
+def test_compare_detects_regressions() -> None:
+    baseline = [
+        Measurement('a', 'steps_per_second', 100.0),
+        Measurement('a', 'peak_memory_bytes', 100, higher_is_better=False),
+        Measurement('b', 'steps_per_second', 100.0),
+    ]
+    current = [
+        Measurement('a', 'steps_per_second', 85.0),
+        Measurement('a', 'peak_memory_bytes', 200, higher_is_better=False),
+        Measurement('c', 'steps_per_second', 1.0),
+    ]
+
+    comparisons = compare(current, baseline, tolerance=0.2)
+
+    assert [(comparison.name, comparison.metric, comparison.regressed) for comparison in comparisons] == [
+        ('a', 'steps_per_second', False),
+        ('a', 'peak_memory_bytes', True),
+    ]
+    assert comparisons[1].ratio == 0.5
@@ -1,9 +1,12 @@
 import pytest
 
+from io import StringIO
+
 from direction import Direction
-from quintuple_turing_machine import QuintupleAct, QuintupleTransition, QuintupleTuringMachineDefinition
-from quadruple_turing_machine import QuadrupleAct, QuadrupleTransition, QuadrupleTuringMachineDefinition
+from quintuple_turing_machine import QuintupleAct, QuintupleTransition, QuintupleTuringMachineDefinition, QuintupleTuringMachineSimulator
+from quadruple_turing_machine import QuadrupleAct, QuadrupleTransition, QuadrupleTuringMachineDefinition, QuadrupleTuringMachineSimulator
 from benett_reversibility import is_machine_reversible, create_reversible_machine
+from run_result import HaltReason
 
 def test_reversibility_check_with_valid_machine():
     machine = QuintupleTuringMachineDefinition(
@@ -644,4 +647,65 @@ def test_reversibile_machine_creation():
         final_states=['C1']
     )
 
-    assert create_reversible_machine(quintuple_machine) == expected_reversible_machine
\ No newline at end of file
+    assert create_reversible_machine(quintuple_machine) == expected_reversible_machine
+
+@pytest.mark.parametrize("input", ['', '0', '1100', '10101'])
+def test_reversible_machine_matches_original(input: str) -> None:
+    machine = QuintupleTuringMachineDefinition.parse(StringIO(
+        '4 2 3 7\n'
+        '1 2 3 4\n'
+        '0 1\n'
+        '0 1 B\n'
+        '(1,B)=(2,B,R)\n'
+        '(2,0)=(2,1,R)\n'
+        '(2,1)=(2,0,R)\n'
+        '(2,B)=(3,B,L)\n'
+        '(3,0)=(3,0,L)\n'
+        '(3,1)=(3,1,L)\n'
+        '(3,B)=(4,B,S)\n'
+    ))
+
+    simulator = QuintupleTuringMachineSimulator(machine)
+    simulator.tapes[0].overwrite(list(input), 1)
+    result = simulator.run()
+
+    reversible_simulator = QuadrupleTuringMachineSimulator(create_reversible_machine(machine))
+    reversible_simulator.tapes[0].overwrite(list(input), 1)
+    reversible_result = reversible_simulator.run()
+
+    assert result.has_halted() and reversible_result.has_halted()
+    assert reversible_simulator.has_accepted() == simulator.has_accepted()
+    assert reversible_simulator.tapes[0].read_slice(0, len(input) + 2) == ['B'] + list(input) + ['B']
+    assert reversible_simulator.tapes[1].extents() == None
+    assert reversible_simulator.tapes[2].read_slice(0, len(input) + 2) == simulator.tapes[0].read_slice(0, len(input) + 2)
+
+@pytest.mark.parametrize("input", ['', '0', '1100', '10101'])
+def test_reversible_machine_runs_backward_to_input(input: str) -> None:
+    machine = QuintupleTuringMachineDefinition.parse(StringIO(
+        '4 2 3 7\n'
+        '1 2 3 4\n'
+        '0 1\n'
+        '0 1 B\n'
+        '(1,B)=(2,B,R)\n'
+        '(2,0)=(2,1,R)\n'
+        '(2,1)=(2,0,R)\n'
+        '(2,B)=(3,B,L)\n'
+        '(3,0)=(3,0,L)\n'
+        '(3,1)=(3,1,L)\n'
+        '(3,B)=(4,B,S)\n'
+    ))
+
+    reversible_machine = create_reversible_machine(machine)
+    reversible_simulator = QuadrupleTuringMachineSimulator(reversible_machine)
+    reversible_simulator.tapes[0].overwrite(list(input), 1)
+
+    forward_result = reversible_simulator.run()
+    backward_result = reversible_simulator.run_backward()
+
+    assert backward_result.reason == HaltReason.NO_PREDECESSOR
+    assert backward_result.steps == forward_result.steps
+    assert reversible_simulator.current_state == reversible_machine.initial_state
+    assert [tape.head for tape in reversible_simulator.tapes] == [0, 0, 0]
+    assert reversible_simulator.tapes[0].read_slice(0, len(input) + 2) == ['B'] + list(input) + ['B']
+    assert reversible_simulator.tapes[1].extents() == None
+    assert reversible_simulator.tapes[2].extents() == None
@@ -0,0 +1,186 @@
+import pytest
+
+from array import array
+from io import StringIO
+from typing import Optional
+
+from direction import Direction
+from quintuple_turing_machine import QuintupleTuringMachineDefinition
+from quadruple_turing_machine import QuadrupleAct, QuadrupleTransition, QuadrupleTuringMachineDefinition, QuadrupleTuringMachineSimulator
+from compiled_turing_machine import CompiledQuadrupleTuringMachine, CompiledQuadrupleTuringMachineSimulator, run_length
+from benett_reversibility import create_reversible_machine
+from run_result import HaltReason
+
+@pytest.fixture
+def definition() -> QuadrupleTuringMachineDefinition:
+    return create_reversible_machine(QuintupleTuringMachineDefinition.parse(StringIO(
+        '4 2 3 7\n'
+        '1 2 3 4\n'
+        '0 1\n'
+        '0 1 B\n'
+        '(1,B)=(2,B,R)\n'
+        '(2,0)=(2,1,R)\n'
+        '(2,1)=(2,0,R)\n'
+        '(2,B)=(3,B,L)\n'
+        '(3,0)=(3,0,L)\n'
+        '(3,1)=(3,1,L)\n'
+        '(3,B)=(4,B,S)\n'
+    )))
+
+def assert_same_configuration(
+    simulator: QuadrupleTuringMachineSimulator,
+    compiled_simulator: CompiledQuadrupleTuringMachineSimulator) -> None:
+    assert compiled_simulator.state() == simulator.current_state
+
+    for i, tape in enumerate(simulator.tapes):
+        assert compiled_simulator.tapes[i].head == tape.head
+        assert compiled_simulator.read(i) == tape.read()
+
+def test_compile(definition: QuadrupleTuringMachineDefinition) -> None:
+    machine = CompiledQuadrupleTuringMachine.compile(definition)
+
+    assert machine.tapes == 3
+    assert len(machine.sources) == len(definition.transitions)
+    assert len(machine.writes) == 3 * len(definition.transitions)
+    assert machine.states.lookup(machine.initial_state) == 'A1'
+    assert {machine.states.lookup(state) for state in machine.final_states} == {'C1'}
+    assert machine.marks.lookup(0) == 'B'
+
+def test_compile_with_wrong_number_of_acts() -> None:
+    definition = QuadrupleTuringMachineDefinition(
+        tapes=2,
+        alphabet=['B'],
+        transitions=[
+            QuadrupleTransition(
+                source_state='1',
+                destination_state='2',
+                acts=[QuadrupleAct.shift(Direction.RIGHT)]
+            )
+        ],
+        initial_state='1',
+        final_states=['2']
+    )
+
+    with pytest.raises(ValueError):
+        CompiledQuadrupleTuringMachine.compile(definition)
+
+def test_step_matches_simulator(definition: QuadrupleTuringMachineDefinition) -> None:
+    simulator = QuadrupleTuringMachineSimulator(definition)
+    simulator.tapes[0].overwrite(list('0110'), 1)
+
+    compiled_simulator = CompiledQuadrupleTuringMachineSimulator(CompiledQuadrupleTuringMachine.compile(definition))
+    compiled_simulator.load(simulator)
+
+    while True:
+        assert_same_configuration(simulator, compiled_simulator)
+
+        transition = simulator.step()
+        assert compiled_simulator.step() == transition
+
+        if transition is None:
+            break
+
+    assert compiled_simulator.has_accepted()
+    assert compiled_simulator.has_halted()
+
+def test_run_matches_simulator(definition: QuadrupleTuringMachineDefinition) -> None:
+    simulator = QuadrupleTuringMachineSimulator(definition)
+    simulator.tapes[0].overwrite(list('10011'), 1)
+
+    compiled_simulator = CompiledQuadrupleTuringMachineSimulator(CompiledQuadrupleTuringMachine.compile(definition))
+    compiled_simulator.load(simulator)
+
+    steps = 0
+
+    while simulator.step() is not None:
+        steps += 1
+
+    result = compiled_simulator.run()
+
+    assert result.reason == HaltReason.ACCEPTED
+    assert result.steps == steps
+    assert result.final_state == simulator.current_state
+    assert result.extents == [tape.extents() for tape in simulator.tapes]
+    assert compiled_simulator.steps == steps
+
+    stored_simulator = QuadrupleTuringMachineSimulator(definition)
+    compiled_simulator.store(stored_simulator)
+
+    assert stored_simulator.current_state == simulator.current_state
+
+    for tape, expected_tape in zip(stored_simulator.tapes, simulator.tapes):
+        assert tape.head == expected_tape.head
+        assert tape.extents() == expected_tape.extents()
+        assert tape.read_slice(-10, 20) == expected_tape.read_slice(-10, 20)
+
+    assert simulator.tapes[2].content[5] == '0'
+
+def test_run_with_step_budget(definition: QuadrupleTuringMachineDefinition) -> None:
+    compiled_simulator = CompiledQuadrupleTuringMachineSimulator(CompiledQuadrupleTuringMachine.compile(definition))
+
+    assert compiled_simulator.run(3).steps == 3
+
+    result = compiled_simulator.run(2)
+
+    assert result.reason == HaltReason.BUDGET
+    assert result.steps == 2
+    assert compiled_simulator.steps == 5
+    assert not compiled_simulator.has_halted()
+
+def test_run_until(definition: QuadrupleTuringMachineDefinition) -> None:
+    compiled_simulator = CompiledQuadrupleTuringMachineSimulator(CompiledQuadrupleTuringMachine.compile(definition))
+
+    result = compiled_simulator.run(until=lambda simulator: simulator.state() == 'A2')
+
+    assert result.reason == HaltReason.INTERRUPTED
+    assert result.steps == 2
+    assert result.final_state == 'A2'
+
+@pytest.mark.parametrize("direction, start, mark, limit, expected", [
+    (1, 2, 1, 100, 5),
+    (-1, 6, 1, 100, 5),
+    (1, 2, 1, 3, 3),
+    (1, 0, 2, 100, 0),
+    (1, 7, 0, 100, 100),
+    (-1, 0, 0, 100, 100),
+    (-1, 1, 0, 100, 0),
+    (1, 20, 0, 100, 100),
+])
+def test_run_length(direction: int, start: int, mark: int, limit: int, expected: int) -> None:
+    cells = array('B', [0, 2, 1, 1, 1, 1, 1, 0, 0])
+
+    assert run_length(cells, start, direction, mark, limit) == expected
+
+def test_find_sweep_cycle(definition: QuadrupleTuringMachineDefinition) -> None:
+    machine = CompiledQuadrupleTuringMachine.compile(definition)
+    cycles = [(definition.transitions[t], machine.find_sweep_cycle(t)) for t in range(len(definition.transitions))]
+    sweeps = [str(transition) for transition, cycle in cycles if cycle is not None]
+
+    assert "A3[0 / B] -> [0 + B]A'5" in sweeps
+    assert all(cycle.length == 2 for _, cycle in cycles if cycle is not None)
+    assert all(not transition.source_state.startswith("A'") for transition, cycle in cycles if cycle is not None)
+
+@pytest.mark.parametrize("input, max_steps", [
+    ('0' * 40 + '1' * 40, None),
+    ('0' * 40 + '1' * 40, 123),
+    ('1' * 100, 777),
+    ('01' * 30, None),
+])
+def test_accelerated_run_matches_simulator(definition: QuadrupleTuringMachineDefinition, input: str, max_steps: Optional[int]) -> None:
+    simulator = QuadrupleTuringMachineSimulator(definition)
+    simulator.tapes[0].overwrite(list(input), 1)
+
+    compiled_simulator = CompiledQuadrupleTuringMachineSimulator(CompiledQuadrupleTuringMachine.compile(definition))
+    compiled_simulator.load(simulator)
+
+    expected = simulator.run(max_steps)
+    result = compiled_simulator.run(max_steps)
+
+    assert result == expected
+
+    stored_simulator = QuadrupleTuringMachineSimulator(definition)
+    compiled_simulator.store(stored_simulator)
+
+    for tape, expected_tape in zip(stored_simulator.tapes, simulator.tapes):
+        assert tape.head == expected_tape.head
+        assert tape.read_slice(-200, 200) == expected_tape.read_slice(-200, 200)
@@ -0,0 +1,116 @@
+import pytest
+import os
+import time
+from io import StringIO
+
+from quintuple_turing_machine import QuintupleTuringMachineDefinition
+from benett_reversibility import create_reversible_machine
+from compiled_turing_machine import CompiledQuadrupleTuringMachine
+from conversion_cache import STALE_TEMPORARY_SECONDS, ConversionCache, conversion_key
+
+def create_definition(final_state: str) -> QuintupleTuringMachineDefinition:
+    return QuintupleTuringMachineDefinition.parse(StringIO(
+        f'4 2 3 7\n'
+        f'1 2 3 {final_state}\n'
+        f'0 1\n'
+        f'0 1 B\n'
+        f'(1,B)=(2,B,R)\n'
+        f'(2,0)=(2,1,R)\n'
+        f'(2,1)=(2,0,R)\n'
+        f'(2,B)=(3,B,L)\n'
+        f'(3,0)=(3,0,L)\n'
+        f'(3,1)=(3,1,L)\n'
+        f'(3,B)=({final_state},B,S)\n'
+    ))
+
+def test_conversion_is_cached(tmp_path) -> None:
+    definition = create_definition('4')
+    cache = ConversionCache(str(tmp_path))
+
+    first = cache.convert(definition)
+    second = ConversionCache(str(tmp_path)).convert(definition)
+
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert first.definition == create_reversible_machine(definition)
+    assert second.definition == first.definition
+    assert second.definition.transitions == first.definition.transitions
+
+def test_cached_compiled_machine_matches(tmp_path) -> None:
+    definition = create_definition('4')
+    cache = ConversionCache(str(tmp_path))
+    cache.convert(definition)
+
+    cached = cache.get(definition).compiled
+    expected = CompiledQuadrupleTuringMachine.compile(create_reversible_machine(definition))
+
+    assert cache.hits == 1
+    assert cached.states.symbols == expected.states.symbols
+    assert cached.marks.symbols == expected.marks.symbols
+    assert cached.initial_state == expected.initial_state
+    assert cached.final_states == expected.final_states
+    assert cached.sources == expected.sources
+    assert cached.reads == expected.reads
+    assert cached.moves == expected.moves
+    assert cached.dispatch == expected.dispatch
+
+def test_keys_differ_between_definitions() -> None:
+    assert conversion_key(create_definition('4')) == conversion_key(create_definition('4'))
+    assert conversion_key(create_definition('4')) != conversion_key(create_definition('5'))
+
+def test_corrupted_entry_is_a_miss(tmp_path) -> None:
+    definition = create_definition('4')
+    cache = ConversionCache(str(tmp_path))
+    cache.convert(definition)
+
+    with open(tmp_path / (conversion_key(definition) + '.tmce'), 'wb') as file:
+        file.write(b'garbage')
+
+    assert cache.get(definition) is None
+    assert cache.misses == 2
+
+def test_least_recently_used_entries_are_evicted(tmp_path) -> None:
+    cache = ConversionCache(str(tmp_path))
+
+    for final_state in ['4', '5', '6']:
+        cache.convert(create_definition(final_state))
+
+    entry_size = cache.size() // 3
+    now = time.time()
+
+    for age, final_state in enumerate(['6', '4', '5']):
+        path = tmp_path / (conversion_key(create_definition(final_state)) + '.tmce')
+        os.utime(path, (now - 100 * (age + 1), now - 100 * (age + 1)))
+
+    cache.max_bytes = entry_size * 2 + entry_size // 2
+    cache.evict()
+
+    assert cache.evictions == 1
+    assert cache.get(create_definition('5')) is None
+    assert cache.get(create_definition('4')) is not None
+    assert cache.get(create_definition('6')) is not None
+    assert not any(name.endswith('.tmp') for name in os.listdir(tmp_path))
+
+def test_stale_temporary_files_are_swept(tmp_path) -> None:
+    cache = ConversionCache(str(tmp_path))
+    stale = tmp_path / 'abandoned.tmp'
+    fresh = tmp_path / 'writing.tmp'
+    stale.write_bytes(b'x' * 1000)
+    fresh.write_bytes(b'x' * 100)
+
+    old = time.time() - 2 * STALE_TEMPORARY_SECONDS
+    os.utime(stale, (old, old))
+
+    assert cache.size() == 1100
+
+    cache.convert(create_definition('4'))
+    entry_size = os.path.getsize(tmp_path / (conversion_key(create_definition('4')) + '.tmce'))
+
+    assert not stale.exists()
+    assert fresh.exists()
+    assert cache.size() == entry_size + 100
+
+    cache.max_bytes = entry_size
+    cache.evict()
+
+    assert cache.evictions == 1
+    assert fresh.exists()
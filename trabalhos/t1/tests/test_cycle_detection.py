@@ -0,0 +1,128 @@
+import pytest
+
+from direction import Direction
+from quintuple_turing_machine import QuintupleAct, QuintupleTransition, QuintupleTuringMachineDefinition, QuintupleTuringMachineSimulator
+from quadruple_turing_machine import QuadrupleAct, QuadrupleTransition, QuadrupleTuringMachineDefinition, QuadrupleTuringMachineSimulator
+from cycle_detection import ConfigurationHasher, HashedSimulation, run_with_cycle_detection
+from run_result import HaltReason
+from run_length_tape import RunLengthTape
+
+@pytest.fixture
+def definition() -> QuintupleTuringMachineDefinition:
+    return QuintupleTuringMachineDefinition(
+        tapes=1,
+        alphabet=['0', 'X', 'B'],
+        transitions=[
+            QuintupleTransition('0', '0', [QuintupleAct('0', '0', Direction.RIGHT)]),
+            QuintupleTransition('0', '1', [QuintupleAct('B', 'X', Direction.LEFT)]),
+            QuintupleTransition('1', '2', [QuintupleAct('0', '0', Direction.RIGHT)]),
+            QuintupleTransition('2', '1', [QuintupleAct('X', 'X', Direction.LEFT)]),
+            QuintupleTransition('3', '3', [QuintupleAct('B', '0', Direction.RIGHT)]),
+        ],
+        initial_state='0',
+        final_states=['4']
+    )
+
+def test_incremental_hash_matches_full_hash(definition: QuintupleTuringMachineDefinition) -> None:
+    hasher = ConfigurationHasher(seed=1)
+    simulator = QuintupleTuringMachineSimulator(definition)
+    simulator.tapes[0].overwrite(['0', '0', '0'])
+
+    simulation = HashedSimulation(simulator, hasher)
+    hashes = [simulation.hash]
+
+    for _ in range(6):
+        simulation.step()
+        assert simulation.hash == hasher.hash(simulator)
+        hashes.append(simulation.hash)
+
+    assert len(set(hashes[:5])) == 5
+    assert hashes[4] == hashes[6]
+
+def test_hasher_memory_stays_bounded_while_drifting(definition: QuintupleTuringMachineDefinition) -> None:
+    definition.initial_state = '3'
+
+    hasher = ConfigurationHasher(seed=1)
+    simulator = QuintupleTuringMachineSimulator(definition)
+    simulation = HashedSimulation(simulator, hasher)
+
+    for _ in range(10):
+        simulation.step()
+
+    keys = len(hasher.keys)
+
+    for _ in range(1000):
+        simulation.step()
+
+    assert len(hasher.keys) == keys
+    assert simulation.hash == hasher.hash(simulator)
+
+@pytest.mark.parametrize("zeros, expected_start", [
+    (1, 2),
+    (3, 4),
+    (10, 11)
+])
+def test_cycle_detection(definition: QuintupleTuringMachineDefinition, zeros: int, expected_start: int) -> None:
+    simulator = QuintupleTuringMachineSimulator(definition)
+    simulator.tapes[0].overwrite(['0'] * zeros)
+
+    result = simulator.run(detect_cycles=True)
+
+    assert result.reason == HaltReason.CYCLE
+    assert result.cycle_period == 2
+    assert result.cycle_start == expected_start
+    assert result.steps >= expected_start + 2
+    assert str(result) == f'cycles with period 2 after step {expected_start}'
+
+def test_cycle_detection_ignores_acceleration(definition: QuintupleTuringMachineDefinition) -> None:
+    simulator = QuintupleTuringMachineSimulator(definition, RunLengthTape, accelerate=True)
+    simulator.tapes[0].overwrite(['0'] * 10)
+
+    result = simulator.run(detect_cycles=True)
+
+    assert result.reason == HaltReason.CYCLE
+    assert result.cycle_period == 2
+    assert result.cycle_start == 11
+
+def test_cycle_detection_with_halting_machine(definition: QuintupleTuringMachineDefinition) -> None:
+    definition.transitions = definition.transitions[:1]
+
+    simulator = QuintupleTuringMachineSimulator(definition)
+    simulator.tapes[0].overwrite(['0'] * 5)
+
+    result = simulator.run(detect_cycles=True)
+
+    assert result.reason == HaltReason.REJECTED
+    assert result.steps == 5
+
+def test_cycle_detection_with_drifting_machine(definition: QuintupleTuringMachineDefinition) -> None:
+    definition.initial_state = '3'
+
+    result = QuintupleTuringMachineSimulator(definition).run(1000, detect_cycles=True)
+
+    assert result.reason == HaltReason.BUDGET
+    assert result.steps == 1000
+
+def test_cycle_detection_with_quadruple_machine() -> None:
+    definition = QuadrupleTuringMachineDefinition(
+        tapes=2,
+        alphabet=['0'],
+        transitions=[
+            QuadrupleTransition('1', '2', [QuadrupleAct.read_write('B', '0'), QuadrupleAct.shift(Direction.RIGHT)]),
+            QuadrupleTransition('2', '3', [QuadrupleAct.read_write('0', '0'), QuadrupleAct.shift(Direction.RIGHT)]),
+            QuadrupleTransition('3', '4', [QuadrupleAct.shift(Direction.STAY), QuadrupleAct.shift(Direction.LEFT)]),
+            QuadrupleTransition('4', '3', [QuadrupleAct.shift(Direction.STAY), QuadrupleAct.shift(Direction.RIGHT)]),
+        ],
+        initial_state='1',
+        final_states=['5']
+    )
+
+    simulator = QuadrupleTuringMachineSimulator(definition)
+
+    assert simulator.run(max_steps=1, detect_cycles=True).reason == HaltReason.BUDGET
+
+    result = run_with_cycle_detection(QuadrupleTuringMachineSimulator(definition), seed=7)
+
+    assert result.reason == HaltReason.CYCLE
+    assert result.cycle_start == 2
+    assert result.cycle_period == 2
@@ -0,0 +1,86 @@
+import pytest
+from io import StringIO
+
+from quintuple_turing_machine import QuintupleTuringMachineDefinition
+from quadruple_turing_machine import QuadrupleTuringMachineSimulator
+from benett_reversibility import create_reversible_machine
+from execution_timeline import DELTA_BYTES, ExecutionTimeline
+from cycle_detection import capture
+
+@pytest.fixture
+def simulator() -> QuadrupleTuringMachineSimulator:
+    machine = QuintupleTuringMachineDefinition.parse(StringIO(
+        '4 2 3 7\n'
+        '1 2 3 4\n'
+        '0 1\n'
+        '0 1 B\n'
+        '(1,B)=(2,B,R)\n'
+        '(2,0)=(2,1,R)\n'
+        '(2,1)=(2,0,R)\n'
+        '(2,B)=(3,B,L)\n'
+        '(3,0)=(3,0,L)\n'
+        '(3,1)=(3,1,L)\n'
+        '(3,B)=(4,B,S)\n'
+    ))
+
+    simulator = QuadrupleTuringMachineSimulator(create_reversible_machine(machine))
+    simulator.tapes[0].overwrite(list('10101'), 1)
+
+    return simulator
+
+def expected_snapshots(simulator: QuadrupleTuringMachineSimulator):
+    snapshots = [capture(simulator)]
+
+    while simulator.step() is not None:
+        snapshots.append(capture(simulator))
+
+    return snapshots
+
+@pytest.mark.parametrize("keyframe_interval", [1, 4, 1024])
+def test_timeline_seek(simulator: QuadrupleTuringMachineSimulator, keyframe_interval: int) -> None:
+    timeline = ExecutionTimeline(simulator, keyframe_interval=keyframe_interval)
+    timeline.record()
+    snapshots = expected_snapshots(simulator)
+
+    assert timeline.halted
+    assert len(timeline) == len(snapshots)
+
+    for step in [0, 10, 3, len(snapshots) - 1, 5, 4, 6, 0, 20, 19]:
+        frame = timeline.seek(step)
+
+        assert frame.step == step
+        assert capture(frame) == snapshots[step]
+
+def test_timeline_transitions(simulator: QuadrupleTuringMachineSimulator) -> None:
+    timeline = ExecutionTimeline(simulator, keyframe_interval=4)
+    timeline.record()
+
+    assert timeline.seek(0).transition is None
+    assert timeline.seek(1).transition.source_state == simulator.definition.initial_state
+    assert timeline.seek(9).transition == timeline.deltas[8].transition
+    assert timeline.seek(8).transition == timeline.deltas[7].transition
+
+def test_timeline_records_incrementally(simulator: QuadrupleTuringMachineSimulator) -> None:
+    timeline = ExecutionTimeline(simulator)
+
+    assert timeline.record(10) == 10
+    assert len(timeline) == 11
+    assert not timeline.is_complete()
+
+    timeline.record()
+
+    assert timeline.halted
+    assert simulator.steps == 0
+
+def test_timeline_memory_budget(simulator: QuadrupleTuringMachineSimulator) -> None:
+    budget = ExecutionTimeline(simulator).cost + 10 * DELTA_BYTES
+    timeline = ExecutionTimeline(simulator, memory_budget=budget)
+    timeline.record()
+
+    assert timeline.truncated
+    assert not timeline.halted
+    assert timeline.cost >= budget
+    assert len(timeline) <= 11
+
+    with pytest.raises(IndexError):
+        timeline.seek(len(timeline))
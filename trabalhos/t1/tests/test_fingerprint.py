@@ -0,0 +1,150 @@
+import pytest
+import operator
+import time
+from collections import Counter
+from dataclasses import replace
+from io import StringIO
+
+import fingerprint
+
+from direction import Direction
+from fingerprint import encode, encode_multiset, fingerprint_definition
+from quintuple_turing_machine import QuintupleAct, QuintupleTransition, QuintupleTuringMachineDefinition
+from quadruple_turing_machine import QuadrupleAct, QuadrupleTransition, QuadrupleTuringMachineDefinition
+from benett_reversibility import create_reversible_machine
+from machine_generators import random_machine
+
+def create_definition(lines) -> QuintupleTuringMachineDefinition:
+    return QuintupleTuringMachineDefinition.parse(StringIO(
+        f'4 2 3 {len(lines)}\n'
+        '1 2 3 4\n'
+        '0 1\n'
+        '0 1 B\n' + ''.join(line + '\n' for line in lines)
+    ))
+
+@pytest.mark.parametrize("first, second", [
+    ('1', 1),
+    ('ab', ('a', 'b')),
+    (['a', 'b'], ['ab']),
+    (Direction.LEFT, -1),
+    (None, ''),
+])
+def test_encoding_is_unambiguous(first, second) -> None:
+    assert encode(first) != encode(second)
+
+def test_multiset_encoding_ignores_order() -> None:
+    assert encode_multiset(['a', 1, 'a']) == encode_multiset([1, 'a', 'a'])
+    assert encode_multiset(['a', 1, 'a']) != encode_multiset(['a', 1])
+
+def test_fingerprint_ignores_transition_order() -> None:
+    first = create_definition(['(1,B)=(2,B,R)', '(2,0)=(2,1,R)', '(2,B)=(4,B,S)'])
+    second = create_definition(['(2,B)=(4,B,S)', '(1,B)=(2,B,R)', '(2,0)=(2,1,R)'])
+    third = create_definition(['(1,B)=(2,B,R)', '(2,0)=(2,1,L)', '(2,B)=(4,B,S)'])
+
+    assert first.fingerprint() == second.fingerprint()
+    assert first.fingerprint() != third.fingerprint()
+    assert len({definition.fingerprint() for definition in (first, second, third)}) == 2
+
+def test_fingerprint_distinguishes_definition_kinds() -> None:
+    quintuple = QuintupleTuringMachineDefinition(1, ['B'], [], '1', ['2'])
+    quadruple = QuadrupleTuringMachineDefinition(1, ['B'], [], '1', ['2'])
+
+    assert fingerprint_definition(quintuple) != fingerprint_definition(quadruple)
+
+def test_fingerprint_follows_changes() -> None:
+    definition = create_definition(['(1,B)=(2,B,R)'])
+    fingerprint = definition.fingerprint()
+
+    definition.transitions.append(QuintupleTransition('2', '4', [QuintupleAct('B', 'B', Direction.STAY)]))
+    assert definition.fingerprint() != fingerprint
+
+    definition.transitions = definition.transitions[:1]
+    assert definition.fingerprint() == fingerprint
+
+    definition.final_states = ['3']
+    assert definition.fingerprint() != fingerprint
+
+    definition.final_states = ['4']
+    definition.transitions[0] = QuintupleTransition('1', '3', [QuintupleAct('B', 'B', Direction.RIGHT)])
+    assert definition.fingerprint() != fingerprint
+
+def test_equality_follows_in_place_changes() -> None:
+    lines = ['(1,B)=(2,B,R)', '(2,0)=(2,1,R)', '(2,B)=(4,B,S)']
+    first = create_definition(lines)
+    second = create_definition(lines)
+
+    assert first == second
+
+    second.transitions[0] = second.transitions[1]
+    assert first != second
+
+    second.transitions = list(first.transitions)
+    assert first == second
+
+    second.alphabet[0] = 'X'
+    assert first != second
+
+def test_definitions_are_unhashable() -> None:
+    with pytest.raises(TypeError):
+        hash(create_definition(['(1,B)=(2,B,R)']))
+
+def test_quadruple_fingerprint_distinguishes_acts() -> None:
+    def create(act: QuadrupleAct) -> QuadrupleTuringMachineDefinition:
+        return QuadrupleTuringMachineDefinition(1, ['B'], [QuadrupleTransition('1', '2', [act])], '1', ['2'])
+
+    assert create(QuadrupleAct.shift(Direction.STAY)) != create(QuadrupleAct.read_write('B', 'B'))
+    assert create(QuadrupleAct.shift(Direction.LEFT)) == create(QuadrupleAct.shift(Direction.LEFT))
+
+def test_fingerprint_encodes_unmarshallable_fields() -> None:
+    class Mark(str):
+        pass
+
+    def create(read: str, write: str) -> QuintupleTuringMachineDefinition:
+        return QuintupleTuringMachineDefinition(1, ['B'], [QuintupleTransition('1', '2', [QuintupleAct(read, write, Direction.RIGHT)])], '1', ['2'])
+
+    assert create(Mark('B'), 'B') == create(Mark('B'), 'B')
+    assert create(Mark('B'), 'B') != create(Mark('B'), '0')
+    assert create(1, 'B') != create(True, 'B')
+
+def test_warm_equality_does_not_rehash(monkeypatch: pytest.MonkeyPatch) -> None:
+    lines = ['(1,B)=(2,B,R)', '(2,0)=(2,1,R)', '(2,B)=(4,B,S)']
+    first = create_definition(lines)
+    second = create_definition(lines)
+
+    assert first == second
+
+    calls = []
+    monkeypatch.setattr(fingerprint, 'fingerprint_definition', lambda definition: calls.append(definition) or 'changed')
+
+    assert first == second
+    assert calls == []
+
+    first.alphabet[0] = 'X'
+
+    assert first != second
+    assert calls == [first]
+
+def test_cold_equality_is_no_slower_than_structural_comparison() -> None:
+    definition = create_reversible_machine(random_machine(1000, 2, seed=0))
+
+    def structural(first, second) -> bool:
+        return (
+            first.tapes == second.tapes and
+            Counter(first.alphabet) == Counter(second.alphabet) and
+            sorted(first.transitions) == sorted(second.transitions) and
+            first.initial_state == second.initial_state and
+            Counter(first.final_states) == Counter(second.final_states)
+        )
+
+    def best_time(compare) -> float:
+        times = []
+
+        for _ in range(5):
+            first, second = replace(definition), replace(definition)
+            start = time.perf_counter()
+            assert compare(first, second)
+            times.append(time.perf_counter() - start)
+
+        return min(times)
+
+    assert best_time(operator.eq) <= 1.5 * best_time(structural)
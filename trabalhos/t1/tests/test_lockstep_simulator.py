@@ -0,0 +1,148 @@
+import pytest
+
+pytest.importorskip('numpy')
+
+from io import StringIO
+from itertools import product
+
+import lockstep_simulator
+
+from direction import Direction
+from quintuple_turing_machine import QuintupleTuringMachineDefinition, QuintupleTuringMachineSimulator
+from quadruple_turing_machine import QuadrupleAct, QuadrupleTransition, QuadrupleTuringMachineDefinition, QuadrupleTuringMachineSimulator
+from benett_reversibility import create_reversible_machine
+from lockstep_simulator import LockstepMachine, LockstepSimulator, run_lockstep
+from run_result import HaltReason
+
+INPUTS = [''.join(marks) for length in range(6) for marks in product('01', repeat=length)]
+
+@pytest.fixture
+def definition() -> QuintupleTuringMachineDefinition:
+    return QuintupleTuringMachineDefinition.parse(StringIO(
+        '4 2 3 7\n'
+        '1 2 3 4\n'
+        '0 1\n'
+        '0 1 B\n'
+        '(1,B)=(2,B,R)\n'
+        '(2,0)=(2,1,R)\n'
+        '(2,1)=(2,0,R)\n'
+        '(2,B)=(3,B,L)\n'
+        '(3,0)=(3,0,L)\n'
+        '(3,1)=(3,1,L)\n'
+        '(3,B)=(4,B,S)\n'
+    ))
+
+def assert_same_result(simulator: LockstepSimulator, instance: int, expected_simulator) -> None:
+    result = simulator.results()[instance]
+
+    assert result.steps == expected_simulator.steps
+    assert result.final_state == expected_simulator.current_state
+    assert result.extents == [tape.extents() for tape in expected_simulator.tapes]
+
+    for i, tape in enumerate(expected_simulator.tapes):
+        assert simulator.head(instance, i) == tape.head
+        assert simulator.read_slice(instance, i, -4, 12) == tape.read_slice(-4, 12)
+
+def test_quintuple_machine_matches_simulator(definition: QuintupleTuringMachineDefinition) -> None:
+    simulator = LockstepSimulator(LockstepMachine.compile(definition), [list(input) for input in INPUTS])
+    results = simulator.run()
+
+    for instance, input in enumerate(INPUTS):
+        expected_simulator = QuintupleTuringMachineSimulator(definition)
+        expected_simulator.tapes[0].overwrite(list(input), 1)
+        expected = expected_simulator.run()
+
+        assert results[instance].reason == expected.reason
+        assert_same_result(simulator, instance, expected_simulator)
+
+def test_reversible_machine_matches_simulator(definition: QuintupleTuringMachineDefinition) -> None:
+    reversible_definition = create_reversible_machine(definition)
+    simulator = LockstepSimulator(LockstepMachine.compile(reversible_definition), [list(input) for input in INPUTS])
+    results = simulator.run()
+
+    for instance, input in enumerate(INPUTS):
+        expected_simulator = QuadrupleTuringMachineSimulator(reversible_definition)
+        expected_simulator.tapes[0].overwrite(list(input), 1)
+        expected = expected_simulator.run()
+
+        assert results[instance].reason == expected.reason
+        assert_same_result(simulator, instance, expected_simulator)
+
+def test_sorted_table_matches_dense_table(definition: QuintupleTuringMachineDefinition, monkeypatch) -> None:
+    reversible_definition = create_reversible_machine(definition)
+    dense = run_lockstep(reversible_definition, INPUTS)
+
+    monkeypatch.setattr(lockstep_simulator, 'DENSE_TABLE_LIMIT', 0)
+    machine = LockstepMachine.compile(reversible_definition)
+    assert all(table.dense is None for group in machine.groups for table in group.tables)
+
+    assert run_lockstep(reversible_definition, INPUTS) == dense
+
+@pytest.mark.parametrize("dense_limit", [1 << 22, 0])
+def test_staged_lookup_matches_single_lookup(definition: QuintupleTuringMachineDefinition, monkeypatch, dense_limit: int) -> None:
+    reversible_definition = create_reversible_machine(definition)
+    expected = run_lockstep(reversible_definition, INPUTS)
+    machine = LockstepMachine.compile(reversible_definition)
+
+    assert all(len(group.stages) == 1 for group in machine.groups)
+
+    # Too small for the Cartesian key space of even two tapes, so every tape gets its own stage.
+    limit = max(len(machine.states), len(reversible_definition.transitions)) * len(machine.marks) + 1
+    monkeypatch.setattr(lockstep_simulator, 'KEY_LIMIT', limit)
+    monkeypatch.setattr(lockstep_simulator, 'DENSE_TABLE_LIMIT', dense_limit)
+    machine = LockstepMachine.compile(reversible_definition)
+
+    assert all(len(group.stages) == reversible_definition.tapes for group in machine.groups)
+    assert len(machine.states) * len(machine.marks) ** reversible_definition.tapes >= limit
+    assert run_lockstep(reversible_definition, INPUTS) == expected
+
+def test_lowest_transition_wins_across_read_patterns() -> None:
+    definition = QuadrupleTuringMachineDefinition(
+        tapes=2,
+        alphabet=['0', '1'],
+        transitions=[
+            QuadrupleTransition('A', 'B', [QuadrupleAct.read_write('1', '0'), QuadrupleAct.shift(Direction.STAY)]),
+            QuadrupleTransition('A', 'C', [QuadrupleAct.shift(Direction.RIGHT), QuadrupleAct.read_write('B', '1')]),
+        ],
+        initial_state='A',
+        final_states=['B', 'C']
+    )
+
+    simulator = LockstepSimulator(LockstepMachine.compile(definition), [[], ['1']])
+    simulator.heads[0, 1] += 1
+    results = simulator.run()
+
+    assert [result.final_state for result in results] == ['C', 'B']
+    assert simulator.head(0, 0) == 1
+    assert simulator.read_slice(0, 1, 0, 1) == ['1']
+    assert simulator.read_slice(1, 0, 1, 2) == ['0']
+
+def test_run_lockstep_with_step_budgets(definition: QuintupleTuringMachineDefinition) -> None:
+    results = run_lockstep(definition, [('0110', 2), '0110', ('0110', None)], max_steps=3)
+
+    assert [result.result.reason for result in results] == [HaltReason.BUDGET, HaltReason.BUDGET, HaltReason.ACCEPTED]
+    assert [result.result.steps for result in results] == [2, 3, 11]
+    assert results[2].tapes == [['1', '0', '0', '1']]
+
+def test_tapes_grow_past_initial_capacity() -> None:
+    definition = QuintupleTuringMachineDefinition.parse(StringIO(
+        '2 2 3 2\n'
+        '1 2\n'
+        '0 1\n'
+        '0 1 B\n'
+        '(1,B)=(1,1,R)\n'
+        '(1,1)=(2,1,S)\n'
+    ))
+
+    simulator = LockstepSimulator(LockstepMachine.compile(definition), [[], ['1']], [40, None], capacity=4)
+    results = simulator.run()
+
+    assert results[0].reason == HaltReason.BUDGET
+    assert results[0].extents == [(0, 39)]
+    assert results[1].reason == HaltReason.ACCEPTED
+    assert simulator.head(0, 0) == 40
+    assert simulator.head(1, 0) == 1
+
+def test_input_outside_alphabet(definition: QuintupleTuringMachineDefinition) -> None:
+    with pytest.raises(ValueError):
+        LockstepSimulator(LockstepMachine.compile(definition), [['0', '2']])
@@ -0,0 +1,65 @@
+import pytest
+
+from quintuple_turing_machine import QuintupleTuringMachineSimulator
+from benett_reversibility import is_machine_reversible
+from machine_generators import (
+    binary_counter,
+    binary_counter_input,
+    busy_beaver,
+    random_input,
+    random_machine,
+    unary_adder,
+    unary_adder_input
+)
+from run_result import HaltReason
+
+def run(definition, input: str, max_steps=None):
+    simulator = QuintupleTuringMachineSimulator(definition)
+    simulator.tapes[0].overwrite(list(input), 1)
+    result = simulator.run(max_steps)
+    extents = simulator.tapes[0].extents()
+
+    return result, [] if extents is None else simulator.tapes[0].read_slice(extents[0], extents[1] + 1)
+
+def test_binary_counter_counts_until_overflow() -> None:
+    result, tape = run(binary_counter(), binary_counter_input(3))
+
+    assert is_machine_reversible(binary_counter())
+    assert result.reason == HaltReason.ACCEPTED
+    assert tape == ['0', '0', '0']
+    assert result.steps > 2 ** 3
+
+def test_unary_adder() -> None:
+    result, tape = run(unary_adder(), unary_adder_input(3, 4))
+
+    assert is_machine_reversible(unary_adder())
+    assert result.reason == HaltReason.ACCEPTED
+    assert tape == ['1'] * 7
+
+@pytest.mark.parametrize('states, ones', [(2, 4), (3, 6), (4, 13)])
+def test_busy_beaver_champions(states: int, ones: int) -> None:
+    definition = busy_beaver(states)
+    result, tape = run(definition, '')
+
+    assert is_machine_reversible(definition)
+    assert result.reason == HaltReason.ACCEPTED
+    assert tape.count('1') == ones
+
+def test_busy_beaver_without_champion() -> None:
+    with pytest.raises(ValueError):
+        busy_beaver(7)
+
+def test_random_machine_is_deterministic() -> None:
+    definition = random_machine(5, 4, seed=3)
+
+    assert definition == random_machine(5, 4, seed=3)
+    assert definition != random_machine(5, 4, seed=4)
+    assert is_machine_reversible(definition)
+    assert len(definition.alphabet) == 4
+    assert random_input(4, 10, seed=3) == random_input(4, 10, seed=3)
+    assert set(random_input(4, 10, seed=3)) <= {'0', '1', '2'}
+
+def test_random_machine_without_halting() -> None:
+    result, _ = run(random_machine(4, 3, seed=0, halt_probability=0), random_input(3, 8, seed=0), 1000)
+
+    assert result.reason == HaltReason.BUDGET
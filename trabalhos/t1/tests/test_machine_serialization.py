@@ -0,0 +1,123 @@
+import pytest
+from io import StringIO
+
+from direction import Direction
+from quintuple_turing_machine import QuintupleTuringMachineDefinition
+from quadruple_turing_machine import QuadrupleAct, QuadrupleTransition, QuadrupleTuringMachineDefinition
+from benett_reversibility import create_reversible_machine
+from compiled_turing_machine import CompiledQuadrupleTuringMachine, CompiledQuadrupleTuringMachineSimulator
+from machine_serialization import dump, dumps, dumps_compiled, load, loads, loads_compiled
+
+@pytest.fixture
+def quintuple_definition() -> QuintupleTuringMachineDefinition:
+    return QuintupleTuringMachineDefinition.parse(StringIO(
+        '4 2 3 7\n'
+        '1 2 3 4\n'
+        '0 1\n'
+        '0 1 B\n'
+        '(1,B)=(2,B,R)\n'
+        '(2,0)=(2,1,R)\n'
+        '(2,1)=(2,0,R)\n'
+        '(2,B)=(3,B,L)\n'
+        '(3,0)=(3,0,L)\n'
+        '(3,1)=(3,1,L)\n'
+        '(3,B)=(4,B,S)\n'
+    ))
+
+def test_quintuple_round_trip(quintuple_definition: QuintupleTuringMachineDefinition) -> None:
+    loaded = loads(dumps(quintuple_definition))
+
+    assert isinstance(loaded, QuintupleTuringMachineDefinition)
+    assert loaded == quintuple_definition
+    assert loaded.transitions == quintuple_definition.transitions
+
+def test_quadruple_round_trip(quintuple_definition: QuintupleTuringMachineDefinition) -> None:
+    definition = create_reversible_machine(quintuple_definition)
+    loaded = loads(memoryview(dumps(definition)))
+
+    assert isinstance(loaded, QuadrupleTuringMachineDefinition)
+    assert loaded == definition
+    assert loaded.transitions == definition.transitions
+
+def test_round_trip_with_unicode_and_integer_marks() -> None:
+    definition = QuadrupleTuringMachineDefinition(
+        tapes=2,
+        alphabet=['ç', 0, 12345678901],
+        transitions=[
+            QuadrupleTransition(
+                source_state='início',
+                destination_state='fim',
+                acts=[
+                    QuadrupleAct.read_write('ç', 12345678901),
+                    QuadrupleAct.shift(Direction.LEFT)
+                ]
+            )
+        ],
+        initial_state='início',
+        final_states=['fim']
+    )
+
+    assert loads(dumps(definition)).transitions == definition.transitions
+
+def test_load_from_file(tmp_path, quintuple_definition: QuintupleTuringMachineDefinition) -> None:
+    path = tmp_path / 'machine.tmd'
+
+    with open(path, 'wb') as file:
+        dump(quintuple_definition, file)
+
+    assert load(str(path)) == quintuple_definition
+
+@pytest.mark.parametrize("data, message", [
+    (b'XXXX' + bytes(28), 'Not a machine definition file'),
+    (b'TMDF\x02\x00' + bytes(26), 'Unsupported machine definition version: 2'),
+])
+def test_invalid_data(data: bytes, message: str) -> None:
+    with pytest.raises(ValueError) as error:
+        loads(data)
+
+    assert str(error.value) == message
+
+@pytest.mark.parametrize("fraction", [0.1, 0.5, 0.99])
+def test_load_truncated_file(tmp_path, quintuple_definition: QuintupleTuringMachineDefinition, fraction: float) -> None:
+    data = dumps(create_reversible_machine(quintuple_definition))
+    path = tmp_path / 'machine.tmd'
+    path.write_bytes(data[:int(len(data) * fraction)])
+
+    with pytest.raises(ValueError):
+        load(str(path))
+
+def test_load_corrupt_file(tmp_path, quintuple_definition: QuintupleTuringMachineDefinition) -> None:
+    data = bytearray(dumps(quintuple_definition))
+    data[-9:-5] = b'\xff\xff\xff\x7f'
+    path = tmp_path / 'machine.tmd'
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError):
+        load(str(path))
+
+def test_loads_compiled_truncated(quintuple_definition: QuintupleTuringMachineDefinition) -> None:
+    data = dumps_compiled(CompiledQuadrupleTuringMachine.compile(create_reversible_machine(quintuple_definition)))
+
+    with pytest.raises(ValueError):
+        loads_compiled(data[:len(data) // 2])
+
+def test_loads_compiled_without_copy(quintuple_definition: QuintupleTuringMachineDefinition) -> None:
+    definition = create_reversible_machine(quintuple_definition)
+    machine = CompiledQuadrupleTuringMachine.compile(definition)
+    buffer = bytearray(dumps_compiled(machine))
+
+    shared = loads_compiled(buffer, copy=False)
+
+    for name in ['sources', 'next_states', 'reads', 'writes', 'moves']:
+        values = getattr(shared, name)
+
+        assert isinstance(values, memoryview)
+        assert values.obj is buffer
+        assert list(values) == list(getattr(machine, name))
+
+    simulator = CompiledQuadrupleTuringMachineSimulator(shared)
+    simulator.tapes[0].write_slice(list('0110'), 1)
+    expected = CompiledQuadrupleTuringMachineSimulator(machine)
+    expected.tapes[0].write_slice(list('0110'), 1)
+
+    assert simulator.run() == expected.run()
@@ -0,0 +1,123 @@
+import pytest
+
+from io import StringIO
+
+from quintuple_turing_machine import QuintupleTuringMachineDefinition, QuintupleTuringMachineSimulator, QuintupleTransition
+from quadruple_turing_machine import QuadrupleTuringMachineSimulator
+from benett_reversibility import create_reversible_machine
+from macro_step import MacroStepSimulator
+from run_result import HaltReason
+
+@pytest.fixture
+def definition() -> QuintupleTuringMachineDefinition:
+    return QuintupleTuringMachineDefinition.parse(StringIO(
+        '8 2 5 23\n'
+        '1 2 3 4 5 6 7 8\n'
+        '0 1 \n'
+        '0 1 $ X B\n'
+        '(1,B)=(2,B,R)\n'
+        '(2,0)=(3,$,R)\n'
+        '(2,1)=(4,$,R)\n'
+        '(2,B)=(7,B,R)\n'
+        '(3,0)=(3,0,R)\n'
+        '(3,X)=(3,X,R)\n'
+        '(3,1)=(5,X,L)\n'
+        '(4,1)=(4,1,R)\n'
+        '(4,X)=(4,X,R)\n'
+        '(4,0)=(5,X,L)\n'
+        '(5,0)=(5,0,L)\n'
+        '(5,1)=(5,1,L)\n'
+        '(5,X)=(5,X,L)\n'
+        '(5,$)=(6,$,R)\n'
+        '(6,X)=(6,X,R)\n'
+        '(6,0)=(3,X,R)\n'
+        '(6,1)=(4,X,R)\n'
+        '(6,B)=(7,B,L)\n'
+        '(7,0)=(7,0,L)\n'
+        '(7,1)=(7,1,L)\n'
+        '(7,$)=(7,$,L)\n'
+        '(7,X)=(7,X,L)\n'
+        '(7,B)=(8,B,S)\n'
+    ))
+
+def create_simulators(definition: QuintupleTuringMachineDefinition, reversible: bool, input: str):
+    simulators = []
+
+    for _ in range(2):
+        if reversible:
+            simulator = QuadrupleTuringMachineSimulator(create_reversible_machine(definition))
+        else:
+            simulator = QuintupleTuringMachineSimulator(definition)
+
+        simulator.tapes[0].overwrite(list(input), 1)
+        simulators.append(simulator)
+
+    return simulators
+
+@pytest.mark.parametrize("reversible", [False, True])
+@pytest.mark.parametrize("input, width, max_steps", [
+    ('0011', 4, None),
+    ('0' * 20 + '1' * 20, 1, None),
+    ('0' * 20 + '1' * 20, 8, None),
+    ('0' * 20 + '1' * 19, 8, None),
+    ('0' * 20 + '1' * 20, 16, 777),
+    ('1' * 10 + '0' * 10, 5, 250)
+])
+def test_run_matches_plain_run(
+    definition: QuintupleTuringMachineDefinition,
+    reversible: bool,
+    input: str,
+    width: int,
+    max_steps: int) -> None:
+    simulator, macro_simulator = create_simulators(definition, reversible, input)
+
+    result = simulator.run(max_steps)
+    macro_result = MacroStepSimulator(macro_simulator, width).run(max_steps)
+
+    assert macro_result == result
+    assert macro_simulator.steps == simulator.steps
+    assert macro_simulator.current_state == simulator.current_state
+
+    for macro_tape, tape in zip(macro_simulator.tapes, simulator.tapes):
+        assert macro_tape.head == tape.head
+        assert macro_tape.read_slice(-width, len(input) + width) == tape.read_slice(-width, len(input) + width)
+
+def test_cache_statistics(definition: QuintupleTuringMachineDefinition) -> None:
+    _, simulator = create_simulators(definition, False, '0' * 30 + '1' * 30)
+    macro_simulator = MacroStepSimulator(simulator, 8)
+
+    assert macro_simulator.run().reason == HaltReason.ACCEPTED
+    statistics = macro_simulator.statistics
+
+    assert statistics.hits > 0
+    assert statistics.misses > 0
+    assert statistics.evictions == 0
+    assert statistics.hit_rate() == statistics.hits / (statistics.hits + statistics.misses)
+
+def test_cache_is_bounded(definition: QuintupleTuringMachineDefinition) -> None:
+    simulator, macro_simulator = create_simulators(definition, False, '0' * 30 + '1' * 30)
+    macro_step_simulator = MacroStepSimulator(macro_simulator, 8, cache_size=4)
+
+    assert macro_step_simulator.run() == simulator.run()
+    assert len(macro_step_simulator.cache) == 4
+    assert macro_step_simulator.statistics.evictions > 0
+
+def test_invalid_width(definition: QuintupleTuringMachineDefinition) -> None:
+    with pytest.raises(ValueError):
+        MacroStepSimulator(QuintupleTuringMachineSimulator(definition), 0)
+
+def test_cache_follows_definition_changes(definition: QuintupleTuringMachineDefinition) -> None:
+    simulator, macro_simulator = create_simulators(definition, False, '0' * 20 + '1' * 20)
+    macro_step_simulator = MacroStepSimulator(macro_simulator, 8)
+
+    assert macro_step_simulator.run(100) == simulator.run(100)
+
+    position = next(i for i, t in enumerate(definition.transitions) if t == QuintupleTransition.parse('(3,0)=(3,0,R)'))
+    definition.transitions[position] = QuintupleTransition.parse('(3,0)=(3,X,R)')
+
+    assert macro_step_simulator.run(2000) == simulator.run(2000)
+    assert macro_simulator.current_state == simulator.current_state
+
+    for macro_tape, tape in zip(macro_simulator.tapes, simulator.tapes):
+        assert macro_tape.head == tape.head
+        assert macro_tape.read_slice(-8, 48) == tape.read_slice(-8, 48)
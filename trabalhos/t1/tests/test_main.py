@@ -0,0 +1,93 @@
+import subprocess
+import sys
+from io import StringIO
+from pathlib import Path
+
+from quintuple_turing_machine import QuintupleTuringMachineDefinition
+from quadruple_turing_machine import QuadrupleTuringMachineSimulator
+from benett_reversibility import create_reversible_machine
+from main import BUDGET_EXIT_STATUS, HEADLESS_MAX_STEPS, format_tape, parse_arguments, run_headless
+from run_result import HaltReason
+from tape import Tape
+
+def test_parse_arguments() -> None:
+    assert parse_arguments([]).headless == False
+    assert parse_arguments(['--headless', '--max-steps', '10']).max_steps == 10
+
+def test_format_tape() -> None:
+    tape = Tape()
+    assert format_tape(tape) == '[B]'
+
+    tape.overwrite(['0', 1, '1'], 1)
+    tape.head = 2
+    assert format_tape(tape) == '0 [#1] 1'
+
+def test_run_headless(capsys) -> None:
+    machine = QuintupleTuringMachineDefinition.parse(StringIO(
+        '4 2 3 7\n'
+        '1 2 3 4\n'
+        '0 1\n'
+        '0 1 B\n'
+        '(1,B)=(2,B,R)\n'
+        '(2,0)=(2,1,R)\n'
+        '(2,1)=(2,0,R)\n'
+        '(2,B)=(3,B,L)\n'
+        '(3,0)=(3,0,L)\n'
+        '(3,1)=(3,1,L)\n'
+        '(3,B)=(4,B,S)\n'
+    ))
+
+    simulator = QuadrupleTuringMachineSimulator(create_reversible_machine(machine))
+    simulator.tapes[0].overwrite(list('10'), 1)
+
+    assert run_headless(simulator).reason == HaltReason.ACCEPTED
+
+    assert capsys.readouterr().out.splitlines() == [
+        f'result: accepted in state C1 after {simulator.steps} steps',
+        'state: C1',
+        f'steps: {simulator.steps}',
+        'working tape: [B] 1 0',
+        'history tape: [B]',
+        'output tape: [B] 0 1',
+    ]
+
+def test_main_does_not_import_gui() -> None:
+    result = subprocess.run(
+        [sys.executable, '-c', 'import sys, main; print("pygame" in sys.modules)'],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).parent.parent / 'src'
+    )
+
+    assert result.stdout.strip() == 'False'
+
+DIVERGENT_MACHINE = (
+    '4 1 2 3\n'
+    '1 2 3 4\n'
+    '0\n'
+    '0 B\n'
+    '(1,B)=(2,B,R)\n'
+    '(2,B)=(2,0,R)\n'
+    '(3,B)=(4,B,S)\n'
+)
+
+def test_run_headless_is_bounded_by_default(capsys) -> None:
+    simulator = QuadrupleTuringMachineSimulator(
+        create_reversible_machine(QuintupleTuringMachineDefinition.parse(StringIO(DIVERGENT_MACHINE)))
+    )
+
+    assert run_headless.__defaults__ == (HEADLESS_MAX_STEPS,)
+    assert run_headless(simulator, 100).reason == HaltReason.BUDGET
+    assert capsys.readouterr().out.splitlines()[2] == 'steps: 100'
+
+def test_headless_budget_exit_status() -> None:
+    result = subprocess.run(
+        [sys.executable, 'main.py', '--headless', '--max-steps', '100'],
+        input=DIVERGENT_MACHINE + '\n',
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).parent.parent / 'src'
+    )
+
+    assert result.returncode == BUDGET_EXIT_STATUS
+    assert 'exhausting the budget of 100 steps' in result.stdout
@@ -1,8 +1,13 @@
 import pytest
+from io import StringIO
+from dataclasses import FrozenInstanceError
 from typing import List, Dict, Any
 
 from quadruple_turing_machine import QuadrupleTransition, QuadrupleAct, QuadrupleTuringMachineDefinition, QuadrupleTuringMachineSimulator
 from direction import Direction
+from array_tape import ArrayTape
+from run_length_tape import RunLengthTape
+from run_result import HaltReason
 
 @pytest.fixture
 def definition():
@@ -239,6 +244,18 @@ def test_definition_code_representation(definition: QuadrupleTuringMachineDefini
         ")"
     )
 
+def test_definition_write_code(definition: QuadrupleTuringMachineDefinition) -> None:
+    stream = StringIO()
+    definition.write_code(stream)
+
+    assert stream.getvalue() == definition.to_code()
+
+def test_transition_write_code_with_indent(definition: QuadrupleTuringMachineDefinition) -> None:
+    stream = StringIO()
+    definition.transitions[0].write_code(stream, '  ')
+
+    assert stream.getvalue().splitlines() == ['  ' + line for line in definition.transitions[0].to_code().splitlines()]
+
 def test_definition_equality(definition: QuadrupleTuringMachineDefinition) -> None:
     definition2 = QuadrupleTuringMachineDefinition(
         tapes=2,
@@ -299,6 +316,42 @@ def test_definition_equality(definition: QuadrupleTuringMachineDefinition) -> No
 
     assert definition == definition2
     
+def test_definition_transition_index_follows_changes(definition: QuadrupleTuringMachineDefinition) -> None:
+    assert definition.find_matching_transition("4", ["0", "0"]) == None
+
+    transition = QuadrupleTransition(
+        source_state="4",
+        destination_state="5",
+        acts=[
+            QuadrupleAct.read_write("0", "1"),
+            QuadrupleAct.shift(Direction.STAY)
+        ]
+    )
+
+    definition.transitions.append(transition)
+    assert definition.find_matching_transition("4", ["0", "0"]) == transition
+
+    definition.transitions = definition.transitions[:1]
+    assert definition.find_matching_transition("4", ["0", "0"]) == None
+    assert definition.find_matching_transition("1", ["1", "0"]) == definition.transitions[0]
+
+    definition.transitions[0] = transition
+    assert definition.find_matching_transition("1", ["1", "0"]) == None
+    assert definition.find_matching_transition("4", ["0", "0"]) == transition
+
+    del definition.transitions[0]
+    assert definition.find_matching_transition("4", ["0", "0"]) == None
+
+def test_definition_transitions_are_frozen(definition: QuadrupleTuringMachineDefinition) -> None:
+    with pytest.raises(FrozenInstanceError):
+        definition.transitions[0].destination_state = "5"
+
+    with pytest.raises(FrozenInstanceError):
+        definition.transitions[0].acts[0].write = "1"
+
+    with pytest.raises(TypeError):
+        definition.transitions[0].acts[0] = QuadrupleAct.read_write("0", "1")
+
 @pytest.mark.parametrize("transitions, inputs, outputs, heads, final_state, accepted, rejected, halted", [
     (
         [0, 4, 2, 4, 0, 4, 1, 4, 3, 5, None],
@@ -384,3 +437,182 @@ def test_simulator_execution(
     
     for i, head in enumerate(heads):
         assert simulator.tapes[i].head == head
+
+
+def test_simulator_with_array_tapes(definition: QuadrupleTuringMachineDefinition) -> None:
+    simulator = QuadrupleTuringMachineSimulator(definition, ArrayTape)
+
+    simulator.tapes[0].overwrite(["0", "1", "1", "0"])
+    simulator.tapes[1].overwrite(["0", "1", "0", "1"])
+
+    while simulator.step() is not None:
+        pass
+
+    assert simulator.has_accepted()
+    assert simulator.tapes[0].read_slice(0, 4) == ["0", "0", "1", "1"]
+    assert simulator.tapes[1].read_slice(0, 4) == ["0", "1", "0", "1"]
+    assert [tape.head for tape in simulator.tapes] == [3, 3]
+
+@pytest.mark.parametrize("inputs, max_steps, reason, steps, final_state, extents", [
+    (
+        [["0", "1", "1", "0"], ["0", "1", "0", "1"]],
+        None,
+        HaltReason.ACCEPTED,
+        10,
+        "4",
+        [(0, 3), (0, 3)]
+    ),
+    (
+        [["0", "1", "1", "0"], ["0", "1", "0", "1"]],
+        4,
+        HaltReason.BUDGET,
+        4,
+        "1",
+        [(0, 3), (0, 3)]
+    ),
+    (
+        [["0", "X", "1", "0"], ["0", "1", "0", "1"]],
+        None,
+        HaltReason.REJECTED,
+        2,
+        "1",
+        [(0, 3), (0, 3)]
+    ),
+    (
+        [[], []],
+        None,
+        HaltReason.ACCEPTED,
+        2,
+        "4",
+        None
+    )
+])
+def test_simulator_run(
+    definition: QuadrupleTuringMachineDefinition,
+    inputs: List[List[Any]],
+    max_steps: int,
+    reason: HaltReason,
+    steps: int,
+    final_state: str,
+    extents: List[Any]) -> None:
+    simulator = QuadrupleTuringMachineSimulator(definition)
+
+    for tape, content in zip(simulator.tapes, inputs):
+        tape.overwrite(content)
+
+    result = simulator.run(max_steps)
+
+    assert result.reason == reason
+    assert result.steps == steps
+    assert result.final_state == final_state
+    assert result.extents == (extents if extents is not None else [None, None])
+    assert simulator.steps == steps
+
+def test_simulator_run_until(definition: QuadrupleTuringMachineDefinition) -> None:
+    simulator = QuadrupleTuringMachineSimulator(definition)
+    simulator.tapes[0].overwrite(["0", "1", "1", "0"])
+    simulator.tapes[1].overwrite(["0", "1", "0", "1"])
+
+    result = simulator.run(until=lambda s: s.tapes[0].head == 2)
+
+    assert result.reason == HaltReason.INTERRUPTED
+    assert result.steps == 4
+    assert result.has_halted() == False
+
+def test_accelerated_run_skips_fixed_point_loops() -> None:
+    definition = QuadrupleTuringMachineDefinition(
+        tapes=2,
+        alphabet=["0"],
+        transitions=[
+            QuadrupleTransition(
+                source_state="1",
+                destination_state="1",
+                acts=[
+                    QuadrupleAct.read_write("0", "0"),
+                    QuadrupleAct.shift(Direction.LEFT)
+                ]
+            )
+        ],
+        initial_state="1",
+        final_states=["2"]
+    )
+
+    simulator = QuadrupleTuringMachineSimulator(definition, RunLengthTape, accelerate=True)
+    simulator.tapes[0].write("0")
+
+    assert simulator.run().reason == HaltReason.DIVERGED
+
+    result = simulator.run(10 ** 9)
+
+    assert result.reason == HaltReason.BUDGET
+    assert result.steps == 10 ** 9
+    assert simulator.tapes[0].head == 0
+    assert simulator.tapes[1].head == -10 ** 9
+
+    result = simulator.run(10 ** 9, until=lambda s: s.tapes[1].head == -10 ** 9 - 5)
+
+    assert result.reason == HaltReason.INTERRUPTED
+    assert result.steps == 5
+
+    with pytest.raises(ValueError):
+        QuadrupleTuringMachineSimulator(definition, ArrayTape, accelerate=True)
+
+def test_simulator_step_backward_undoes_step(definition: QuadrupleTuringMachineDefinition) -> None:
+    simulator = QuadrupleTuringMachineSimulator(definition)
+    simulator.tapes[0].overwrite(["0", "1", "1", "0"])
+    simulator.tapes[1].overwrite(["0", "1", "0", "1"])
+
+    transition = simulator.step()
+
+    assert simulator.step_backward() == transition
+    assert simulator.current_state == definition.initial_state
+    assert simulator.steps == 0
+    assert [tape.head for tape in simulator.tapes] == [0, 0]
+    assert simulator.tapes[0].read_slice(0, 4) == ["0", "1", "1", "0"]
+    assert simulator.tapes[1].read_slice(0, 4) == ["0", "1", "0", "1"]
+
+def test_simulator_step_backward_rejects_ambiguous_predecessors() -> None:
+    definition = QuadrupleTuringMachineDefinition(
+        tapes=1,
+        alphabet=["0", "1"],
+        transitions=[
+            QuadrupleTransition(
+                source_state="1",
+                destination_state="2",
+                acts=[QuadrupleAct.read_write("0", "1")]
+            ),
+            QuadrupleTransition(
+                source_state="1",
+                destination_state="2",
+                acts=[QuadrupleAct.read_write("1", "1")]
+            )
+        ],
+        initial_state="1",
+        final_states=["2"]
+    )
+
+    simulator = QuadrupleTuringMachineSimulator(definition)
+    simulator.tapes[0].write("0")
+    simulator.step()
+
+    with pytest.raises(ValueError):
+        simulator.step_backward()
+
+def test_simulator_run_backward(definition: QuadrupleTuringMachineDefinition) -> None:
+    simulator = QuadrupleTuringMachineSimulator(definition)
+    simulator.tapes[0].overwrite(["0", "1", "1", "0"])
+    simulator.tapes[1].overwrite(["0", "1", "0", "1"])
+
+    simulator.run(4)
+    result = simulator.run_backward(3)
+
+    assert result.reason == HaltReason.BUDGET
+    assert result.steps == 3
+    assert simulator.steps == 1
+
+    result = simulator.run_backward(until=lambda s: s.steps == 0)
+
+    assert result.reason == HaltReason.INTERRUPTED
+    assert result.steps == 1
+    assert result.final_state == definition.initial_state
+    assert simulator.tapes[0].read_slice(0, 4) == ["0", "1", "1", "0"]
@@ -4,8 +4,26 @@ from io import StringIO
 from collections import Counter
 
 from direction import Direction
-from quintuple_turing_machine import QuintupleAct, QuintupleTransition, QuintupleTuringMachineDefinition
+from quintuple_turing_machine import QuintupleAct, QuintupleTransition, QuintupleTuringMachineDefinition, QuintupleTuringMachineSimulator
+from run_result import HaltReason
+from run_length_tape import RunLengthTape
     
+@pytest.fixture
+def definition() -> QuintupleTuringMachineDefinition:
+    return QuintupleTuringMachineDefinition.parse(StringIO(
+        '4 2 3 7\n'
+        '1 2 3 4\n'
+        '0 1\n'
+        '0 1 B\n'
+        '(1,B)=(2,B,R)\n'
+        '(2,0)=(2,1,R)\n'
+        '(2,1)=(2,0,R)\n'
+        '(2,B)=(3,B,L)\n'
+        '(3,0)=(3,0,L)\n'
+        '(3,1)=(3,1,L)\n'
+        '(3,B)=(4,B,S)\n'
+    ))
+
 @pytest.mark.parametrize("act, expected_code", [
     (QuintupleAct('a', 'b', Direction.LEFT), "QuintupleAct('a', 'b', Direction.LEFT)"),
     (QuintupleAct('B', 'B', Direction.STAY), "QuintupleAct('B', 'B', Direction.STAY)"),
@@ -326,4 +344,191 @@ def test_definition_code_representation() -> None:
         "    initial_state='1',\n"
         "    final_states=['3']\n"
         ")"
-    )
\ No newline at end of file
+    )
+
+@pytest.mark.parametrize("current_state, data, expected_transition", [
+    ('2', ['0'], QuintupleTransition('2', '2', [QuintupleAct('0', '1', Direction.RIGHT)])),
+    ('2', ['B'], QuintupleTransition('2', '3', [QuintupleAct('B', 'B', Direction.LEFT)])),
+    ('3', ['1'], QuintupleTransition('3', '3', [QuintupleAct('1', '1', Direction.LEFT)])),
+    ('1', ['0'], None),
+    ('4', ['B'], None)
+])
+def test_definition_transition_matching(
+    definition: QuintupleTuringMachineDefinition,
+    current_state: str,
+    data: list,
+    expected_transition: QuintupleTransition) -> None:
+    assert definition.find_matching_transition(current_state, data) == expected_transition
+
+def test_simulator_execution(definition: QuintupleTuringMachineDefinition) -> None:
+    simulator = QuintupleTuringMachineSimulator(definition)
+    simulator.tapes[0].overwrite(list('1100'), 1)
+
+    assert simulator.step() == definition.transitions[0]
+    assert simulator.step() == definition.transitions[2]
+    assert simulator.current_state == '2'
+    assert simulator.tapes[0].head == 2
+    assert simulator.tapes[0].read_slice(0, 6) == ['B', '0', '1', '0', '0', 'B']
+
+    while simulator.step() is not None:
+        pass
+
+    assert simulator.steps == 11
+    assert simulator.has_accepted()
+    assert simulator.has_halted()
+    assert not simulator.has_rejected()
+    assert simulator.tapes[0].head == 0
+    assert simulator.tapes[0].read_slice(0, 6) == ['B', '0', '0', '1', '1', 'B']
+
+@pytest.mark.parametrize("input, max_steps, reason, steps, final_state", [
+    ('1100', None, HaltReason.ACCEPTED, 11, '4'),
+    ('', None, HaltReason.ACCEPTED, 3, '4'),
+    ('1100', 5, HaltReason.BUDGET, 5, '2'),
+    ('1X00', None, HaltReason.REJECTED, 2, '2')
+])
+def test_simulator_run(
+    definition: QuintupleTuringMachineDefinition,
+    input: str,
+    max_steps: int,
+    reason: HaltReason,
+    steps: int,
+    final_state: str) -> None:
+    simulator = QuintupleTuringMachineSimulator(definition)
+    simulator.tapes[0].overwrite(list(input), 1)
+
+    result = simulator.run(max_steps)
+
+    assert result.reason == reason
+    assert result.steps == steps
+    assert result.final_state == final_state
+
+@pytest.fixture
+def sweeping_definition() -> QuintupleTuringMachineDefinition:
+    return QuintupleTuringMachineDefinition.parse(StringIO(
+        '8 2 5 23\n'
+        '1 2 3 4 5 6 7 8\n'
+        '0 1 \n'
+        '0 1 $ X B\n'
+        '(1,B)=(2,B,R)\n'
+        '(2,0)=(3,$,R)\n'
+        '(2,1)=(4,$,R)\n'
+        '(2,B)=(7,B,R)\n'
+        '(3,0)=(3,0,R)\n'
+        '(3,X)=(3,X,R)\n'
+        '(3,1)=(5,X,L)\n'
+        '(4,1)=(4,1,R)\n'
+        '(4,X)=(4,X,R)\n'
+        '(4,0)=(5,X,L)\n'
+        '(5,0)=(5,0,L)\n'
+        '(5,1)=(5,1,L)\n'
+        '(5,X)=(5,X,L)\n'
+        '(5,$)=(6,$,R)\n'
+        '(6,X)=(6,X,R)\n'
+        '(6,0)=(3,X,R)\n'
+        '(6,1)=(4,X,R)\n'
+        '(6,B)=(7,B,L)\n'
+        '(7,0)=(7,0,L)\n'
+        '(7,1)=(7,1,L)\n'
+        '(7,$)=(7,$,L)\n'
+        '(7,X)=(7,X,L)\n'
+        '(7,B)=(8,B,S)\n'
+    ))
+
+def test_transition_sweep_detection(sweeping_definition: QuintupleTuringMachineDefinition) -> None:
+    sweeps = [str(t.source_state) + str(t.acts[0].read) for t in sweeping_definition.transitions if t.is_sweep()]
+
+    assert sweeps == ['30', '3X', '41', '4X', '50', '51', '5X', '6X', '70', '71', '7$', '7X']
+
+@pytest.mark.parametrize("input, max_steps", [
+    ('0011', None),
+    ('0' * 40 + '1' * 40, None),
+    ('0' * 40 + '1' * 39, None),
+    ('0' * 40 + '1' * 40, 1000),
+    ('1' * 30 + '0' * 30, 1234)
+])
+def test_accelerated_run_matches_plain_run(
+    sweeping_definition: QuintupleTuringMachineDefinition,
+    input: str,
+    max_steps: int) -> None:
+    simulator = QuintupleTuringMachineSimulator(sweeping_definition)
+    simulator.tapes[0].overwrite(list(input), 1)
+    result = simulator.run(max_steps)
+
+    accelerated_simulator = QuintupleTuringMachineSimulator(sweeping_definition, RunLengthTape, accelerate=True)
+    accelerated_simulator.tapes[0].overwrite(list(input), 1)
+    accelerated_result = accelerated_simulator.run(max_steps)
+
+    assert accelerated_result == result
+    assert accelerated_simulator.steps == simulator.steps
+    assert accelerated_simulator.current_state == simulator.current_state
+    assert accelerated_simulator.tapes[0].head == simulator.tapes[0].head
+    assert accelerated_simulator.tapes[0].read_slice(-1, len(input) + 2) == simulator.tapes[0].read_slice(-1, len(input) + 2)
+
+def test_accelerated_run_detects_divergence() -> None:
+    definition = QuintupleTuringMachineDefinition(
+        tapes=1,
+        alphabet=['0', 'B'],
+        transitions=[
+            QuintupleTransition('1', '1', [QuintupleAct('0', '0', Direction.RIGHT)]),
+            QuintupleTransition('1', '1', [QuintupleAct('B', 'B', Direction.RIGHT)])
+        ],
+        initial_state='1',
+        final_states=['2']
+    )
+
+    simulator = QuintupleTuringMachineSimulator(definition, RunLengthTape, accelerate=True)
+    simulator.tapes[0].overwrite(['0'] * 10)
+
+    result = simulator.run()
+
+    assert result.reason == HaltReason.DIVERGED
+    assert result.steps == 10
+
+    result = simulator.run(10 ** 9)
+
+    assert result.reason == HaltReason.BUDGET
+    assert result.steps == 10 ** 9
+    assert simulator.tapes[0].head == 10 ** 9 + 10
+
+    result = simulator.run(10 ** 9, until=lambda s: s.tapes[0].head == 10 ** 9 + 13)
+
+    assert result.reason == HaltReason.INTERRUPTED
+    assert result.steps == 3
+
+def test_acceleration_requires_run_length_tapes(definition: QuintupleTuringMachineDefinition) -> None:
+    with pytest.raises(ValueError):
+        QuintupleTuringMachineSimulator(definition, accelerate=True)
+
+def test_definition_parse_keeps_multi_character_final_state() -> None:
+    definition = QuintupleTuringMachineDefinition.parse(StringIO(
+        '12 1 2 1\n'
+        '1 2 3 4 5 6 7 8 9 10 11 12\n'
+        '0\n'
+        '0 B\n'
+        '(1,0)=(12,0,R)\n'
+    ))
+
+    assert definition.initial_state == '1'
+    assert definition.final_states == ['12']
+
+@pytest.mark.parametrize("text, message", [
+    ('', 'Line 1: Missing size parameters'),
+    ('1 1 2\n', 'Line 1: Invalid size parameters: 1 1 2'),
+    ('2 1 2 1\n1\n', 'Line 2: Expected 2 states, found 1'),
+    ('1 2 2 1\n1\n0\n', 'Line 3: Expected 2 input symbols, found 1'),
+    ('1 1 2 1\n1\n0\n', 'Line 4: Missing tape symbols'),
+    ('1 1 2 2\n1\n0\n0 B\n(1,0)=(1,0,R)\n(1,B)=(1,B,X)\n', 'Line 6: Invalid quintuple format: (1,B)=(1,B,X)'),
+    ('1 1 2 3\n1\n0\n0 B\n(1,0)=(1,0,R)\n', 'Line 6: Expected 3 transitions, found 1'),
+])
+def test_definition_parse_errors(text: str, message: str) -> None:
+    with pytest.raises(ValueError) as error:
+        QuintupleTuringMachineDefinition.parse(StringIO(text))
+
+    assert str(error.value) == message
+
+def test_definition_write_code(definition: QuintupleTuringMachineDefinition) -> None:
+    stream = StringIO()
+    definition.write_code(stream)
+
+    assert stream.getvalue() == definition.to_code()
+    assert ''.join(definition.transitions[0].iter_code()) == definition.transitions[0].to_code()
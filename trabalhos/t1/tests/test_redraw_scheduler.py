@@ -0,0 +1,37 @@
+import pygame
+
+from gui.redraw_scheduler import RedrawScheduler
+
+def test_redraw_only_changed_regions() -> None:
+    screen = pygame.Surface((100, 100))
+    values = {'a': 0, 'b': 0}
+    drawn = []
+
+    scheduler = RedrawScheduler((255, 255, 255))
+    scheduler.add(pygame.Rect(0, 0, 50, 50), lambda: values['a'], lambda: drawn.append('a'))
+    scheduler.add(pygame.Rect(50, 50, 50, 50), lambda: values['b'], lambda: drawn.append('b'))
+
+    assert scheduler.redraw(screen) == [pygame.Rect(0, 0, 50, 50), pygame.Rect(50, 50, 50, 50)]
+    assert scheduler.redraw(screen) == []
+
+    values['b'] = 1
+
+    assert scheduler.redraw(screen) == [pygame.Rect(50, 50, 50, 50)]
+    assert drawn == ['a', 'b', 'b']
+
+    scheduler.invalidate()
+
+    assert len(scheduler.redraw(screen)) == 2
+    assert drawn == ['a', 'b', 'b', 'a', 'b']
+
+def test_redraw_clips_to_region() -> None:
+    screen = pygame.Surface((100, 100))
+    screen.fill((0, 0, 0))
+
+    scheduler = RedrawScheduler((255, 255, 255))
+    scheduler.add(pygame.Rect(0, 0, 50, 50), lambda: None, lambda: screen.fill((255, 0, 0)))
+    scheduler.redraw(screen)
+
+    assert screen.get_at((10, 10))[:3] == (255, 0, 0)
+    assert screen.get_at((75, 75))[:3] == (0, 0, 0)
+    assert screen.get_clip() == screen.get_rect()
@@ -0,0 +1,94 @@
+import pytest
+
+from dataclasses import replace
+from io import StringIO
+
+from quintuple_turing_machine import QuintupleTuringMachineDefinition
+from quadruple_turing_machine import QuadrupleAct, QuadrupleTuringMachineDefinition
+from benett_reversibility import create_reversible_machine
+from reversibility_verification import DEFAULT_MAX_STEPS, InputChecker, count_inputs, decode_input, iter_blocks, verify_reversible_machine
+
+@pytest.fixture
+def definition() -> QuintupleTuringMachineDefinition:
+    return QuintupleTuringMachineDefinition.parse(StringIO(
+        '4 2 3 7\n'
+        '1 2 3 4\n'
+        '0 1\n'
+        '0 1 B\n'
+        '(1,B)=(2,B,R)\n'
+        '(2,0)=(2,1,R)\n'
+        '(2,1)=(2,0,R)\n'
+        '(2,B)=(3,B,L)\n'
+        '(3,0)=(3,0,L)\n'
+        '(3,1)=(3,1,L)\n'
+        '(3,B)=(4,B,S)\n'
+    ))
+
+def create_broken_machine(definition: QuintupleTuringMachineDefinition) -> QuadrupleTuringMachineDefinition:
+    reversible_definition = create_reversible_machine(definition)
+
+    for i, transition in enumerate(reversible_definition.transitions):
+        if transition.source_state == 'B1' and transition.acts[0] == QuadrupleAct.read_write('0', '0'):
+            acts = transition.acts[:2] + (QuadrupleAct.read_write('B', '1'),)
+            reversible_definition.transitions[i] = replace(transition, acts=acts)
+
+    return reversible_definition
+
+def test_inputs_are_enumerated_shortest_first() -> None:
+    blocks = list(iter_blocks('01', 2, 3))
+    inputs = [decode_input('01', length, index) for length, start, count in blocks for index in range(start, start + count)]
+
+    assert blocks == [(0, 0, 1), (1, 0, 2), (2, 0, 3), (2, 3, 1)]
+    assert inputs == ['', '0', '1', '00', '01', '10', '11']
+    assert count_inputs('01', 2) == len(inputs)
+
+def test_correct_conversion_passes(definition: QuintupleTuringMachineDefinition) -> None:
+    report = verify_reversible_machine(definition, '01', 6, processes=2, block_size=8)
+
+    assert report.has_passed()
+    assert report.checked == count_inputs('01', 6)
+    assert report.skipped == 0
+
+def test_broken_conversion_reports_minimal_counterexample(definition: QuintupleTuringMachineDefinition) -> None:
+    broken_definition = create_broken_machine(definition)
+    report = verify_reversible_machine(definition, '01', 8, reversible_definition=broken_definition, processes=2, block_size=2)
+
+    checker = InputChecker(definition, broken_definition)
+    expected = next(
+        input
+        for length, start, count in iter_blocks('01', 8, 1)
+        for input in [decode_input('01', length, start)]
+        if checker.check(input)[1] is not None
+    )
+
+    assert not report.has_passed()
+    assert report.counterexample.input == expected == '1'
+    assert report.checked < count_inputs('01', 8)
+
+def test_inputs_without_halting_are_skipped() -> None:
+    definition = QuintupleTuringMachineDefinition.parse(StringIO(
+        '4 1 2 4\n'
+        '1 2 4 3\n'
+        '0\n'
+        '0 B\n'
+        '(1,B)=(2,B,R)\n'
+        '(2,0)=(2,0,R)\n'
+        '(2,B)=(2,B,R)\n'
+        '(4,B)=(3,B,S)\n'
+    ))
+
+    report = verify_reversible_machine(definition, '0', 3, max_steps=50, processes=1)
+
+    assert report.has_passed()
+    assert report.checked == 0
+    assert report.skipped == 4
+
+def test_blank_in_alphabet(definition: QuintupleTuringMachineDefinition) -> None:
+    with pytest.raises(ValueError):
+        verify_reversible_machine(definition, '0B', 2)
+
+def test_step_budget_is_finite_by_default(definition: QuintupleTuringMachineDefinition) -> None:
+    assert InputChecker(definition, create_reversible_machine(definition)).max_steps == DEFAULT_MAX_STEPS
+
+    with pytest.raises(ValueError):
+        verify_reversible_machine(definition, '01', 2, max_steps=None)
@@ -0,0 +1,84 @@
+import pytest
+
+from run_length_tape import RunLengthTape
+from direction import Direction
+
+@pytest.fixture
+def tape() -> RunLengthTape:
+    return RunLengthTape()
+
+def test_defaults(tape: RunLengthTape) -> None:
+    assert tape.head == 0
+    assert tape.read() == "B"
+    assert tape.extents() == None
+
+def test_overwrite(tape: RunLengthTape) -> None:
+    tape.write("X")
+    tape.overwrite(["0", "0", "0", "1", "1", "B", "0"], 3)
+
+    assert tape.read() == "B"
+    assert tape.read_slice(2, 11) == ["B", "0", "0", "0", "1", "1", "B", "0", "B"]
+    assert tape.starts == [3, 6, 9]
+    assert tape.ends == [6, 8, 10]
+    assert tape.marks == ["0", "1", "0"]
+    assert tape.extents() == (3, 9)
+
+def test_write_splits_and_merges_runs(tape: RunLengthTape) -> None:
+    tape.overwrite(["0"] * 5)
+    tape.head = 2
+
+    tape.write("1")
+    assert tape.marks == ["0", "1", "0"]
+    assert tape.read_slice(0, 5) == ["0", "0", "1", "0", "0"]
+
+    tape.write("0")
+    assert tape.marks == ["0"]
+    assert tape.starts == [0]
+    assert tape.ends == [5]
+
+    tape.write("B")
+    assert tape.read_slice(0, 5) == ["0", "0", "B", "0", "0"]
+    assert tape.extents() == (0, 4)
+
+@pytest.mark.parametrize("head, direction, expected_length", [
+    (0, Direction.RIGHT, 3),
+    (2, Direction.RIGHT, 1),
+    (2, Direction.LEFT, 3),
+    (3, Direction.RIGHT, 2),
+    (4, Direction.LEFT, 2),
+    (5, Direction.RIGHT, 2),
+    (6, Direction.LEFT, 2),
+    (7, Direction.RIGHT, 1),
+    (8, Direction.RIGHT, None),
+    (-1, Direction.RIGHT, 1),
+    (-1, Direction.LEFT, None),
+])
+def test_run_length(tape: RunLengthTape, head: int, direction: Direction, expected_length: int) -> None:
+    tape.overwrite(["0", "0", "0", "1", "1", "B", "B", "0"])
+    tape.head = head
+
+    assert tape.run_length(direction) == expected_length
+
+def test_manipulation(tape: RunLengthTape) -> None:
+    tape.write(1)
+    tape.shift(Direction.RIGHT)
+    tape.write("A")
+    tape.shift(Direction.RIGHT)
+    tape.write("B")
+    tape.shift(Direction.RIGHT)
+    tape.write(2)
+    tape.shift(Direction.RIGHT)
+
+    assert tape.read() == "B"
+
+    tape.shift(Direction.LEFT)
+    assert tape.read() == 2
+
+    tape.shift(Direction.LEFT)
+    assert tape.read() == "B"
+
+    tape.shift(Direction.LEFT)
+    assert tape.read() == "A"
+
+    tape.shift(Direction.LEFT)
+    assert tape.read() == 1
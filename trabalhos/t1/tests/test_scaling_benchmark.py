@@ -0,0 +1,64 @@
+import pytest
+
+from io import StringIO
+import json
+
+import scaling_benchmark
+
+from quintuple_turing_machine import QuintupleTuringMachineDefinition
+from benett_reversibility import is_machine_reversible
+from benchmark import from_json
+from scaling_benchmark import OPERATIONS, Fit, create_operations, create_source, fit_exponent, run_scaling_benchmarks
+
+def test_fit_exponent() -> None:
+    assert fit_exponent([(n, 3e-6 * n) for n in [10, 100, 1000]]) == pytest.approx(1)
+    assert fit_exponent([(n, 2e-9 * n * n) for n in [10, 100, 1000]]) == pytest.approx(2)
+    assert fit_exponent([(10, 1.0), (10, 2.0)]) == 0
+
+def test_fit_growth() -> None:
+    assert Fit('parse', 1.05, []).growth() == 'linear'
+    assert Fit('parse', 1.5, []).growth() == 'superlinear'
+    assert Fit('parse', 2.0, []).growth() == 'quadratic or worse'
+
+def test_create_source() -> None:
+    definition = QuintupleTuringMachineDefinition.parse(StringIO(create_source(1000)))
+
+    assert is_machine_reversible(definition)
+    assert 990 <= len(definition.transitions) <= 1000
+
+def test_run_scaling_benchmarks() -> None:
+    measurements, fits = run_scaling_benchmarks(max_size=100, repeat=1, min_time=0.001, parse_size=None)
+
+    assert [fit.operation for fit in fits] == OPERATIONS
+    assert all(len(fit.points) == 2 for fit in fits)
+    assert {measurement.name for measurement in measurements if measurement.metric == 'exponent'} == {f'scaling/{operation}' for operation in OPERATIONS}
+
+def test_run_scaling_benchmarks_stops_slow_operations() -> None:
+    measurements, fits = run_scaling_benchmarks(max_size=1000, max_seconds=0, repeat=1, operations=['parse'], min_time=0.001, parse_size=None)
+
+    assert [measurement.name for measurement in measurements] == ['scaling/parse/9']
+    assert fits == []
+
+def test_run_scaling_benchmarks_measures_large_parse() -> None:
+    measurements, fits = run_scaling_benchmarks(max_size=10, repeat=1, operations=['parse', 'eq'], min_time=0.001, parse_size=1000)
+    names = [measurement.name for measurement in measurements]
+
+    assert 'scaling/parse/999' in names
+    assert not any(name.startswith('scaling/eq/') and name != 'scaling/eq/9' for name in names)
+    assert fits[0].points[-1][0] == 999
+
+def test_recorded_baseline_covers_large_parse() -> None:
+    with open(scaling_benchmark.BASELINE) as file:
+        baseline = from_json(json.load(file))
+
+    assert f'scaling/parse/{scaling_benchmark.PARSE_SIZE - 1}' in {measurement.name for measurement in baseline}
+
+def test_create_operations_skips_unselected_conversion(monkeypatch) -> None:
+    calls = []
+    monkeypatch.setattr(scaling_benchmark, 'create_reversible_machine', lambda definition: calls.append(definition))
+
+    functions = create_operations(create_source(100), ['parse', 'create_reversible_machine'])
+
+    assert 'to_code' not in functions
+    assert 'eq' not in functions
+    assert calls == []
@@ -0,0 +1,87 @@
+import pytest
+from io import StringIO
+
+from quintuple_turing_machine import QuintupleTuringMachineDefinition
+from quadruple_turing_machine import QuadrupleTuringMachineSimulator
+from benett_reversibility import create_reversible_machine
+from execution_timeline import ExecutionTimeline
+from simulation_worker import SimulationWorker, format_step_count
+from cycle_detection import capture
+
+@pytest.fixture
+def simulator() -> QuadrupleTuringMachineSimulator:
+    machine = QuintupleTuringMachineDefinition.parse(StringIO(
+        '4 2 3 7\n'
+        '1 2 3 4\n'
+        '0 1\n'
+        '0 1 B\n'
+        '(1,B)=(2,B,R)\n'
+        '(2,0)=(2,1,R)\n'
+        '(2,1)=(2,0,R)\n'
+        '(2,B)=(3,B,L)\n'
+        '(3,0)=(3,0,L)\n'
+        '(3,1)=(3,1,L)\n'
+        '(3,B)=(4,B,S)\n'
+    ))
+
+    simulator = QuadrupleTuringMachineSimulator(create_reversible_machine(machine))
+    simulator.tapes[0].overwrite(list('10101'), 1)
+
+    return simulator
+
+def drain(worker: SimulationWorker, timeline: ExecutionTimeline) -> None:
+    while True:
+        batch = worker.batches.get(timeout=5)
+        timeline.extend(batch.deltas, batch.halted)
+
+        if batch.halted or timeline.truncated:
+            break
+
+@pytest.mark.parametrize("steps, expected_text", [
+    (0, '0'),
+    (999, '999'),
+    (2300, '2.3K'),
+    (2_345_678, '2.3M'),
+    (4 * 10 ** 9, '4.0G'),
+])
+def test_format_step_count(steps: int, expected_text: str) -> None:
+    assert format_step_count(steps) == expected_text
+
+def test_worker_streams_whole_run(simulator: QuadrupleTuringMachineSimulator) -> None:
+    expected = ExecutionTimeline(simulator, keyframe_interval=8)
+    expected.record()
+
+    timeline = ExecutionTimeline(simulator, keyframe_interval=8)
+    worker = SimulationWorker(simulator, batch_size=5)
+    worker.start()
+    drain(worker, timeline)
+    worker.join(5)
+
+    assert timeline.halted
+    assert len(timeline) == len(expected)
+    assert worker.progress() == f'computed {len(expected) - 1} steps (halted)'
+
+    for step in range(len(timeline)):
+        assert capture(timeline.seek(step)) == capture(expected.seek(step))
+
+def test_worker_extend_and_cancel(simulator: QuadrupleTuringMachineSimulator) -> None:
+    timeline = ExecutionTimeline(simulator)
+    worker = SimulationWorker(simulator, target=10, batch_size=4)
+    worker.start()
+
+    while len(timeline) < 11:
+        timeline.extend(worker.batches.get(timeout=5).deltas)
+
+    assert worker.progress() == 'computed 10 steps (paused)'
+    assert worker.poll() == []
+
+    worker.extend(3)
+    timeline.extend(worker.batches.get(timeout=5).deltas)
+
+    assert len(timeline) == 14
+
+    worker.cancel()
+    worker.join(5)
+
+    assert not worker.is_running()
+    assert worker.progress() == 'computed 13 steps (cancelled)'
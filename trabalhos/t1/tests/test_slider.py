@@ -0,0 +1,24 @@
+import pytest
+
+from gui.slider import Slider
+
+def test_linear_slider_maps_position_to_value() -> None:
+    slider = Slider(0, 0, 200, 30, 600, 60)
+    slider.update_value((100, 0))
+
+    assert slider.val == pytest.approx(315)
+    assert slider.format_value(slider.val) == '315'
+
+@pytest.mark.parametrize("x, expected_value", [
+    (-50, 1),
+    (0, 1),
+    (100, 1000),
+    (200, 10 ** 6),
+    (250, 10 ** 6),
+])
+def test_logarithmic_slider_maps_position_to_value(x: int, expected_value: float) -> None:
+    slider = Slider(0, 0, 200, 1, 10 ** 6, 1, logarithmic=True)
+    slider.update_value((x, 0))
+
+    assert slider.val == pytest.approx(expected_value)
+    assert slider.handle_rect.centerx == max(0, min(x, 200))
@@ -0,0 +1,50 @@
+import pytest
+
+from gui.surface_cache import SurfaceCache
+
+class FakeFont:
+    def __init__(self):
+        self.rendered = []
+
+    def render(self, text, antialias, color):
+        self.rendered.append((text, antialias, color))
+        return (text, color)
+
+def test_render_reuses_surfaces() -> None:
+    cache = SurfaceCache()
+    font = FakeFont()
+
+    first = cache.render(font, 'B', (0, 0, 0))
+    second = cache.render(font, 'B', (0, 0, 0))
+    other = cache.render(font, 'B', (255, 0, 0))
+
+    assert first is second
+    assert other is not first
+    assert font.rendered == [('B', True, (0, 0, 0)), ('B', True, (255, 0, 0))]
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert cache.hit_rate() == pytest.approx(1 / 3)
+
+def test_render_evicts_least_recently_used() -> None:
+    cache = SurfaceCache(capacity=2)
+    font = FakeFont()
+
+    cache.render(font, '0', (0, 0, 0))
+    cache.render(font, '1', (0, 0, 0))
+    cache.render(font, '0', (0, 0, 0))
+    cache.render(font, '2', (0, 0, 0))
+    cache.render(font, '0', (0, 0, 0))
+    cache.render(font, '1', (0, 0, 0))
+
+    assert len(cache) == 2
+    assert [text for text, _, _ in font.rendered] == ['0', '1', '2', '1']
+
+def test_tile_is_cached() -> None:
+    cache = SurfaceCache()
+
+    tile = cache.tile((48, 48), (255, 255, 255), (0, 0, 0), 1)
+
+    assert tile.get_size() == (48, 48)
+    assert tile.get_at((10, 10))[:3] == (255, 255, 255)
+    assert tile.get_at((0, 0))[:3] == (0, 0, 0)
+    assert cache.tile((48, 48), (255, 255, 255), (0, 0, 0), 1) is tile
+    assert cache.tile((48, 48), (255, 230, 153), (0, 0, 0), 1) is not tile
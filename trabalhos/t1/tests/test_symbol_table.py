@@ -0,0 +1,31 @@
+import pytest
+
+from symbol_table import SymbolTable
+
+def test_blank_is_interned_first() -> None:
+    table = SymbolTable(['0', '1'])
+
+    assert table.intern('B') == 0
+    assert table.intern('0') == 1
+    assert table.intern('1') == 2
+    assert len(table) == 3
+
+def test_intern_is_stable() -> None:
+    table = SymbolTable(blank=None)
+
+    assert table.intern('A') == 0
+    assert table.intern(1) == 1
+    assert table.intern('1') == 2
+    assert table.intern('A') == 0
+    assert table.intern(1) == 1
+
+    assert table.lookup(0) == 'A'
+    assert table.lookup(1) == 1
+    assert table.lookup(2) == '1'
+
+def test_contains() -> None:
+    table = SymbolTable(['0'])
+
+    assert 'B' in table
+    assert '0' in table
+    assert 0 not in table
@@ -101,3 +101,15 @@ def test_manipulation(tape: Tape) -> None:
     
     tape.shift(Direction.LEFT)
     assert tape.read() == 1
+
+def test_slices(tape: Tape) -> None:
+    tape.write_slice(["0", "1", "B", 2], -1)
+
+    assert tape.read_slice(-2, 4) == ["B", "0", "1", "B", 2, "B"]
+    assert tape.extents() == (-1, 2)
+
+def test_extents_ignore_blanks(tape: Tape) -> None:
+    assert tape.extents() == None
+
+    tape.write("B")
+    assert tape.extents() == None
@@ -0,0 +1,42 @@
+import pytest
+from typing import Any, List, Optional
+
+from transition_index import TransitionIndex, VersionedList
+
+@pytest.fixture
+def index() -> TransitionIndex[str]:
+    return TransitionIndex([
+        ('1', (1,), ('0',), 'a'),
+        ('1', (0, 1), ('0', '1'), 'b'),
+        ('1', (0, 1), ('0', '1'), 'c'),
+        ('1', (0,), ('0',), 'd'),
+        ('2', (), (), 'e'),
+        ('3', (0, 1), (0, 'B'), 'f'),
+    ])
+
+@pytest.mark.parametrize("state, data, expected_transition", [
+    ('1', ['X', '0'], 'a'),
+    ('1', ['0', '0'], 'a'),
+    ('1', ['0', '1'], 'b'),
+    ('1', ['0', 'X'], 'd'),
+    ('1', ['X', 'X'], None),
+    ('2', ['X', 'X'], 'e'),
+    ('3', [0, 'B'], 'f'),
+    ('3', ['0', 'B'], None),
+    ('4', ['0', '0'], None),
+])
+def test_find(index: TransitionIndex[str], state: str, data: List[Any], expected_transition: Optional[str]) -> None:
+    assert index.find(state, data) == expected_transition
+
+def test_versioned_list_counts_changes() -> None:
+    transitions = VersionedList(['a', 'b'])
+    assert transitions.version == 0
+
+    transitions.append('c')
+    transitions[0] = 'd'
+    del transitions[1]
+    transitions += ['e']
+    transitions.sort(key=str)
+
+    assert transitions == ['c', 'd', 'e']
+    assert transitions.version == 5